@@ -0,0 +1,61 @@
+-- Migration: Create local mirror of the Rick & Morty dataset
+-- Rows are written by the mirror sync subsystem (src/domains/mirror/sync.py)
+
+CREATE TABLE IF NOT EXISTS rm_locations (
+    id INTEGER PRIMARY KEY,                 -- Rick & Morty location ID
+    name TEXT NOT NULL,
+    type TEXT NOT NULL DEFAULT '',
+    dimension TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL,             -- Detects upstream changes between syncs
+    synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS rm_episodes (
+    id INTEGER PRIMARY KEY,                 -- Rick & Morty episode ID
+    name TEXT NOT NULL,
+    air_date TEXT NOT NULL DEFAULT '',
+    episode TEXT NOT NULL DEFAULT '',       -- Episode code, e.g. "S01E01"
+    created TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL,
+    synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS rm_characters (
+    id INTEGER PRIMARY KEY,                 -- Rick & Morty character ID
+    name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT '',
+    species TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL DEFAULT '',
+    gender TEXT NOT NULL DEFAULT '',
+    image TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL DEFAULT '',
+    origin_id INTEGER,                      -- NULL when the origin is "unknown"
+    origin_name TEXT NOT NULL DEFAULT '',
+    location_id INTEGER,                    -- Current location; residents are derived from it
+    location_name TEXT NOT NULL DEFAULT '',
+    content_hash TEXT NOT NULL,
+    synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Residents of a location and characters from an origin
+CREATE INDEX IF NOT EXISTS idx_rm_characters_location_id ON rm_characters(location_id);
+CREATE INDEX IF NOT EXISTS idx_rm_characters_origin_id ON rm_characters(origin_id);
+
+-- Character <-> episode appearances
+CREATE TABLE IF NOT EXISTS rm_character_episodes (
+    character_id INTEGER NOT NULL,
+    episode_id INTEGER NOT NULL,
+    PRIMARY KEY (character_id, episode_id)
+);
+
+-- Characters of an episode
+CREATE INDEX IF NOT EXISTS idx_rm_character_episodes_episode_id ON rm_character_episodes(episode_id);
+
+-- One row per entity type, tracks what has been mirrored
+CREATE TABLE IF NOT EXISTS rm_sync_state (
+    entity_type TEXT PRIMARY KEY,           -- "character", "location", "episode"
+    upstream_count INTEGER NOT NULL DEFAULT 0,
+    last_synced_at TIMESTAMPTZ,
+    last_full_sync_at TIMESTAMPTZ
+);
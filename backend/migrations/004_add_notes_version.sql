@@ -0,0 +1,4 @@
+-- Migration: Add a version counter to notes
+-- Bumped by the notes repository on every update; the notes endpoints derive their ETags from it
+
+ALTER TABLE notes ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
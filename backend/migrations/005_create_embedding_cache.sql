@@ -0,0 +1,11 @@
+-- Migration: Create the persistent embedding cache
+-- Rows are written by the embedding cache (src/integrations/embedding_cache.py)
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model TEXT NOT NULL,                    -- Embedding model, e.g. "text-embedding-3-small"
+    dimensions INTEGER NOT NULL,            -- Requested size; 0 for the model default
+    text_hash TEXT NOT NULL,                -- SHA-256 of the normalized text
+    embedding VECTOR NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (model, dimensions, text_hash)
+);
@@ -0,0 +1,5 @@
+-- Migration: Add a generation counter to the mirror sync state
+-- Bumped by the mirror sync whenever it changes rows of an entity type; every worker
+-- compares the sum against its dataset snapshot to know when to reload
+
+ALTER TABLE rm_sync_state ADD COLUMN IF NOT EXISTS generation BIGINT NOT NULL DEFAULT 0;
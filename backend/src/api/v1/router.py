@@ -5,6 +5,8 @@ from src.domains.characters.router import router as characters_router
 from src.domains.episodes.router import router as episodes_router
 from src.domains.notes.router import router as notes_router
 from src.domains.ai.router import router as ai_router
+from src.domains.mirror.router import router as mirror_router
+from src.domains.graph.router import router as graph_router
 
 router = APIRouter()
 
@@ -12,4 +14,6 @@ router.include_router(locations_router)
 router.include_router(characters_router)
 router.include_router(episodes_router)
 router.include_router(notes_router)
-router.include_router(ai_router)
\ No newline at end of file
+router.include_router(ai_router)
+router.include_router(mirror_router)
+router.include_router(graph_router)
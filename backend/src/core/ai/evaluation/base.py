@@ -1,3 +1,4 @@
+import asyncio
 import re
 from abc import ABC, abstractmethod
 from typing import Dict, Optional, List
@@ -14,7 +15,7 @@ class BaseEvaluator(ABC):
     
     async def generate_embedding(self, text: str) -> list[float]:
         """Generate embedding vector for text."""
-        return await self.azure_client.generate_embedding(text)
+        return await self.azure_client.generate_embedding(text, priority="evaluation")
     
     def compute_cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
         """Calculate cosine similarity between two embedding vectors."""
@@ -50,8 +51,10 @@ class BaseEvaluator(ABC):
     
     async def compute_semantic_alignment(self, generated: str, context: str) -> float:
         """Calculate semantic alignment between generated text and source context."""
-        generated_embedding = await self.generate_embedding(generated)
-        context_embedding = await self.generate_embedding(context)
+        # Requested together so both texts go out in one embedding request
+        generated_embedding, context_embedding = await asyncio.gather(
+            self.generate_embedding(generated), self.generate_embedding(context)
+        )
         return self.compute_cosine_similarity(generated_embedding, context_embedding)
     
     def calculate_keyword_matches(self, text: str, keywords: List[str]) -> float:
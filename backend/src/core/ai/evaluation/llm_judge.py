@@ -35,7 +35,8 @@ class LLMJudge:
         response = await self.azure_client.generate_completion(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            priority="evaluation"
         )
         
         return self._parse_evaluation_response(response["text"])
@@ -60,7 +61,8 @@ class LLMJudge:
         response = await self.azure_client.generate_completion(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            priority="evaluation"
         )
         
         return self._parse_evaluation_response(response["text"])
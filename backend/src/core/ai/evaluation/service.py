@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Dict
 
@@ -29,16 +30,23 @@ class EvaluationService:
             metadata=request.metadata or {},
         )
         
+        # Embedding lookups run together: the batcher sends them as one request and
+        # embeds the generated output once even though both metrics need it
+        lookups = {}
         if source_context:
-            semantic_alignment = await evaluator.compute_semantic_alignment(
+            lookups["semantic_alignment"] = evaluator.compute_semantic_alignment(
                 request.generated_output, source_context
             )
-            metrics["semantic_alignment"] = semantic_alignment
-        
         if request.expected_output_embeddings:
-            generated_embedding = await evaluator.generate_embedding(request.generated_output)
+            lookups["generated_embedding"] = evaluator.generate_embedding(request.generated_output)
+        results = dict(zip(lookups, await asyncio.gather(*lookups.values())))
+        
+        if "semantic_alignment" in results:
+            metrics["semantic_alignment"] = results["semantic_alignment"]
+        
+        if "generated_embedding" in results:
             cosine_similarity = evaluator.compute_cosine_similarity(
-                generated_embedding, request.expected_output_embeddings
+                results["generated_embedding"], request.expected_output_embeddings
             )
             metrics["cosine_similarity"] = cosine_similarity
         
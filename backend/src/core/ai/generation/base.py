@@ -1,8 +1,10 @@
 import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Any, AsyncIterator, Dict
 
 from src.core.ai.generation.models import GenerationResponse
+from src.core.sse import EventStream, sse_event
 from src.integrations.azure_openai_client import azure_openai_client
 
 logger = logging.getLogger(__name__)
@@ -41,3 +43,34 @@ class BaseGenerationService(ABC):
             logger.error(f"Error generating content: {e}")
             raise
 
+    async def generate_stream(self, request) -> EventStream[bytes]:
+        """
+        Generate content as server-sent events.
+
+        Emits a `delta` event per token chunk and a final `done` event with usage,
+        model and finish_reason. The completion request is made before returning,
+        so failures to start raise here; failures mid-stream end it with an `error`
+        event.
+        """
+        user_prompt = self._build_user_prompt(request)
+        events = await self.azure_client.stream_completion(
+            system_prompt=self.system_prompt,
+            user_prompt=user_prompt
+        )
+        return EventStream(self._encode_events(events), events.aclose)
+
+    async def _encode_events(self, events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+        try:
+            async for event in events:
+                if event["type"] == "delta":
+                    yield sse_event("delta", {"text": event["text"]})
+                else:
+                    yield sse_event("done", {
+                        "usage": event["usage"],
+                        "model": event["model"],
+                        "finish_reason": event["finish_reason"],
+                    })
+            logger.info("Successfully streamed generated content")
+        except Exception as e:
+            logger.error(f"Error streaming generated content: {e}")
+            yield sse_event("error", {"detail": "Generation failed"})
@@ -0,0 +1,72 @@
+import asyncio
+import functools
+import logging
+import threading
+from typing import Any, Awaitable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+ServiceT = TypeVar("ServiceT")
+
+
+class BlockingPortal:
+    """
+    Runs coroutines to completion from sync code.
+
+    Every call goes to one long-lived event loop on a daemon thread rather than a
+    fresh ``asyncio.run`` loop, so loop-bound state (the pooled upstream session,
+    single-flight futures) is reused across calls instead of rebuilt each time.
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="blocking-portal", daemon=True).start()
+                self._loop = loop
+                logger.debug("Started blocking portal event loop")
+            return self._loop
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """Blocks until `awaitable` completes on the portal loop and returns its result."""
+        loop = self._get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("BlockingPortal.run cannot be called from the portal's own event loop")
+        return asyncio.run_coroutine_threadsafe(awaitable, loop).result()
+
+
+class SyncShim(Generic[ServiceT]):
+    """Exposes an async service's coroutine methods as blocking calls, for scripts and sync callers."""
+
+    def __init__(self, service: ServiceT, portal: BlockingPortal):
+        self._service = service
+        self._portal = portal
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._service, name)
+        if not asyncio.iscoroutinefunction(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self._portal.run(attribute(*args, **kwargs))
+
+        return call
+
+
+# Singleton instance
+blocking_portal = BlockingPortal()
+
+
+def sync_shim(service: ServiceT) -> SyncShim[ServiceT]:
+    """Wraps an async service so its methods can be called without an event loop."""
+    return SyncShim(service, blocking_portal)
@@ -0,0 +1,207 @@
+import logging
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Media types worth compressing (prefix match); images and archives pass through
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/event-stream",
+    "text/plain",
+    "text/html",
+    "text/css",
+    "application/javascript",
+)
+
+# Streams flushed after every chunk, since each chunk is an event the client is waiting for
+PER_CHUNK_FLUSH_TYPES = ("text/event-stream",)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, in server preference order."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """
+    Picks the encoding to use from an Accept-Encoding header.
+
+    Highest q-value wins; ties go to the server's order in `available`. Returns None
+    for identity.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    candidates: List[Tuple[float, int, str]] = []
+    for rank, encoding in enumerate(available):
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0:
+            candidates.append((-q, rank, encoding))
+    return min(candidates)[2] if candidates else None
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class _Encoder:
+    """Incremental encoder; `flush` emits everything written so far."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits 16+ selects the gzip container
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        if self._brotli is not None:
+            out = self._brotli.process(data)
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli response compression.
+
+    Bodies smaller than `minimum_size`, non-compressible media types and responses
+    that already carry a Content-Encoding are sent as is. Streaming responses are
+    compressed incrementally and flushed once `flush_size` bytes of input have
+    accumulated, since every flush costs compression ratio; server-sent events are
+    flushed after each chunk. Strong ETags become weak on compressed responses,
+    since the bytes differ per encoding.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        flush_size: int = 16384,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.flush_size = flush_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.available = supported_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        await _CompressedResponder(self, encoding)(scope, receive, send, self.app)
+
+
+class _CompressedResponder:
+    """Per-request state: holds the start message until the first body chunk decides whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str]):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.start: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+        self.flush_each_chunk = False
+        # Input bytes written to the encoder since the last flush
+        self.pending = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        self.send = send
+        await app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            self.passthrough = (
+                self.encoding is None
+                or "content-encoding" in headers
+                or not media_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            self.flush_each_chunk = media_type.startswith(PER_CHUNK_FLUSH_TYPES)
+            if self.passthrough and (media_type.startswith(COMPRESSIBLE_TYPES) or message["status"] == 304):
+                headers = MutableHeaders(raw=message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if message["status"] == 304 and self.encoding is not None:
+                    _weaken_etag(headers)
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoder is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # Whole body is known and too small to be worth it
+                MutableHeaders(raw=self.start["headers"]).add_vary_header("Accept-Encoding")
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.encoder = _Encoder(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            _weaken_etag(headers)
+            if more_body:
+                del headers["Content-Length"]
+                await self.send(self.start)
+            else:
+                payload = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(payload))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": payload})
+                return
+
+        if more_body:
+            self.pending += len(body)
+            flush = self.flush_each_chunk or self.pending >= self.middleware.flush_size
+            if flush:
+                self.pending = 0
+            chunk = self.encoder.compress(body, flush=flush)
+            if chunk:
+                await self.send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            await self.send({"type": "http.response.body", "body": self.encoder.finish(body)})
@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import Dict, List, Literal
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -28,7 +28,267 @@ class Settings(BaseSettings):
     )
     
     RICK_MORTY_GRAPHQL_URL: str = "https://rickandmortyapi.com/graphql"
-    
+    RICK_MORTY_POOL_SIZE: int = Field(
+        default=100,
+        description="Maximum pooled keep-alive connections to the Rick & Morty API",
+        env="RICK_MORTY_POOL_SIZE"
+    )
+    RICK_MORTY_KEEPALIVE_TIMEOUT: float = Field(
+        default=30.0,
+        description="Seconds an idle pooled connection is kept open",
+        env="RICK_MORTY_KEEPALIVE_TIMEOUT"
+    )
+    RICK_MORTY_CONNECT_TIMEOUT: float = Field(
+        default=5.0,
+        description="Connect timeout in seconds for Rick & Morty API requests",
+        env="RICK_MORTY_CONNECT_TIMEOUT"
+    )
+    RICK_MORTY_REQUEST_TIMEOUT: float = Field(
+        default=30.0,
+        description="Total per-request timeout in seconds for Rick & Morty API requests",
+        env="RICK_MORTY_REQUEST_TIMEOUT"
+    )
+    RICK_MORTY_VALIDATE_QUERIES: bool = Field(
+        default=True,
+        description="Validate query documents against the bundled schema at startup",
+        env="RICK_MORTY_VALIDATE_QUERIES"
+    )
+    RICK_MORTY_RETRIES: int = Field(
+        default=3,
+        description="Retries on connection errors for Rick & Morty API requests",
+        env="RICK_MORTY_RETRIES"
+    )
+    RICK_MORTY_BATCH_SIZE: int = Field(
+        default=50,
+        description="Maximum IDs per charactersByIds/locationsByIds/episodesByIds request",
+        env="RICK_MORTY_BATCH_SIZE"
+    )
+    RICK_MORTY_BULK_PAGE_BUDGET: int = Field(
+        default=10,
+        description="Pages requested per aliased multi-page document in bulk fetches",
+        env="RICK_MORTY_BULK_PAGE_BUDGET"
+    )
+    RICK_MORTY_RATE_LIMIT: float = Field(
+        default=0,
+        description="Maximum Rick & Morty API requests per second (0 disables the token bucket)",
+        env="RICK_MORTY_RATE_LIMIT"
+    )
+    RICK_MORTY_RATE_BURST: int = Field(
+        default=20,
+        description="Requests allowed in a burst above the rate limit",
+        env="RICK_MORTY_RATE_BURST"
+    )
+    RICK_MORTY_CONCURRENCY_INITIAL: int = Field(
+        default=20,
+        description="Starting adaptive concurrency limit for upstream calls",
+        env="RICK_MORTY_CONCURRENCY_INITIAL"
+    )
+    RICK_MORTY_CONCURRENCY_MIN: int = Field(
+        default=2,
+        description="Floor of the adaptive concurrency limit",
+        env="RICK_MORTY_CONCURRENCY_MIN"
+    )
+    RICK_MORTY_CONCURRENCY_MAX: int = Field(
+        default=100,
+        description="Ceiling of the adaptive concurrency limit",
+        env="RICK_MORTY_CONCURRENCY_MAX"
+    )
+    RICK_MORTY_LATENCY_TARGET: float = Field(
+        default=2.0,
+        description="Seconds above which an upstream call counts as congestion and shrinks the limit",
+        env="RICK_MORTY_LATENCY_TARGET"
+    )
+    RICK_MORTY_LIMITER_QUEUE_TIMEOUT: float = Field(
+        default=5.0,
+        description="Seconds a call may wait for a concurrency slot before failing fast",
+        env="RICK_MORTY_LIMITER_QUEUE_TIMEOUT"
+    )
+    RICK_MORTY_BREAKER_FAILURE_RATE: float = Field(
+        default=0.5,
+        description="Failure ratio over the window that opens the circuit breaker",
+        env="RICK_MORTY_BREAKER_FAILURE_RATE"
+    )
+    RICK_MORTY_BREAKER_MIN_CALLS: int = Field(
+        default=20,
+        description="Calls required in the window before the breaker can open",
+        env="RICK_MORTY_BREAKER_MIN_CALLS"
+    )
+    RICK_MORTY_BREAKER_WINDOW: float = Field(
+        default=30.0,
+        description="Rolling window in seconds for the breaker failure ratio",
+        env="RICK_MORTY_BREAKER_WINDOW"
+    )
+    RICK_MORTY_BREAKER_OPEN_SECONDS: float = Field(
+        default=15.0,
+        description="Seconds the breaker stays open before probing the upstream",
+        env="RICK_MORTY_BREAKER_OPEN_SECONDS"
+    )
+    RICK_MORTY_HEDGE_ENABLED: bool = Field(
+        default=True,
+        description="Send a second request when a call outlives the recent latency quantile",
+        env="RICK_MORTY_HEDGE_ENABLED"
+    )
+    RICK_MORTY_HEDGE_QUANTILE: float = Field(
+        default=0.95,
+        description="Latency quantile after which a call is hedged",
+        env="RICK_MORTY_HEDGE_QUANTILE"
+    )
+    RICK_MORTY_HEDGE_MIN_DELAY: float = Field(
+        default=0.05,
+        description="Minimum seconds before a hedge is sent",
+        env="RICK_MORTY_HEDGE_MIN_DELAY"
+    )
+    RICK_MORTY_HEDGE_BUDGET: float = Field(
+        default=0.1,
+        description="Maximum fraction of calls that may be hedged",
+        env="RICK_MORTY_HEDGE_BUDGET"
+    )
+    RICK_MORTY_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache Rick & Morty API responses in process",
+        env="RICK_MORTY_CACHE_ENABLED"
+    )
+    RICK_MORTY_CACHE_TTLS: Dict[str, float] = Field(
+        default={"character": 3600, "location": 3600, "episode": 3600, "page": 600},
+        description="Seconds a cached response stays fresh, per entity type ('page' for list pages)",
+        env="RICK_MORTY_CACHE_TTLS"
+    )
+    RICK_MORTY_CACHE_STALE_TTL: float = Field(
+        default=86400,
+        description="Seconds an expired entry may still be served while it is refreshed",
+        env="RICK_MORTY_CACHE_STALE_TTL"
+    )
+    RICK_MORTY_CACHE_MAX_ENTRIES: int = Field(
+        default=5000,
+        description="Maximum cached responses",
+        env="RICK_MORTY_CACHE_MAX_ENTRIES"
+    )
+    RICK_MORTY_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Approximate memory cap for cached responses in bytes",
+        env="RICK_MORTY_CACHE_MAX_BYTES"
+    )
+    RICK_MORTY_DISK_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Persist cached Rick & Morty responses to disk so restarts start warm",
+        env="RICK_MORTY_DISK_CACHE_ENABLED"
+    )
+    RICK_MORTY_DISK_CACHE_DIR: str = Field(
+        default=".cache/rick_and_morty",
+        description="Directory holding the on-disk response cache",
+        env="RICK_MORTY_DISK_CACHE_DIR"
+    )
+    RICK_MORTY_DISK_CACHE_MAX_BYTES: int = Field(
+        default=256 * 1024 * 1024,
+        description="Size above which the on-disk cache is compacted, in bytes",
+        env="RICK_MORTY_DISK_CACHE_MAX_BYTES"
+    )
+    RICK_MORTY_DISK_CACHE_READ_ONLY: bool = Field(
+        default=False,
+        description="Open the on-disk cache read-only (for workers sharing a file another worker writes)",
+        env="RICK_MORTY_DISK_CACHE_READ_ONLY"
+    )
+
+    # Local mirror of the Rick & Morty dataset
+    MIRROR_ENABLED: bool = Field(
+        default=True,
+        description="Sync the Rick & Morty dataset into Postgres and serve reads from it",
+        env="MIRROR_ENABLED"
+    )
+    MIRROR_SYNC_INTERVAL_SECONDS: int = Field(
+        default=3600,
+        description="Seconds between delta syncs of the mirror (new rows plus a spot check for edits)",
+        env="MIRROR_SYNC_INTERVAL_SECONDS"
+    )
+    MIRROR_FULL_SYNC_INTERVAL_SECONDS: int = Field(
+        default=86400,
+        description="Seconds between full reconciliation syncs of the mirror; bounds how stale edited rows can get",
+        env="MIRROR_FULL_SYNC_INTERVAL_SECONDS"
+    )
+    MIRROR_SYNC_CONCURRENCY: int = Field(
+        default=5,
+        description="Concurrent multi-page upstream requests during a mirror sync",
+        env="MIRROR_SYNC_CONCURRENCY"
+    )
+
+    # In-process dataset snapshot (relationship graph, filter indexes)
+    DATASET_REFRESH_SECONDS: int = Field(
+        default=3600,
+        description="Seconds before the in-process dataset snapshot and its indexes are rebuilt (they also rebuild after each mirror sync)",
+        env="DATASET_REFRESH_SECONDS"
+    )
+
+    # Startup warm-up (gates /health readiness)
+    WARMUP_ENABLED: bool = Field(
+        default=True,
+        description="Prefetch hot pages and entities at startup and report not-ready until done",
+        env="WARMUP_ENABLED"
+    )
+    WARMUP_PAGES: int = Field(
+        default=3,
+        description="Leading list pages of characters, locations (with residents) and episodes to prefetch",
+        env="WARMUP_PAGES"
+    )
+    WARMUP_CHARACTER_IDS: List[int] = Field(
+        default=[1, 2, 3, 4, 5],
+        description="Character IDs to prefetch (JSON list)",
+        env="WARMUP_CHARACTER_IDS"
+    )
+    WARMUP_LOCATION_IDS: List[int] = Field(
+        default=[1, 3, 20],
+        description="Location IDs to prefetch (JSON list)",
+        env="WARMUP_LOCATION_IDS"
+    )
+    WARMUP_EPISODE_IDS: List[int] = Field(
+        default=[1],
+        description="Episode IDs to prefetch (JSON list)",
+        env="WARMUP_EPISODE_IDS"
+    )
+    WARMUP_DATASET: bool = Field(
+        default=True,
+        description="Also build the dataset snapshot and its indexes (filters, cursors, graph) during warm-up",
+        env="WARMUP_DATASET"
+    )
+    WARMUP_DEADLINE_SECONDS: float = Field(
+        default=30.0,
+        description="Seconds after which warm-up is abandoned and the worker reports ready anyway",
+        env="WARMUP_DEADLINE_SECONDS"
+    )
+
+    # HTTP caching (ETag revalidation and Cache-Control)
+    HTTP_CACHE_MAX_AGE_SECONDS: int = Field(
+        default=300,
+        description="Cache-Control max-age for entity responses (listings get a fifth of it)",
+        env="HTTP_CACHE_MAX_AGE_SECONDS"
+    )
+    HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = Field(
+        default=3600,
+        description="Cache-Control stale-while-revalidate window for entity and listing responses",
+        env="HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS"
+    )
+
+    # Response compression (gzip, plus brotli when the package is installed)
+    COMPRESSION_MINIMUM_SIZE: int = Field(
+        default=1024,
+        description="Responses smaller than this many bytes are sent uncompressed",
+        env="COMPRESSION_MINIMUM_SIZE"
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(
+        default=6,
+        description="gzip compression level (1-9)",
+        env="COMPRESSION_GZIP_LEVEL"
+    )
+    COMPRESSION_BROTLI_QUALITY: int = Field(
+        default=4,
+        description="Brotli quality (0-11); low values keep per-request CPU close to gzip",
+        env="COMPRESSION_BROTLI_QUALITY"
+    )
+    COMPRESSION_FLUSH_SIZE: int = Field(
+        default=16384,
+        description="Streamed responses are flushed after this many uncompressed bytes (server-sent events after every event)",
+        env="COMPRESSION_FLUSH_SIZE"
+    )
+
     # Azure OpenAI
     AZURE_OPENAI_ENDPOINT: str = Field(
         default="",
@@ -52,9 +312,121 @@ class Settings(BaseSettings):
     )
     AZURE_OPENAI_API_VERSION: str = Field(
         default="2024-02-15-preview",
-        description="Azure OpenAI API Version",
+        description="Azure OpenAI API Version (2024-09-01-preview or later reports usage on streamed completions)",
         env="AZURE_OPENAI_API_VERSION"
     )
+    AZURE_OPENAI_MAX_CONNECTIONS: int = Field(
+        default=500,
+        description="Maximum concurrent HTTP connections to Azure OpenAI per worker",
+        env="AZURE_OPENAI_MAX_CONNECTIONS"
+    )
+    AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=100,
+        description="Idle keep-alive connections kept open to Azure OpenAI",
+        env="AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    AZURE_OPENAI_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        description="Seconds an idle Azure OpenAI connection is kept open",
+        env="AZURE_OPENAI_KEEPALIVE_EXPIRY"
+    )
+    AZURE_OPENAI_CONNECT_TIMEOUT: float = Field(
+        default=5.0,
+        description="Connect timeout in seconds for Azure OpenAI requests",
+        env="AZURE_OPENAI_CONNECT_TIMEOUT"
+    )
+    AZURE_OPENAI_POOL_TIMEOUT: float = Field(
+        default=10.0,
+        description="Seconds a request waits for a free pooled connection",
+        env="AZURE_OPENAI_POOL_TIMEOUT"
+    )
+    AZURE_OPENAI_COMPLETION_TIMEOUT: float = Field(
+        default=60.0,
+        description="Read timeout in seconds for chat completion calls",
+        env="AZURE_OPENAI_COMPLETION_TIMEOUT"
+    )
+    AZURE_OPENAI_EMBEDDING_TIMEOUT: float = Field(
+        default=15.0,
+        description="Read timeout in seconds for embedding calls",
+        env="AZURE_OPENAI_EMBEDDING_TIMEOUT"
+    )
+    AZURE_OPENAI_MAX_RETRIES: int = Field(
+        default=2,
+        description="Retries on connection errors, 429s and 5xx responses (429s honor Retry-After)",
+        env="AZURE_OPENAI_MAX_RETRIES"
+    )
+    AZURE_OPENAI_EMBEDDING_BATCH_WINDOW_MS: float = Field(
+        default=5.0,
+        description="Milliseconds concurrent embedding calls wait to share one multi-input request",
+        env="AZURE_OPENAI_EMBEDDING_BATCH_WINDOW_MS"
+    )
+    AZURE_OPENAI_EMBEDDING_BATCH_MAX_INPUTS: int = Field(
+        default=128,
+        description="Maximum texts per embedding request (the API accepts up to 2048)",
+        env="AZURE_OPENAI_EMBEDDING_BATCH_MAX_INPUTS"
+    )
+    AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS: int = Field(
+        default=100000,
+        description="Estimated token budget per multi-input embedding request",
+        env="AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS"
+    )
+    AZURE_OPENAI_EMBEDDING_MAX_INPUT_TOKENS: int = Field(
+        default=8191,
+        description="Embedding model's per-input token limit; larger texts are sent on their own",
+        env="AZURE_OPENAI_EMBEDDING_MAX_INPUT_TOKENS"
+    )
+    AZURE_OPENAI_EMBEDDING_DIMENSIONS: int = Field(
+        default=0,
+        description="Embedding size requested from the model (text-embedding-3 only); 0 uses the model default",
+        env="AZURE_OPENAI_EMBEDDING_DIMENSIONS"
+    )
+    AZURE_OPENAI_CHAT_RPM: int = Field(
+        default=0,
+        description="Requests per minute quota of the chat deployment; 0 disables request throttling",
+        env="AZURE_OPENAI_CHAT_RPM"
+    )
+    AZURE_OPENAI_CHAT_TPM: int = Field(
+        default=0,
+        description="Tokens per minute quota of the chat deployment; 0 disables token throttling",
+        env="AZURE_OPENAI_CHAT_TPM"
+    )
+    AZURE_OPENAI_EMBEDDING_RPM: int = Field(
+        default=0,
+        description="Requests per minute quota of the embedding deployment; 0 disables request throttling",
+        env="AZURE_OPENAI_EMBEDDING_RPM"
+    )
+    AZURE_OPENAI_EMBEDDING_TPM: int = Field(
+        default=0,
+        description="Tokens per minute quota of the embedding deployment; 0 disables token throttling",
+        env="AZURE_OPENAI_EMBEDDING_TPM"
+    )
+    AZURE_OPENAI_RATE_BURST_SECONDS: float = Field(
+        default=10.0,
+        description="Seconds of quota that can be spent at once; Azure enforces per-minute limits over short windows",
+        env="AZURE_OPENAI_RATE_BURST_SECONDS"
+    )
+    AZURE_OPENAI_PRIORITY_WEIGHTS: Dict[str, int] = Field(
+        default={"interactive": 8, "search": 4, "evaluation": 2, "bulk": 1},
+        description="Share of the quota each priority class gets under contention",
+        env="AZURE_OPENAI_PRIORITY_WEIGHTS"
+    )
+
+    # Embedding cache
+    EMBEDDING_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Serve repeated texts from the embedding cache instead of the API",
+        env="EMBEDDING_CACHE_ENABLED"
+    )
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(
+        default=2048,
+        description="Vectors kept in the in-process tier of the embedding cache",
+        env="EMBEDDING_CACHE_MAX_ENTRIES"
+    )
+    EMBEDDING_CACHE_PERSIST: bool = Field(
+        default=True,
+        description="Also keep cached embeddings in the embedding_cache table, shared across workers and restarts",
+        env="EMBEDDING_CACHE_PERSIST"
+    )
         
     class Config:
         env_file = ".env"
@@ -17,3 +17,13 @@ class ExternalServiceException(Exception):
     """Raised when external service fails."""
     pass
 
+
+
+class UpstreamUnavailableException(ExternalServiceException):
+    """Raised when an upstream call is rejected without being attempted."""
+    pass
+
+
+class UpstreamRejectedException(ExternalServiceException):
+    """Raised when an upstream answers but rejects the request (4xx or GraphQL errors)."""
+    pass
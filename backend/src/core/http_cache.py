@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from src.core.config import settings
+from src.core.serialization import trusted_models, type_adapter
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_control(max_age: int, stale_while_revalidate: int) -> str:
+    return f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+
+# Cache-Control policies per route family
+ENTITY_CACHE_CONTROL = _cache_control(settings.HTTP_CACHE_MAX_AGE_SECONDS, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS)
+LISTING_CACHE_CONTROL = _cache_control(settings.HTTP_CACHE_MAX_AGE_SECONDS // 5, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS)
+NOTES_CACHE_CONTROL = "private, no-cache"  # user-edited: always revalidate
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from version parts (counters, snapshot stamps, query strings)."""
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest() + '"'
+
+
+def request_etag(request: Request, version: str) -> str:
+    """ETag for a response fully determined by `version` and the request's path and query."""
+    return make_etag(version, request.url.path, sorted(request.query_params.multi_items()))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match names `etag` (weak comparison, as RFC 9110 requires for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def validator_headers(etag: str, cache_control: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """A bodiless 304 carrying the validator and caching policy."""
+    return Response(status_code=304, headers=validator_headers(etag, cache_control))
+
+
+class EncodedBodyCache:
+    """
+    Memoizes the JSON body and content-hash ETag of response models.
+
+    Only models handed out by `trusted_models` are memoized: they are the same
+    objects on every upstream cache hit, so keying by identity lets repeat
+    requests — and their 304s — skip serialization and hashing. Models built per
+    request (mirror reads, search results) are encoded without being retained.
+    Entries hold the model, so an ID is never reused by a different object while
+    cached, and are bounded by count and total body size.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, Tuple[Any, bytes, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, content: Any) -> Tuple[bytes, str]:
+        """Returns ``(body, etag)`` for `content`, encoding each shared object once."""
+        key = id(content)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is content:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2]
+
+        body = type_adapter(type(content)).dump_json(content)
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        with self._lock:
+            self.misses += 1
+        if len(body) <= self.max_bytes and trusted_models.is_trusted(content):
+            self._store(key, (content, body, etag))
+        return body, etag
+
+    def prime(self, content: Any) -> None:
+        """Encodes `content` ahead of its first request, if it is an object that will be served again."""
+        if trusted_models.is_trusted(content):
+            self.encode(content)
+
+    def _store(self, key: int, entry: Tuple[Any, bytes, str]) -> None:
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced is not None:
+                self._bytes -= len(replaced[1])
+            self._entries[key] = entry
+            self._bytes += len(entry[1])
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[1])
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and current usage."""
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+def version_not_modified(request: Request, version: Optional[str], cache_control: str) -> Optional[Response]:
+    """
+    A 304 when the client holds the ETag `request_etag` derives from `version`,
+    checked before the response is read or encoded; None otherwise.
+    """
+    if version is None:
+        return None
+    etag = request_etag(request, version)
+    return not_modified(etag, cache_control) if etag_matches(request, etag) else None
+
+
+def cached_json_response(request: Request, content: Any, cache_control: str, version: Optional[str] = None) -> Response:
+    """
+    JSON response with an ETag, or a 304 when the client already holds it.
+
+    Content built per request (mirror reads) is tagged from `version`, the version
+    it was read at, when one is given; shared upstream models carry the hash of
+    their memoized body.
+    """
+    if version is not None and not trusted_models.is_trusted(content):
+        etag = request_etag(request, version)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
+        body = type_adapter(type(content)).dump_json(content)
+    else:
+        body, etag = encoded_bodies.encode(content)
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
+    return Response(content=body, media_type="application/json", headers=validator_headers(etag, cache_control))
+
+
+# Singleton instance
+encoded_bodies = EncodedBodyCache()
@@ -0,0 +1,111 @@
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Optional, Tuple, Type, TypeVar
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(type_: Any) -> TypeAdapter:
+    """Returns the adapter for a type, building its validator and serializer once."""
+    return TypeAdapter(type_)
+
+
+class TrustedModelCache:
+    """
+    Memoizes models validated from payloads the process already trusts.
+
+    Upstream cache entries are shared, never mutated and replaced (not edited) on
+    refresh, so a model validated from one stays valid for as long as that exact
+    object is served. Entries are keyed by identity and hold a reference to the
+    payload, so an ID cannot be reused by a different object while it is cached.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[type, int], Tuple[Any, BaseModel]]" = OrderedDict()
+        self._instances: Dict[int, BaseModel] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, model: Type[ModelT], payload: Any) -> ModelT:
+        """Returns `payload` validated as `model`, validating each payload object only once."""
+        key: Hashable = (model, id(payload))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is payload:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        instance = model.model_validate(payload)
+        with self._lock:
+            self.misses += 1
+            replaced = self._entries.get(key)
+            if replaced is not None:
+                self._instances.pop(id(replaced[1]), None)
+            self._entries[key] = (payload, instance)
+            self._entries.move_to_end(key)
+            self._instances[id(instance)] = instance
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._instances.pop(id(evicted), None)
+        return instance
+
+    def is_trusted(self, instance: Any) -> bool:
+        """Whether `instance` is a model currently memoized here, and so shared across requests."""
+        with self._lock:
+            return self._instances.get(id(instance)) is instance
+
+    def clear(self) -> None:
+        """Drops every memoized model."""
+        with self._lock:
+            self._entries.clear()
+            self._instances.clear()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the number of memoized models."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serializes validated models straight to JSON bytes.
+
+    Returning a `Response` makes FastAPI skip re-validating the result against the
+    route's `response_model` and the intermediate dict from `jsonable_encoder`;
+    the `response_model` still documents the schema.
+    """
+    body = type_adapter(type(content)).dump_json(content)
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: orjson for plain data, Pydantic's encoder for anything orjson rejects.
+
+    Routes with a `response_model` are serialized by FastAPI through Pydantic already;
+    this covers routes returning dicts and lists (health, metrics, errors), including
+    numpy arrays such as embeddings.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return to_json(content, fallback=str)
+
+
+# Singleton instance
+trusted_models = TrustedModelCache()
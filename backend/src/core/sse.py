@@ -0,0 +1,61 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, TypeVar
+
+import anyio
+import orjson
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+T = TypeVar("T")
+
+# Keeps proxies from buffering or caching the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """One server-sent event; orjson output has no newlines, so the payload fits a single data line."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+class EventStream(Generic[T]):
+    """
+    Async iterator that owns the upstream it reads from.
+
+    `aclose` closes the iterator and then calls `close`, even when iteration never
+    started: an async generator's ``finally`` only runs once it has been entered,
+    so a client gone before the first event would otherwise leave the upstream open.
+    """
+
+    def __init__(self, events: AsyncIterator[T], close: Callable[[], Awaitable[Any]]):
+        self._events = events
+        self._close = close
+        self._closed = False
+
+    def __aiter__(self) -> "EventStream[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        return await self._events.__anext__()
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._events.aclose()
+        finally:
+            await self._close()
+
+
+class _EventSourceResponse(StreamingResponse):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Runs on disconnects and cancellation too, which skip background tasks
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+
+def sse_response(events: EventStream[bytes]) -> StreamingResponse:
+    """Streams pre-encoded events as they are produced, closing `events` however the response ends."""
+    return _EventSourceResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
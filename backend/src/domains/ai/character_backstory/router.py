@@ -1,7 +1,8 @@
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from src.core.ai.generation.models import GenerationResponse
+from src.core.sse import sse_response
 from src.domains.ai.character_backstory.models import (
     CharacterBackstoryRequest,
     CharacterBackstoryEvaluationRequest,
@@ -15,9 +16,16 @@ router = APIRouter(prefix="/character-backstory", tags=["Character Backstory"])
 
 
 @router.post("/generate", response_model=GenerationResponse)
-async def generate_character_backstory(request: CharacterBackstoryRequest):
+async def generate_character_backstory(
+    request: CharacterBackstoryRequest,
+    stream: bool = Query(False, description="Stream the text as server-sent events (delta events, then a done event with usage)"),
+):
     """Generates a character backstory using AI based on provided character data."""
     try:
+        if stream:
+            events = await character_backstory_service.generate_stream(request)
+            logger.info(f"Streaming character backstory for character {request.character.id}")
+            return sse_response(events)
         result = await character_backstory_service.generate(request)
         logger.info(f"Successfully generated character backstory for character {request.character.id}")
         return result
@@ -1,7 +1,8 @@
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from src.core.ai.generation.models import GenerationResponse
+from src.core.sse import sse_response
 from src.core.ai.evaluation.models import EvaluationResponse
 from src.domains.ai.location_adventure_story.models import (
     LocationAdventureStoryRequest,
@@ -15,9 +16,16 @@ router = APIRouter(prefix="/location-adventure-story", tags=["Location Adventure
 
 
 @router.post("/generate", response_model=GenerationResponse)
-async def generate_location_adventure_story(request: LocationAdventureStoryRequest):
+async def generate_location_adventure_story(
+    request: LocationAdventureStoryRequest,
+    stream: bool = Query(False, description="Stream the text as server-sent events (delta events, then a done event with usage)"),
+):
     """Generates a location adventure story using AI based on provided location data."""
     try:
+        if stream:
+            events = await location_adventure_story_service.generate_stream(request)
+            logger.info(f"Streaming location adventure story for location {request.location.id}")
+            return sse_response(events)
         result = await location_adventure_story_service.generate(request)
         logger.info(f"Successfully generated location adventure story for location {request.location.id}")
         return result
@@ -2,7 +2,7 @@ from typing import Literal, Optional, Any
 
 from sqlalchemy import Column, Integer, String, Text, DateTime, func
 from pgvector.sqlalchemy import Vector
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, SerializeAsAny
 
 from src.core.database.connection import Base
 
@@ -27,7 +27,8 @@ class SearchResult(BaseModel):
     score: float | None = None
     entity_id: int
     entity_type: Literal["character", "location", "episode"]
-    entity_data: dict[str, Any] = {}
+    # Hydrated entity models are kept as-is and serialized with their own fields
+    entity_data: SerializeAsAny[BaseModel] | dict[str, Any] = {}
 
 
 class SearchInfo(BaseModel):
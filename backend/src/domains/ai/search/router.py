@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from src.core.database.connection import db_connection
+from src.core.serialization import json_response
 from src.domains.ai.search import models as search_models
 from src.domains.ai.search.service import SearchService
 
@@ -22,7 +23,7 @@ async def search(
     """Search over indexed entities using semantic similarity."""
     try:
         service = SearchService(db)
-        return await service.search(query, limit=limit)
+        return json_response(await service.search(query, limit=limit))
     except Exception as e:
         logger.error(f"Error during search: {e}")
         raise HTTPException(status_code=500, detail="Search failed")
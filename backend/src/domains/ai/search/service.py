@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from sqlalchemy.orm import Session
@@ -24,34 +25,44 @@ class SearchService:
         logger.info("Semantic Search called", extra={"query": query})
 
         # Generate embedding for the query
-        embedding = await azure_openai_client.generate_embedding(query)
+        embedding = await azure_openai_client.generate_embedding(query, priority="search")
 
         # Search the search index for the query
         base_rows = self.repository.search(embedding, limit=limit)
 
-        # Enrich results with detailed entity data
+        # Enrich results with detailed entity data, hydrating each entity type in one concurrent batch
+        ids_by_type: dict[str, list[int]] = {}
+        for entry, _ in base_rows:
+            ids_by_type.setdefault(entry.entity_type, []).append(entry.entity_id)
+
+        batch_fetchers = {
+            "character": characters_service.get_characters_by_ids,
+            "location": locations_service.get_locations_by_ids,
+            "episode": episodes_service.get_episodes_by_ids,
+        }
+        hydrate = {
+            entity_type: batch_fetchers[entity_type](entity_ids)
+            for entity_type, entity_ids in ids_by_type.items()
+            if entity_type in batch_fetchers
+        }
+        entities: dict[tuple[str, int], object] = {}
+        for entity_type, batch in zip(hydrate, await asyncio.gather(*hydrate.values())):
+            for entity in batch:
+                entities[(entity_type, entity.id)] = entity
+
         enriched_results: list[search_models.SearchResult] = []
         for entry, similarity in base_rows:
             entity_id = entry.entity_id
             entity_type = entry.entity_type
 
-            if entity_type == "character":
-                entity = characters_service.get_character_by_id(entity_id)
-            elif entity_type == "location":
-                entity = locations_service.get_location_by_id(entity_id)
-            elif entity_type == "episode":
-                entity = episodes_service.get_episode_by_id(entity_id)
-            else:
-                entity = None
-
-            entity_data = entity.model_dump() if entity is not None else {}
+            entity = entities.get((entity_type, entity_id))
 
             enriched_results.append(
                 search_models.SearchResult(
                     score=float(similarity),
                     entity_id=entity_id,
                     entity_type=entity_type,
-                    entity_data=entity_data,
+                    entity_data=entity if entity is not None else {},
                 )
             )
 
@@ -74,11 +85,11 @@ class SearchService:
 
         # Build base context from the appropriate domain service
         if entity_type == "character":
-            base_context = characters_service.get_character_context(entity_id, include_all_episodes_info=False)
+            base_context = await characters_service.get_character_context(entity_id, include_all_episodes_info=False)
         elif entity_type == "location":
-            base_context = locations_service.get_location_context(entity_id, include_all_residents_info=False)
+            base_context = await locations_service.get_location_context(entity_id, include_all_residents_info=False)
         elif entity_type == "episode":
-            base_context = episodes_service.get_episode_context(entity_id, include_all_characters_info=True)
+            base_context = await episodes_service.get_episode_context(entity_id, include_all_characters_info=True)
         else:
             raise ValueError(f"Unsupported entity type: {entity_type}")
 
@@ -86,7 +97,7 @@ class SearchService:
         full_context = f"entity_type: {entity_type}\n{base_context}\n\n{payload.additional_context}".strip()
 
         # Generate embedding for the full context   
-        embedding = await azure_openai_client.generate_embedding(full_context)
+        embedding = await azure_openai_client.generate_embedding(full_context, priority="bulk")
 
         # Check if the entity already exists in the search index
         existing_id = self.repository.get_id_by_entity(entity_id, entity_type)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 
@@ -47,6 +47,27 @@ class CharacterDetailed(BaseModel):
     created: str
 
 
+class EpisodeReference(BaseModel):
+    """Episode name only."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    name: str
+
+
+class CharacterContextSource(BaseModel):
+    """Character fields read when building prompt context."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    name: str
+    status: str
+    species: str
+    type: str
+    gender: str
+    origin: CharacterLocation
+    location: CharacterLocation
+    episode: List[EpisodeReference] = []
+
+
 class PaginationInfo(BaseModel):
     """Pagination metadata."""
     model_config = ConfigDict(from_attributes=True)
@@ -57,9 +78,31 @@ class PaginationInfo(BaseModel):
     prev: Optional[int] = None
 
 
+class CursorInfo(BaseModel):
+    """Cursor pagination metadata."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    count: int
+    limit: int
+    next_cursor: Optional[str] = None
+
+
 class CharactersPage(BaseModel):
     """Paginated characters response."""
     model_config = ConfigDict(from_attributes=True)
     
     info: PaginationInfo
     results: List[Character]
+
+
+class CharactersCursorPage(BaseModel):
+    """Cursor-paginated characters response."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    info: CursorInfo
+    results: List[Character]
+
+
+class CharacterBatchRequest(BaseModel):
+    """Request model for hydrating several characters by ID."""
+    ids: List[int] = Field(..., min_length=1, max_length=200)
@@ -1,35 +1,93 @@
 import logging
-from fastapi import APIRouter, HTTPException, Query
+from typing import List, Union
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from src.core.http_cache import (
+    ENTITY_CACHE_CONTROL,
+    LISTING_CACHE_CONTROL,
+    cached_json_response,
+    etag_matches,
+    not_modified,
+    request_etag,
+    validator_headers,
+    version_not_modified,
+)
+from src.core.serialization import json_response
+from src.domains.dataset.cursor import MAX_LIMIT
+from src.domains.dataset.service import dataset_service
 from src.domains.characters import models as characters_models
 from src.domains.characters.service import characters_service
+from src.domains.mirror.service import mirror_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/characters", tags=["Characters"])
 
 
-@router.get("", response_model=characters_models.CharactersPage)
-async def get_characters(page: int = Query(1, ge=1, description="Page number")):
-    """Returns paginated characters with minimal details."""
-    logger.info(f"Fetching characters page {page}")
+@router.get("", response_model=Union[characters_models.CharactersPage, characters_models.CharactersCursorPage])
+async def get_characters(
+    request: Request,
+    page: int = Query(1, ge=1, description="Page number"),
+    status: str | None = Query(None, description="Filter by status (e.g. Alive, Dead, unknown)"),
+    species: str | None = Query(None, description="Filter by species (e.g. Human, Alien)"),
+    gender: str | None = Query(None, description="Filter by gender (e.g. Female, Male, Genderless, unknown)"),
+    type_: str | None = Query(None, alias="type", description="Filter by type (e.g. Parasite)"),
+    name: str | None = Query(None, min_length=1, description="Search by name"),
+    name_match: str = Query("substring", description="Name search mode: prefix or substring"),
+    sort: str | None = Query(None, description="Sort by id, name, status or species; prefix with '-' for descending"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous response's info.next_cursor"),
+    limit: int | None = Query(None, ge=1, le=MAX_LIMIT, description="Page size for cursor pagination"),
+):
+    """Returns paginated characters with minimal details, optionally filtered, searched and sorted."""
+    searching = any(value is not None for value in (status, species, gender, type_, name, sort, cursor, limit))
+    logger.info(f"Fetching characters page {page}" + (f" (status={status}, species={species}, gender={gender}, type={type_}, name={name!r}, sort={sort})" if searching else ""))
     try:
-        result = characters_service.get_characters_page(page)
+        if searching:
+            etag = request_etag(request, await dataset_service.get_version())
+            if etag_matches(request, etag):
+                return not_modified(etag, LISTING_CACHE_CONTROL)
+            result = await characters_service.search_characters(
+                status=status, species=species, gender=gender, type_=type_,
+                name=name, name_match=name_match, sort=sort or "id", page=page, cursor=cursor, limit=limit,
+            )
+        else:
+            version = await mirror_service.aget_version()
+            unchanged = version_not_modified(request, version, LISTING_CACHE_CONTROL)
+            if unchanged is not None:
+                return unchanged
+            result = await characters_service.get_characters_page(page)
         logger.info(f"Successfully fetched page {page}: {len(result.results)} characters")
-        return result
+        if searching:
+            return json_response(result, headers=validator_headers(etag, LISTING_CACHE_CONTROL))
+        return cached_json_response(request, result, LISTING_CACHE_CONTROL, version=version)
     except ValueError as e:
-        logger.warning(f"Invalid page number: {page} {str(e)}")
+        logger.warning(f"Invalid characters query: page={page} {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching characters: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch characters")
 
 
+@router.post("/batch", response_model=List[characters_models.Character])
+async def get_characters_batch(batch: characters_models.CharacterBatchRequest) -> Response:
+    """Returns minimal details for up to 200 characters by ID, e.g. to hydrate lazily streamed location residents."""
+    logger.info(f"Hydrating {len(batch.ids)} characters")
+    try:
+        return json_response(await characters_service.get_character_summaries(batch.ids))
+    except Exception as e:
+        logger.error(f"Error hydrating characters: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch characters")
+
+
 @router.get("/{character_id}", response_model=characters_models.CharacterDetailed)
-async def get_character(character_id: int) -> characters_models.CharacterDetailed:
+async def get_character(request: Request, character_id: int) -> Response:
     """Returns a single character by ID with all details."""
     try:
-        return characters_service.get_character_by_id(character_id)
+        version = await mirror_service.aget_version()
+        unchanged = version_not_modified(request, version, ENTITY_CACHE_CONTROL)
+        if unchanged is not None:
+            return unchanged
+        return cached_json_response(request, await characters_service.get_character_by_id(character_id), ENTITY_CACHE_CONTROL, version=version)
     except Exception as e:
         logger.error(f"Error fetching character {character_id}: {e}")
         raise HTTPException(status_code=404, detail="Character not found")
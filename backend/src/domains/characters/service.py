@@ -1,43 +1,131 @@
 import logging
 
+from src.core.blocking import sync_shim
+from src.core.serialization import trusted_models
 from src.core.utils import build_character_context, clean_prompt
-from src.domains.characters.models import CharactersPage, CharacterDetailed
+from src.domains.characters.models import Character, CharactersPage, CharactersCursorPage, CharacterDetailed, CharacterContextSource
+from src.domains.dataset.cursor import query_key, window_of
+from src.domains.dataset.service import PAGE_SIZE, dataset_service, page_of
+from src.domains.mirror.service import mirror_service
+from src.integrations.rick_and_morty.queries.builder import select_fields
 from src.integrations.rick_and_morty.service import rick_and_morty_service
 
 logger = logging.getLogger(__name__)
 
+# Fields read by build_character_context; context lookups fetch only these
+CONTEXT_SELECTION = select_fields(
+    "name",
+    "status",
+    "species",
+    "type",
+    "gender",
+    origin=select_fields("name", "dimension"),
+    location=select_fields("name", "dimension"),
+    episode=select_fields("name"),
+)
+
 
 class CharactersService:
     """Service for character operations."""
     
     def __init__(self):
         self.rick_and_morty_service = rick_and_morty_service
+        self.mirror_service = mirror_service
+        self.dataset_service = dataset_service
     
-    def get_characters_page(self, page: int = 1) -> CharactersPage:
+    async def get_characters_page(self, page: int = 1) -> CharactersPage:
         """Returns paginated characters with minimal fields."""
         if page < 1:
             raise ValueError("Page must be >= 1")
         
         logger.debug(f"Fetching characters page {page}")
-        raw_data = self.rick_and_morty_service.fetch_characters_page(page)
-        characters_page = CharactersPage(**raw_data)
+        raw_data = await self.mirror_service.aget_characters_page(page)
+        if raw_data:
+            characters_page = CharactersPage(**raw_data)
+        else:
+            characters_page = trusted_models.validate(CharactersPage, await self.rick_and_morty_service.afetch_characters_page(page))
         logger.debug(f"Parsed {len(characters_page.results)} characters from page {page}")
         return characters_page
     
-    def get_character_by_id(self, character_id: int) -> CharacterDetailed:
+    async def search_characters(
+        self,
+        status: str | None = None,
+        species: str | None = None,
+        gender: str | None = None,
+        type_: str | None = None,
+        name: str | None = None,
+        name_match: str = "substring",
+        sort: str = "id",
+        page: int = 1,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> CharactersPage | CharactersCursorPage:
+        """
+        Filters, searches and sorts every character in process.
+
+        Returns one numbered page of the matches, or `limit` matches after `cursor`
+        when either is given.
+        """
+        if page < 1:
+            raise ValueError("Page must be >= 1")
+        if page > 1 and (cursor is not None or limit is not None):
+            raise ValueError("Use either page or cursor/limit, not both")
+
+        indexes = await self.dataset_service.get_indexes()
+        filters = {
+            field: value
+            for field, value in (("status", status), ("species", species), ("gender", gender), ("type", type_))
+            if value is not None
+        }
+        rows = indexes.characters.query(filters=filters, name=name, name_match=name_match, sort=sort)
+        logger.debug(f"Matched {len(rows)} characters for filters {filters}, name={name!r}, sort={sort}")
+        if cursor is None and limit is None:
+            return CharactersPage.model_validate(page_of(rows, page))
+        key = query_key("characters", name=name, name_match=name_match if name else None, sort=sort, **filters)
+        return CharactersCursorPage.model_validate(window_of(rows, key, cursor, limit or PAGE_SIZE))
+    
+    async def get_character_by_id(self, character_id: int) -> CharacterDetailed:
         """Get a single character by ID with all details."""
         logger.debug(f"Fetching character {character_id}")
-        raw_data = self.rick_and_morty_service.fetch_character_by_id(character_id)
-        character = CharacterDetailed(**raw_data)
+        raw_data = await self.mirror_service.aget_character_by_id(character_id)
+        if raw_data:
+            character = CharacterDetailed(**raw_data)
+        else:
+            character = trusted_models.validate(CharacterDetailed, await self.rick_and_morty_service.afetch_character_by_id(character_id))
         logger.debug(f"Fetched character: {character.name}")
         return character
 
-    def get_character_context(self, character_id: int, include_all_episodes_info: bool ) -> str:
+    async def get_characters_by_ids(self, character_ids: list[int]) -> list[CharacterDetailed]:
+        """Get several characters by ID with all details, in the order requested; unknown IDs are skipped."""
+        logger.debug(f"Fetching {len(character_ids)} characters by ID")
+        mirrored = await self.mirror_service.aget_characters_by_ids(character_ids) or {}
+        found = {entity_id: CharacterDetailed(**raw_data) for entity_id, raw_data in mirrored.items()}
+        missing = [character_id for character_id in character_ids if character_id not in found]
+        if missing:
+            for raw_data in await self.rick_and_morty_service.afetch_characters_by_ids(missing):
+                found[int(raw_data["id"])] = trusted_models.validate(CharacterDetailed, raw_data)
+        return [found[character_id] for character_id in dict.fromkeys(character_ids) if character_id in found]
+
+    async def get_character_summaries(self, character_ids: list[int]) -> list[Character]:
+        """Get several characters by ID with minimal fields from the dataset snapshot, in the order requested; unknown IDs are skipped."""
+        indexes = await self.dataset_service.get_indexes()
+        rows = (indexes.characters.get(character_id) for character_id in dict.fromkeys(character_ids))
+        return [Character.model_validate(row) for row in rows if row is not None]
+
+    async def get_character_context(self, character_id: int, include_all_episodes_info: bool ) -> str:
         """Get a structured context string for a character by ID."""
-        character = self.get_character_by_id(character_id)
+        raw_data = await self.mirror_service.aget_character_by_id(character_id)
+        if raw_data:
+            character = CharacterContextSource(**raw_data)
+        else:
+            raw_data = await self.rick_and_morty_service.afetch_character_by_id(character_id, selection=CONTEXT_SELECTION)
+            character = trusted_models.validate(CharacterContextSource, raw_data)
         context = build_character_context(character, include_all_episodes_info)
         return clean_prompt(context)
 
 
 # Singleton instance
-characters_service = CharactersService()
\ No newline at end of file
+characters_service = CharactersService()
+
+# Blocking facade for scripts and other callers without an event loop
+characters_service_sync = sync_shim(characters_service)
\ No newline at end of file
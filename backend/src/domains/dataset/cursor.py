@@ -0,0 +1,59 @@
+import base64
+import hashlib
+import json
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Cursor pages accept 1..MAX_LIMIT rows
+MAX_LIMIT = 200
+
+
+def query_key(kind: str, **params: Any) -> str:
+    """Short fingerprint of a listing query, so a cursor is only accepted for the query that issued it."""
+    normalized = json.dumps([kind, sorted((k, str(v)) for k, v in params.items() if v is not None)])
+    return hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+
+
+def encode_cursor(key: str, offset: int, last_id: int) -> str:
+    payload = json.dumps({"q": key, "o": offset, "id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> Tuple[int, int]:
+    """Returns ``(offset, last_id)``; raises ValueError for malformed cursors or ones from another query."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        offset, last_id, cursor_key = int(payload["o"]), int(payload["id"]), payload["q"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if cursor_key != key or offset < 0:
+        raise ValueError("Cursor does not belong to this query")
+    return offset, last_id
+
+
+def window_of(rows: List[Mapping[str, Any]], key: str, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    """
+    Slices `limit` rows after `cursor` and returns them with the cursor for the next slice.
+
+    Cursors carry the offset and the ID of the last row sent. When the dataset was
+    refreshed in between and that row moved, the slice resumes right after it.
+    """
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"Limit must be between 1 and {MAX_LIMIT}")
+
+    start = 0
+    if cursor:
+        offset, last_id = decode_cursor(cursor, key)
+        start = offset
+        if not (0 < offset <= len(rows) and rows[offset - 1]["id"] == last_id):
+            start = next((i + 1 for i, row in enumerate(rows) if row["id"] == last_id), min(offset, len(rows)))
+
+    results = rows[start:start + limit]
+    end = start + len(results)
+    return {
+        "info": {
+            "count": len(rows),
+            "limit": limit,
+            "next_cursor": encode_cursor(key, end, results[-1]["id"]) if results and end < len(rows) else None,
+        },
+        "results": results,
+    }
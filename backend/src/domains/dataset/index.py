@@ -0,0 +1,150 @@
+import bisect
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+NAME_MATCH_MODES = ("prefix", "substring")
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class EntityIndex:
+    """
+    Precomputed lookups over one entity type's rows.
+
+    - facets: inverted lists (value -> set of row positions), matched case-insensitively
+    - ranges/sorts: row positions ordered by each sortable field, with the sorted keys
+      alongside for range bisection
+    - names: a sorted list for prefix search and trigram postings for substring search
+
+    Combined filters intersect the candidate sets, smallest first, so a query never
+    scans rows that cannot match.
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Mapping[str, Any]],
+        facets: Iterable[str],
+        sort_keys: Mapping[str, Callable[[Mapping[str, Any]], Any]],
+    ):
+        self.rows = sorted(rows, key=lambda row: row["id"])
+        self._positions = {row["id"]: position for position, row in enumerate(self.rows)}
+
+        self._facets: Dict[str, Dict[str, frozenset]] = {}
+        for field in facets:
+            postings: Dict[str, set] = {}
+            for position, row in enumerate(self.rows):
+                postings.setdefault(str(row.get(field) or "").casefold(), set()).add(position)
+            self._facets[field] = {value: frozenset(positions) for value, positions in postings.items()}
+
+        # Rows whose key is None sort last and never fall inside a range
+        self._orders: Dict[str, array] = {}
+        self._sorted_keys: Dict[str, list] = {}
+        for field, key in sort_keys.items():
+            keyed = sorted(((key(row), position) for position, row in enumerate(self.rows) if key(row) is not None))
+            missing = [position for position, row in enumerate(self.rows) if key(row) is None]
+            self._orders[field] = array("i", [position for _, position in keyed] + missing)
+            self._sorted_keys[field] = [value for value, _ in keyed]
+        # Position -> index in each sort order, to sort small match sets directly
+        self._ranks: Dict[str, array] = {}
+        for field, order in self._orders.items():
+            rank = array("i", [0]) * len(self.rows)
+            for index, position in enumerate(order):
+                rank[position] = index
+            self._ranks[field] = rank
+
+        self._names = [row["name"].casefold() for row in self.rows]
+        self._name_order = sorted(range(len(self.rows)), key=lambda position: (self._names[position], position))
+        self._sorted_names = [self._names[position] for position in self._name_order]
+        self._name_trigrams: Dict[str, set] = {}
+        for position, name in enumerate(self._names):
+            for trigram in _trigrams(name):
+                self._name_trigrams.setdefault(trigram, set()).add(position)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, row_id: int) -> Optional[Mapping[str, Any]]:
+        position = self._positions.get(row_id)
+        return self.rows[position] if position is not None else None
+
+    @property
+    def facet_fields(self) -> Tuple[str, ...]:
+        return tuple(self._facets)
+
+    @property
+    def sort_fields(self) -> Tuple[str, ...]:
+        return tuple(self._orders)
+
+    def facet_values(self, field: str) -> Dict[str, int]:
+        """Distinct (case-folded) values of a facet with their row counts."""
+        return {value: len(positions) for value, positions in self._facets[field].items()}
+
+    def _facet(self, field: str, value: str) -> frozenset:
+        return self._facets[field].get(value.casefold(), frozenset())
+
+    def _range(self, field: str, low: Any, high: Any) -> frozenset:
+        keys = self._sorted_keys[field]
+        start = bisect.bisect_left(keys, low) if low is not None else 0
+        stop = bisect.bisect_right(keys, high) if high is not None else len(keys)
+        return frozenset(self._orders[field][start:stop])
+
+    def _name(self, text: str, match: str) -> frozenset:
+        needle = text.casefold()
+        if match == "prefix":
+            start = bisect.bisect_left(self._sorted_names, needle)
+            stop = bisect.bisect_left(self._sorted_names, needle + "\U0010ffff")
+            return frozenset(self._name_order[start:stop])
+        if len(needle) < 3:
+            return frozenset(position for position, name in enumerate(self._names) if needle in name)
+        postings = sorted((self._name_trigrams.get(trigram, set()) for trigram in _trigrams(needle)), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return frozenset(position for position in candidates if needle in self._names[position])
+
+    def query(
+        self,
+        filters: Optional[Mapping[str, str]] = None,
+        ranges: Optional[Mapping[str, Tuple[Any, Any]]] = None,
+        name: Optional[str] = None,
+        name_match: str = "substring",
+        sort: str = "id",
+    ) -> List[Mapping[str, Any]]:
+        """
+        Returns matching rows in `sort` order (``-field`` for descending).
+
+        Raises ValueError for unknown filter or sort fields and name match modes.
+        """
+        candidate_sets = []
+        for field, value in (filters or {}).items():
+            if field not in self._facets:
+                raise ValueError(f"Cannot filter on '{field}'")
+            candidate_sets.append(self._facet(field, value))
+        for field, (low, high) in (ranges or {}).items():
+            if field not in self._orders:
+                raise ValueError(f"Cannot filter on a range of '{field}'")
+            candidate_sets.append(self._range(field, low, high))
+        if name:
+            if name_match not in NAME_MATCH_MODES:
+                raise ValueError(f"Name match must be one of: {', '.join(NAME_MATCH_MODES)}")
+            candidate_sets.append(self._name(name, name_match))
+
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in self._orders:
+            raise ValueError(f"Sort must be one of: {', '.join(self._orders)} (prefix with '-' for descending)")
+
+        order = self._orders[field]
+        if descending:
+            order = order[::-1]
+        if not candidate_sets:
+            return [self.rows[position] for position in order]
+
+        candidate_sets.sort(key=len)
+        matches = candidate_sets[0].intersection(*candidate_sets[1:]) if len(candidate_sets) > 1 else candidate_sets[0]
+        if len(matches) * 8 < len(order):
+            # Few matches: sorting them by their rank is cheaper than walking the whole order
+            rank = self._ranks[field]
+            ranked = sorted(matches, key=rank.__getitem__, reverse=descending)
+            return [self.rows[position] for position in ranked]
+        return [self.rows[position] for position in order if position in matches]
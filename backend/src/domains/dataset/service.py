@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from src.core.config import settings
+from src.domains.dataset.index import EntityIndex
+from src.domains.mirror.service import PAGE_SIZE, mirror_service
+from src.integrations.rick_and_morty.service import rick_and_morty_service
+
+logger = logging.getLogger(__name__)
+
+
+def _air_date(row: Dict[str, Any]) -> Optional[date]:
+    """Parses upstream air dates such as "December 2, 2013"."""
+    try:
+        return datetime.strptime(row["air_date"], "%B %d, %Y").date()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _casefolded(field: str):
+    return lambda row: (row.get(field) or "").casefold()
+
+
+# Filterable attributes and sort keys per entity type
+INDEX_SPECS = {
+    "characters": (
+        ("status", "species", "gender", "type"),
+        {"id": lambda row: row["id"], "name": _casefolded("name"), "status": _casefolded("status"), "species": _casefolded("species")},
+    ),
+    "locations": (
+        ("type", "dimension"),
+        {"id": lambda row: row["id"], "name": _casefolded("name"), "type": _casefolded("type"), "dimension": _casefolded("dimension")},
+    ),
+    "episodes": (
+        (),
+        {"id": lambda row: row["id"], "name": _casefolded("name"), "air_date": _air_date, "episode": _casefolded("episode")},
+    ),
+}
+
+
+def _id(reference: Optional[Dict[str, Any]]) -> Optional[int]:
+    value = (reference or {}).get("id")
+    return int(value) if value not in (None, "") else None
+
+
+def page_of(rows: List[Any], page: int) -> Dict[str, Any]:
+    """Slices query results into an upstream-shaped page."""
+    pages = max(1, -(-len(rows) // PAGE_SIZE))
+    return {
+        "info": {
+            "count": len(rows),
+            "pages": pages,
+            "next": page + 1 if page < pages else None,
+            "prev": page - 1 if page > 1 else None,
+        },
+        "results": rows[(page - 1) * PAGE_SIZE:page * PAGE_SIZE],
+    }
+
+
+@dataclass(frozen=True)
+class DatasetIndexes:
+    """Filter/sort indexes for one snapshot, plus residents grouped by location."""
+
+    snapshot: "DatasetSnapshot"
+    characters: EntityIndex
+    locations: EntityIndex
+    episodes: EntityIndex
+    residents: Dict[int, List[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """
+    Every character, location and episode as flat rows, loaded in one pass.
+
+    Character rows carry ``origin_id``, ``location_id`` and ``episode_ids`` so
+    relationships can be indexed without loading related entities. Snapshots are
+    immutable; in-process indexes are rebuilt when a new snapshot object appears.
+    """
+
+    source: str
+    generation: int
+    built_at: datetime
+    build_seconds: float
+    characters: List[Dict[str, Any]]
+    locations: List[Dict[str, Any]]
+    episodes: List[Dict[str, Any]]
+
+
+class DatasetService:
+    """Keeps a snapshot of the whole dataset, from the mirror when it is ready or from bulk upstream walks."""
+
+    def __init__(self):
+        self.mirror_service = mirror_service
+        self.rick_and_morty_service = rick_and_morty_service
+        self._snapshot: DatasetSnapshot | None = None
+        self._indexes: DatasetIndexes | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._index_lock = asyncio.Lock()
+
+    async def _stale(self) -> bool:
+        if self._snapshot is None or time.monotonic() - self._loaded_at > settings.DATASET_REFRESH_SECONDS:
+            return True
+        if await self.mirror_service.aget_generation() != self._snapshot.generation:
+            return True
+        # Switch over once the mirror has been populated, possibly by another worker
+        return self._snapshot.source == "upstream" and await self.mirror_service.ais_ready()
+
+    async def get_snapshot(self) -> DatasetSnapshot:
+        """Returns the current snapshot, reloading it after a mirror sync in any worker or once it ages out."""
+        if not await self._stale():
+            return self._snapshot
+        async with self._lock:
+            if await self._stale():
+                self._snapshot = await self._load()
+                self._loaded_at = time.monotonic()
+        return self._snapshot
+
+    async def get_version(self) -> str:
+        """Identifies the current snapshot, for validators on responses derived from it."""
+        snapshot = await self.get_snapshot()
+        return f"{snapshot.source}:{snapshot.generation}:{snapshot.built_at.isoformat()}"
+
+    async def get_warm_indexes(self) -> Optional[DatasetIndexes]:
+        """Returns the indexes only if they are already built for a current snapshot, without loading anything."""
+        indexes = self._indexes
+        if indexes is None or indexes.snapshot is not self._snapshot or await self._stale():
+            return None
+        return indexes
+
+    async def get_indexes(self) -> DatasetIndexes:
+        """Returns the filter indexes for the current snapshot, building them once per snapshot."""
+        snapshot = await self.get_snapshot()
+        if self._indexes is not None and self._indexes.snapshot is snapshot:
+            return self._indexes
+        async with self._index_lock:
+            if self._indexes is None or self._indexes.snapshot is not snapshot:
+                started = time.perf_counter()
+                self._indexes = await asyncio.to_thread(self._build_indexes, snapshot)
+                logger.info(f"Built dataset filter indexes in {time.perf_counter() - started:.3f}s")
+        return self._indexes
+
+    def _build_indexes(self, snapshot: DatasetSnapshot) -> DatasetIndexes:
+        residents: Dict[int, List[Dict[str, Any]]] = {}
+        for row in snapshot.characters:
+            if row["location_id"] is not None:
+                residents.setdefault(row["location_id"], []).append(row)
+        indexes = {
+            kind: EntityIndex(getattr(snapshot, kind), facets, sort_keys)
+            for kind, (facets, sort_keys) in INDEX_SPECS.items()
+        }
+        return DatasetIndexes(snapshot=snapshot, residents=residents, **indexes)
+
+    async def _load(self) -> DatasetSnapshot:
+        started = time.perf_counter()
+        generation = await self.mirror_service.aget_generation()
+        dataset = await self.mirror_service.aget_dataset()
+        source = "mirror"
+        if dataset is None:
+            source = "upstream"
+            dataset = await self._load_from_upstream()
+
+        snapshot = DatasetSnapshot(
+            source=source,
+            generation=generation,
+            built_at=datetime.now(timezone.utc),
+            build_seconds=round(time.perf_counter() - started, 3),
+            **dataset,
+        )
+        logger.info(
+            f"Loaded dataset snapshot from {source} in {snapshot.build_seconds}s: "
+            f"{len(snapshot.characters)} characters, {len(snapshot.locations)} locations, {len(snapshot.episodes)} episodes"
+        )
+        return snapshot
+
+    async def _load_from_upstream(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Walks every page of the three entity types in a handful of aliased requests."""
+        characters, locations, episodes = await asyncio.gather(
+            self.rick_and_morty_service.afetch_all_characters_with_links(),
+            self.rick_and_morty_service.afetch_all_locations(),
+            self.rick_and_morty_service.afetch_all_episodes(),
+        )
+        return {
+            "characters": [
+                {
+                    "id": int(row["id"]),
+                    "name": row["name"],
+                    "status": row.get("status") or "",
+                    "species": row.get("species") or "",
+                    "type": row.get("type") or "",
+                    "gender": row.get("gender") or "",
+                    "image": row.get("image") or "",
+                    "origin_id": _id(row.get("origin")),
+                    "location_id": _id(row.get("location")),
+                    "episode_ids": sorted(int(episode["id"]) for episode in row.get("episode") or []),
+                }
+                for row in characters["results"]
+            ],
+            "locations": [
+                {"id": int(row["id"]), "name": row["name"], "type": row.get("type") or "", "dimension": row.get("dimension") or ""}
+                for row in locations["results"]
+            ],
+            "episodes": [
+                {"id": int(row["id"]), "name": row["name"], "air_date": row.get("air_date") or "", "episode": row.get("episode") or ""}
+                for row in episodes["results"]
+            ],
+        }
+
+
+# Singleton instance
+dataset_service = DatasetService()
@@ -35,6 +35,23 @@ class EpisodeDetailed(BaseModel):
     created: str
 
 
+class CharacterReference(BaseModel):
+    """Character name only."""
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+
+
+class EpisodeContextSource(BaseModel):
+    """Episode fields read when building prompt context."""
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    air_date: str
+    episode: str
+    characters: List[CharacterReference] = []
+
+
 class PaginationInfo(BaseModel):
     """Pagination metadata."""
     model_config = ConfigDict(from_attributes=True)
@@ -45,6 +62,15 @@ class PaginationInfo(BaseModel):
     prev: Optional[int] = None
 
 
+class CursorInfo(BaseModel):
+    """Cursor pagination metadata."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    count: int
+    limit: int
+    next_cursor: Optional[str] = None
+
+
 class EpisodesPage(BaseModel):
     """Paginated episodes response."""
     model_config = ConfigDict(from_attributes=True)
@@ -53,3 +79,9 @@ class EpisodesPage(BaseModel):
     results: List[Episode]
 
 
+class EpisodesCursorPage(BaseModel):
+    """Cursor-paginated episodes response."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    info: CursorInfo
+    results: List[Episode]
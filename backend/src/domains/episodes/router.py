@@ -1,24 +1,66 @@
 import logging
-from fastapi import APIRouter, HTTPException, Query
+from datetime import date
+from typing import Union
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from src.core.http_cache import (
+    ENTITY_CACHE_CONTROL,
+    LISTING_CACHE_CONTROL,
+    cached_json_response,
+    etag_matches,
+    not_modified,
+    request_etag,
+    validator_headers,
+    version_not_modified,
+)
+from src.core.serialization import json_response
+from src.domains.dataset.cursor import MAX_LIMIT
+from src.domains.dataset.service import dataset_service
 from src.domains.episodes import models as episodes_models
 from src.domains.episodes.service import episodes_service
+from src.domains.mirror.service import mirror_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/episodes", tags=["Episodes"])
 
 
-@router.get("", response_model=episodes_models.EpisodesPage)
-async def get_episodes(page: int = Query(1, ge=1, description="Page number")):
-    """Returns paginated episodes with minimal details."""
-    logger.info(f"Fetching episodes page {page}")
+@router.get("", response_model=Union[episodes_models.EpisodesPage, episodes_models.EpisodesCursorPage])
+async def get_episodes(
+    request: Request,
+    page: int = Query(1, ge=1, description="Page number"),
+    air_date_from: date | None = Query(None, description="Earliest air date (YYYY-MM-DD)"),
+    air_date_to: date | None = Query(None, description="Latest air date (YYYY-MM-DD)"),
+    name: str | None = Query(None, min_length=1, description="Search by name"),
+    name_match: str = Query("substring", description="Name search mode: prefix or substring"),
+    sort: str | None = Query(None, description="Sort by id, name, air_date or episode; prefix with '-' for descending"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous response's info.next_cursor"),
+    limit: int | None = Query(None, ge=1, le=MAX_LIMIT, description="Page size for cursor pagination"),
+):
+    """Returns paginated episodes with minimal details, optionally filtered, searched and sorted."""
+    searching = any(value is not None for value in (air_date_from, air_date_to, name, sort, cursor, limit))
+    logger.info(f"Fetching episodes page {page}" + (f" (air_date {air_date_from}..{air_date_to}, name={name!r}, sort={sort})" if searching else ""))
     try:
-        result = episodes_service.get_episodes_page(page)
+        if searching:
+            etag = request_etag(request, await dataset_service.get_version())
+            if etag_matches(request, etag):
+                return not_modified(etag, LISTING_CACHE_CONTROL)
+            result = await episodes_service.search_episodes(
+                air_date_from=air_date_from, air_date_to=air_date_to,
+                name=name, name_match=name_match, sort=sort or "id", page=page, cursor=cursor, limit=limit,
+            )
+        else:
+            version = await mirror_service.aget_version()
+            unchanged = version_not_modified(request, version, LISTING_CACHE_CONTROL)
+            if unchanged is not None:
+                return unchanged
+            result = await episodes_service.get_episodes_page(page)
         logger.info(f"Successfully fetched page {page}: {len(result.results)} episodes")
-        return result
+        if searching:
+            return json_response(result, headers=validator_headers(etag, LISTING_CACHE_CONTROL))
+        return cached_json_response(request, result, LISTING_CACHE_CONTROL, version=version)
     except ValueError as e:
-        logger.warning(f"Invalid page number: {page} {str(e)}")
+        logger.warning(f"Invalid episodes query: page={page} {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching episodes: {e}")
@@ -26,10 +68,14 @@ async def get_episodes(page: int = Query(1, ge=1, description="Page number")):
 
 
 @router.get("/{episode_id}", response_model=episodes_models.EpisodeDetailed)
-async def get_episode(episode_id: int) -> episodes_models.EpisodeDetailed:
+async def get_episode(request: Request, episode_id: int) -> Response:
     """Returns a single episode by ID with all details."""
     try:
-        return episodes_service.get_episode_by_id(episode_id)
+        version = await mirror_service.aget_version()
+        unchanged = version_not_modified(request, version, ENTITY_CACHE_CONTROL)
+        if unchanged is not None:
+            return unchanged
+        return cached_json_response(request, await episodes_service.get_episode_by_id(episode_id), ENTITY_CACHE_CONTROL, version=version)
     except Exception as e:
         logger.error(f"Error fetching episode {episode_id}: {e}")
         raise HTTPException(status_code=404, detail="Episode not found")
@@ -1,40 +1,115 @@
 import logging
+from datetime import date
 
+from src.core.blocking import sync_shim
+from src.core.serialization import trusted_models
 from src.core.utils import build_episode_context, clean_prompt
-from src.domains.episodes.models import EpisodesPage, EpisodeDetailed
+from src.domains.dataset.cursor import query_key, window_of
+from src.domains.dataset.service import PAGE_SIZE, dataset_service, page_of
+from src.domains.episodes.models import EpisodesPage, EpisodesCursorPage, EpisodeDetailed, EpisodeContextSource
+from src.domains.mirror.service import mirror_service
+from src.integrations.rick_and_morty.queries.builder import select_fields
 from src.integrations.rick_and_morty.service import rick_and_morty_service
 
 logger = logging.getLogger(__name__)
 
+# Fields read by build_episode_context; context lookups fetch only these
+CONTEXT_SELECTION = select_fields(
+    "name",
+    "air_date",
+    "episode",
+    characters=select_fields("name"),
+)
+
 
 class EpisodesService:
     """Service for episode operations."""
 
     def __init__(self):
         self.rick_and_morty_service = rick_and_morty_service
+        self.mirror_service = mirror_service
+        self.dataset_service = dataset_service
 
-    def get_episodes_page(self, page: int = 1) -> EpisodesPage:
+    async def get_episodes_page(self, page: int = 1) -> EpisodesPage:
         """Returns paginated episodes with minimal fields."""
         if page < 1:
             raise ValueError("Page must be >= 1")
 
         logger.debug(f"Fetching episodes page {page}")
-        raw_data = self.rick_and_morty_service.fetch_episodes_page(page)
-        episodes_page = EpisodesPage(**raw_data)
+        raw_data = await self.mirror_service.aget_episodes_page(page)
+        if raw_data:
+            episodes_page = EpisodesPage(**raw_data)
+        else:
+            episodes_page = trusted_models.validate(EpisodesPage, await self.rick_and_morty_service.afetch_episodes_page(page))
         logger.debug(f"Parsed {len(episodes_page.results)} episodes from page {page}")
         return episodes_page
 
-    def get_episode_by_id(self, episode_id: int) -> EpisodeDetailed:
+    async def search_episodes(
+        self,
+        air_date_from: date | None = None,
+        air_date_to: date | None = None,
+        name: str | None = None,
+        name_match: str = "substring",
+        sort: str = "id",
+        page: int = 1,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> EpisodesPage | EpisodesCursorPage:
+        """
+        Filters, searches and sorts every episode in process.
+
+        Returns one numbered page of the matches, or `limit` matches after `cursor`
+        when either is given.
+        """
+        if page < 1:
+            raise ValueError("Page must be >= 1")
+        if page > 1 and (cursor is not None or limit is not None):
+            raise ValueError("Use either page or cursor/limit, not both")
+        if air_date_from and air_date_to and air_date_from > air_date_to:
+            raise ValueError("air_date_from must not be after air_date_to")
+
+        indexes = await self.dataset_service.get_indexes()
+        ranges = {"air_date": (air_date_from, air_date_to)} if air_date_from or air_date_to else {}
+        rows = indexes.episodes.query(ranges=ranges, name=name, name_match=name_match, sort=sort)
+        logger.debug(f"Matched {len(rows)} episodes for air dates {air_date_from}..{air_date_to}, name={name!r}, sort={sort}")
+        if cursor is None and limit is None:
+            return EpisodesPage.model_validate(page_of(rows, page))
+        key = query_key(
+            "episodes", air_date_from=air_date_from, air_date_to=air_date_to,
+            name=name, name_match=name_match if name else None, sort=sort,
+        )
+        return EpisodesCursorPage.model_validate(window_of(rows, key, cursor, limit or PAGE_SIZE))
+
+    async def get_episode_by_id(self, episode_id: int) -> EpisodeDetailed:
         """Get a single episode by ID with all details."""
         logger.debug(f"Fetching episode {episode_id}")
-        raw_data = self.rick_and_morty_service.fetch_episode_by_id(episode_id)
-        episode = EpisodeDetailed(**raw_data)
+        raw_data = await self.mirror_service.aget_episode_by_id(episode_id)
+        if raw_data:
+            episode = EpisodeDetailed(**raw_data)
+        else:
+            episode = trusted_models.validate(EpisodeDetailed, await self.rick_and_morty_service.afetch_episode_by_id(episode_id))
         logger.debug(f"Fetched episode: {episode.name}")
         return episode
 
-    def get_episode_context(self, episode_id: int, include_all_characters_info: bool) -> str:
+    async def get_episodes_by_ids(self, episode_ids: list[int]) -> list[EpisodeDetailed]:
+        """Get several episodes by ID with all details, in the order requested; unknown IDs are skipped."""
+        logger.debug(f"Fetching {len(episode_ids)} episodes by ID")
+        mirrored = await self.mirror_service.aget_episodes_by_ids(episode_ids) or {}
+        found = {entity_id: EpisodeDetailed(**raw_data) for entity_id, raw_data in mirrored.items()}
+        missing = [episode_id for episode_id in episode_ids if episode_id not in found]
+        if missing:
+            for raw_data in await self.rick_and_morty_service.afetch_episodes_by_ids(missing):
+                found[int(raw_data["id"])] = trusted_models.validate(EpisodeDetailed, raw_data)
+        return [found[episode_id] for episode_id in dict.fromkeys(episode_ids) if episode_id in found]
+
+    async def get_episode_context(self, episode_id: int, include_all_characters_info: bool) -> str:
         """Get a structured context string for an episode by ID."""
-        episode = self.get_episode_by_id(episode_id)
+        raw_data = await self.mirror_service.aget_episode_by_id(episode_id)
+        if raw_data:
+            episode = EpisodeContextSource(**raw_data)
+        else:
+            raw_data = await self.rick_and_morty_service.afetch_episode_by_id(episode_id, selection=CONTEXT_SELECTION)
+            episode = trusted_models.validate(EpisodeContextSource, raw_data)
         context = build_episode_context(episode, include_all_characters_info)
         return clean_prompt(context)
 
@@ -42,4 +117,5 @@ class EpisodesService:
 # Singleton instance
 episodes_service = EpisodesService()
 
-
+# Blocking facade for scripts and other callers without an event loop
+episodes_service_sync = sync_shim(episodes_service)
@@ -0,0 +1,194 @@
+import heapq
+from array import array
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.core.exceptions import EntityNotFoundException
+
+# Node kinds on a connection path
+CHARACTER, EPISODE, LOCATION = "character", "episode", "location"
+
+
+class Adjacency:
+    """
+    Compressed sparse rows over dense node indexes.
+
+    The neighbours of node ``i`` are ``targets[offsets[i]:offsets[i + 1]]``, sorted,
+    so the whole relation lives in two flat integer arrays.
+    """
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, size: int, pairs: Iterable[Tuple[int, int]]):
+        rows: List[List[int]] = [[] for _ in range(size)]
+        for source, target in pairs:
+            rows[source].append(target)
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        for row in rows:
+            self.targets.extend(sorted(set(row)))
+            self.offsets.append(len(self.targets))
+
+    def neighbours(self, node: int) -> array:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    @property
+    def edges(self) -> int:
+        return len(self.targets)
+
+
+class NodeTable:
+    """Maps entity IDs to dense indexes and keeps their names."""
+
+    __slots__ = ("ids", "names", "_index")
+
+    def __init__(self, rows: Iterable[Tuple[int, str]]):
+        rows = sorted(rows)
+        self.ids = array("i", [row_id for row_id, _ in rows])
+        self.names: List[str] = [name for _, name in rows]
+        self._index = {row_id: i for i, row_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index(self, row_id: int) -> Optional[int]:
+        return self._index.get(row_id)
+
+
+class RelationshipGraph:
+    """
+    Character–episode–location adjacency index.
+
+    Characters link to the episodes they appear in and to their origin and current
+    location; each relation is stored in both directions so traversals from either
+    side are slices of flat arrays.
+    """
+
+    def __init__(
+        self,
+        characters: Iterable[Tuple[int, str, Optional[int], Optional[int]]],
+        appearances: Iterable[Tuple[int, int]],
+        episodes: Iterable[Tuple[int, str]],
+        locations: Iterable[Tuple[int, str]],
+    ):
+        characters = list(characters)
+        self.characters = NodeTable((row[0], row[1]) for row in characters)
+        self.episodes = NodeTable(episodes)
+        self.locations = NodeTable(locations)
+
+        # Drop links to entities that are not in the dataset (e.g. "unknown" origins)
+        appearance_pairs = [
+            (c, e)
+            for c, e in ((self.characters.index(cid), self.episodes.index(eid)) for cid, eid in appearances)
+            if c is not None and e is not None
+        ]
+        place_pairs = [
+            (self.characters.index(cid), l)
+            for cid, _, origin_id, location_id in characters
+            for l in (self.locations.index(origin_id), self.locations.index(location_id))
+            if l is not None
+        ]
+
+        self.character_episodes = Adjacency(len(self.characters), appearance_pairs)
+        self.episode_characters = Adjacency(len(self.episodes), ((e, c) for c, e in appearance_pairs))
+        self.character_locations = Adjacency(len(self.characters), place_pairs)
+        self.location_characters = Adjacency(len(self.locations), ((l, c) for c, l in place_pairs))
+
+    def _character(self, character_id: int) -> int:
+        index = self.characters.index(character_id)
+        if index is None:
+            raise EntityNotFoundException(f"Character {character_id} not found")
+        return index
+
+    def stats(self) -> dict:
+        """Node and edge counts."""
+        return {
+            "characters": len(self.characters),
+            "episodes": len(self.episodes),
+            "locations": len(self.locations),
+            "appearances": self.character_episodes.edges,
+            "location_links": self.character_locations.edges,
+        }
+
+    def character_name(self, character_id: int) -> str:
+        return self.characters.names[self._character(character_id)]
+
+    def co_appearances(self, character_id: int, limit: int) -> List[Tuple[int, int]]:
+        """Characters sharing episodes with `character_id` as ``(id, shared_count)``, most shared first."""
+        source = self._character(character_id)
+        counts: Counter = Counter()
+        for episode in self.character_episodes.neighbours(source):
+            counts.update(self.episode_characters.neighbours(episode))
+        counts.pop(source, None)
+        top = heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.characters.ids[index], count) for index, count in top]
+
+    def shared_episodes(self, character_id: int, other_id: int) -> List[Tuple[int, str]]:
+        """Episodes both characters appear in, as ``(id, name)`` in episode order."""
+        first = self.character_episodes.neighbours(self._character(character_id))
+        second = self.character_episodes.neighbours(self._character(other_id))
+        shared = sorted(set(first).intersection(second))
+        return [(self.episodes.ids[index], self.episodes.names[index]) for index in shared]
+
+    def shortest_path(self, character_id: int, other_id: int, via_locations: bool = False) -> Optional[List[Tuple[str, int, str]]]:
+        """
+        Fewest-hop connection between two characters as ``(kind, id, name)`` nodes.
+
+        Characters are joined through shared episodes, and also through shared
+        origins or current locations when `via_locations` is set. Searches from both
+        ends at once and returns None when the characters are not connected.
+        """
+        source, target = self._character(character_id), self._character(other_id)
+        if source == target:
+            return [(CHARACTER, character_id, self.characters.names[source])]
+
+        hubs: List[Tuple[str, Adjacency, Adjacency, NodeTable]] = [
+            (EPISODE, self.character_episodes, self.episode_characters, self.episodes)
+        ]
+        if via_locations:
+            hubs.append((LOCATION, self.character_locations, self.location_characters, self.locations))
+
+        # parent[character] = (previous character, hub kind, hub index); one map per direction
+        parents = ({source: None}, {target: None})
+        expanded_hubs = (set(), set())
+        frontiers = ([source], [target])
+
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = parents[side], parents[1 - side]
+            next_frontier = []
+            for character in frontiers[side]:
+                for kind, outgoing, incoming, _ in hubs:
+                    for hub in outgoing.neighbours(character):
+                        if (kind, hub) in expanded_hubs[side]:
+                            continue
+                        expanded_hubs[side].add((kind, hub))
+                        for neighbour in incoming.neighbours(hub):
+                            if neighbour in own:
+                                continue
+                            own[neighbour] = (character, kind, hub)
+                            if neighbour in other:
+                                return self._join(parents, neighbour, hubs)
+                            next_frontier.append(neighbour)
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        return None
+
+    def _join(self, parents, meeting: int, hubs) -> List[Tuple[str, int, str]]:
+        """Stitches the two half-paths that met at `meeting` into one source-to-target path."""
+        tables = {kind: table for kind, _, _, table in hubs}
+
+        def walk(parent_map) -> List[Tuple[str, int, str]]:
+            nodes = []
+            character = meeting
+            while parent_map[character] is not None:
+                previous, kind, hub = parent_map[character]
+                nodes.append((kind, tables[kind].ids[hub], tables[kind].names[hub]))
+                nodes.append((CHARACTER, self.characters.ids[previous], self.characters.names[previous]))
+                character = previous
+            return nodes
+
+        middle = [(CHARACTER, self.characters.ids[meeting], self.characters.names[meeting])]
+        return list(reversed(walk(parents[0]))) + middle + walk(parents[1])
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class GraphNode(BaseModel):
+    """A character, episode or location on a relationship path."""
+    type: Literal["character", "episode", "location"]
+    id: int
+    name: str
+
+
+class CoAppearance(BaseModel):
+    """A character sharing episodes with the queried one."""
+    character: GraphNode
+    shared_episodes: int
+
+
+class CoAppearancesResponse(BaseModel):
+    """Characters appearing alongside a character, most shared episodes first."""
+    character: GraphNode
+    co_appearances: List[CoAppearance]
+
+
+class SharedEpisodesResponse(BaseModel):
+    """Episodes two characters both appear in."""
+    characters: List[GraphNode]
+    count: int
+    episodes: List[GraphNode]
+
+
+class ConnectionPathResponse(BaseModel):
+    """Shortest connection between two characters."""
+    source: GraphNode
+    target: GraphNode
+    connected: bool
+    degrees: Optional[int] = None
+    path: List[GraphNode] = []
+
+
+class GraphStatsResponse(BaseModel):
+    """Size and freshness of the relationship graph."""
+    source: Literal["mirror", "upstream"]
+    built_at: datetime
+    build_seconds: float
+    characters: int
+    episodes: int
+    locations: int
+    appearances: int
+    location_links: int
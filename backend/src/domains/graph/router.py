@@ -0,0 +1,64 @@
+import logging
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from src.core.exceptions import EntityNotFoundException
+from src.core.serialization import json_response
+from src.domains.graph import models as graph_models
+from src.domains.graph.service import graph_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/graph", tags=["Graph"])
+
+
+@router.get("/characters/{character_id}/co-appearances", response_model=graph_models.CoAppearancesResponse)
+async def get_co_appearances(
+    character_id: int,
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of characters to return"),
+) -> Response:
+    """Returns the characters who appear in the most episodes with a character."""
+    try:
+        return json_response(await graph_service.get_co_appearances(character_id, limit))
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching co-appearances for character {character_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch co-appearances")
+
+
+@router.get("/characters/{character_id}/shared-episodes/{other_id}", response_model=graph_models.SharedEpisodesResponse)
+async def get_shared_episodes(character_id: int, other_id: int) -> Response:
+    """Returns the episodes two characters both appear in."""
+    try:
+        return json_response(await graph_service.get_shared_episodes(character_id, other_id))
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching shared episodes for characters {character_id} and {other_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch shared episodes")
+
+
+@router.get("/path", response_model=graph_models.ConnectionPathResponse)
+async def get_connection_path(
+    source: int = Query(..., alias="from", description="Character ID to start from"),
+    target: int = Query(..., alias="to", description="Character ID to reach"),
+    via_locations: bool = Query(False, description="Also connect characters through shared origins and locations"),
+) -> Response:
+    """Returns the shortest connection between two characters."""
+    try:
+        return json_response(await graph_service.get_connection_path(source, target, via_locations))
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error finding a path from character {source} to {target}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to find a connection path")
+
+
+@router.get("/stats", response_model=graph_models.GraphStatsResponse)
+async def get_graph_stats() -> Response:
+    """Returns the size of the relationship graph and when it was built."""
+    try:
+        return json_response(await graph_service.get_stats())
+    except Exception as e:
+        logger.error(f"Error fetching graph stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch graph stats")
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from src.domains.dataset.service import DatasetSnapshot, dataset_service
+from src.domains.graph import models as graph_models
+from src.domains.graph.index import CHARACTER, EPISODE, RelationshipGraph
+
+logger = logging.getLogger(__name__)
+
+
+class GraphService:
+    """Indexes relationships from the dataset snapshot and answers traversal queries."""
+
+    def __init__(self):
+        self.dataset_service = dataset_service
+        self._graph: RelationshipGraph | None = None
+        self._snapshot: DatasetSnapshot | None = None
+        self._lock = asyncio.Lock()
+
+    async def get_graph(self) -> RelationshipGraph:
+        """Returns the graph for the current snapshot, rebuilding it when the snapshot changes."""
+        snapshot = await self.dataset_service.get_snapshot()
+        if snapshot is self._snapshot:
+            return self._graph
+        async with self._lock:
+            if snapshot is not self._snapshot:
+                started = time.perf_counter()
+                self._graph = await asyncio.to_thread(self._build, snapshot)
+                self._snapshot = snapshot
+                logger.info(f"Built relationship graph in {time.perf_counter() - started:.3f}s: {self._graph.stats()}")
+        return self._graph
+
+    def _build(self, snapshot: DatasetSnapshot) -> RelationshipGraph:
+        return RelationshipGraph(
+            ((row["id"], row["name"], row["origin_id"], row["location_id"]) for row in snapshot.characters),
+            ((row["id"], episode_id) for row in snapshot.characters for episode_id in row["episode_ids"]),
+            ((row["id"], row["name"]) for row in snapshot.episodes),
+            ((row["id"], row["name"]) for row in snapshot.locations),
+        )
+
+    def _node(self, graph: RelationshipGraph, character_id: int) -> graph_models.GraphNode:
+        return graph_models.GraphNode(type=CHARACTER, id=character_id, name=graph.character_name(character_id))
+
+    async def get_co_appearances(self, character_id: int, limit: int = 20) -> graph_models.CoAppearancesResponse:
+        """Characters who share episodes with a character, most shared first."""
+        graph = await self.get_graph()
+        return graph_models.CoAppearancesResponse(
+            character=self._node(graph, character_id),
+            co_appearances=[
+                graph_models.CoAppearance(character=self._node(graph, other_id), shared_episodes=count)
+                for other_id, count in graph.co_appearances(character_id, limit)
+            ],
+        )
+
+    async def get_shared_episodes(self, character_id: int, other_id: int) -> graph_models.SharedEpisodesResponse:
+        """Episodes two characters both appear in."""
+        graph = await self.get_graph()
+        episodes = graph.shared_episodes(character_id, other_id)
+        return graph_models.SharedEpisodesResponse(
+            characters=[self._node(graph, character_id), self._node(graph, other_id)],
+            count=len(episodes),
+            episodes=[graph_models.GraphNode(type=EPISODE, id=episode_id, name=name) for episode_id, name in episodes],
+        )
+
+    async def get_connection_path(self, character_id: int, other_id: int, via_locations: bool = False) -> graph_models.ConnectionPathResponse:
+        """Shortest chain of shared episodes (and optionally locations) linking two characters."""
+        graph = await self.get_graph()
+        path: Optional[List[Tuple[str, int, str]]] = graph.shortest_path(character_id, other_id, via_locations)
+        nodes = [graph_models.GraphNode(type=kind, id=node_id, name=name) for kind, node_id, name in path or []]
+        return graph_models.ConnectionPathResponse(
+            source=self._node(graph, character_id),
+            target=self._node(graph, other_id),
+            connected=path is not None,
+            # Hops between characters; each one passes through a shared episode or location
+            degrees=(len(nodes) - 1) // 2 if path is not None else None,
+            path=nodes,
+        )
+
+    async def get_stats(self) -> graph_models.GraphStatsResponse:
+        """Node/edge counts and when the underlying snapshot was loaded."""
+        graph = await self.get_graph()
+        snapshot = self._snapshot
+        return graph_models.GraphStatsResponse(
+            source=snapshot.source,
+            built_at=snapshot.built_at,
+            build_seconds=snapshot.build_seconds,
+            **graph.stats(),
+        )
+
+# Singleton instance
+graph_service = GraphService()
@@ -34,6 +34,25 @@ class LocationDetailed(BaseModel):
     residents: List[Character] = []
 
 
+class ResidentReference(BaseModel):
+    """Resident fields shown in prompt context."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    name: str
+    status: str
+    species: str
+
+
+class LocationContextSource(BaseModel):
+    """Location fields read when building prompt context."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    name: str
+    type: str
+    dimension: str
+    residents: List[ResidentReference] = []
+
+
 class PaginationInfo(BaseModel):
     """Pagination metadata."""
     model_config = ConfigDict(from_attributes=True)
@@ -44,6 +63,15 @@ class PaginationInfo(BaseModel):
     prev: Optional[int] = None
 
 
+class CursorInfo(BaseModel):
+    """Cursor pagination metadata."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    count: int
+    limit: int
+    next_cursor: Optional[str] = None
+
+
 class LocationsPage(BaseModel):
     """Paginated locations response."""
     model_config = ConfigDict(from_attributes=True)
@@ -57,4 +85,20 @@ class LocationsWithResidentsPage(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     info: PaginationInfo
-    results: List[LocationDetailed]
\ No newline at end of file
+    results: List[LocationDetailed]
+
+
+class LocationsCursorPage(BaseModel):
+    """Cursor-paginated locations response."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    info: CursorInfo
+    results: List[Location]
+
+
+class LocationsWithResidentsCursorPage(BaseModel):
+    """Cursor-paginated locations response (with residents)."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    info: CursorInfo
+    results: List[LocationDetailed]
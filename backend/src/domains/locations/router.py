@@ -1,42 +1,132 @@
 import logging
 from typing import Union
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
+from src.core.http_cache import (
+    ENTITY_CACHE_CONTROL,
+    LISTING_CACHE_CONTROL,
+    cached_json_response,
+    etag_matches,
+    not_modified,
+    request_etag,
+    validator_headers,
+    version_not_modified,
+)
+from src.core.serialization import json_response
+from src.domains.dataset.cursor import MAX_LIMIT
+from src.domains.dataset.service import dataset_service
 from src.domains.locations import models as locations_models
 from src.domains.locations.service import locations_service
+from src.domains.mirror.service import mirror_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/locations", tags=["Locations"])
 
-@router.get("", response_model=Union[locations_models.LocationsPage, locations_models.LocationsWithResidentsPage])
+@router.get(
+    "",
+    response_model=Union[
+        locations_models.LocationsPage,
+        locations_models.LocationsWithResidentsPage,
+        locations_models.LocationsCursorPage,
+        locations_models.LocationsWithResidentsCursorPage,
+    ],
+)
 async def get_locations(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
-    include_residents: bool = Query(False, description="Include residents in the response")
+    include_residents: bool = Query(False, description="Include residents in the response"),
+    type_: str | None = Query(None, alias="type", description="Filter by type (e.g. Planet, Space station)"),
+    dimension: str | None = Query(None, description="Filter by dimension (e.g. Dimension C-137)"),
+    name: str | None = Query(None, min_length=1, description="Search by name"),
+    name_match: str = Query("substring", description="Name search mode: prefix or substring"),
+    sort: str | None = Query(None, description="Sort by id, name, type or dimension; prefix with '-' for descending"),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous response's info.next_cursor"),
+    limit: int | None = Query(None, ge=1, le=MAX_LIMIT, description="Page size for cursor pagination"),
+    stream: bool = Query(False, description="Stream every matching location as NDJSON, one per line, instead of a page"),
+    lazy_residents: bool = Query(False, description="In stream mode, send resident IDs only (hydrate via POST /characters/batch)"),
 ):
-    """Returns paginated locations, optionally with residents."""
-    logger.info(f"Fetching locations page {page}, include_residents={include_residents}")
+    """Returns paginated locations, optionally with residents, filtered, searched and sorted."""
+    if stream or lazy_residents:
+        return await stream_locations(
+            type_, dimension, name, name_match, sort, include_residents, lazy_residents,
+            paginated=page > 1 or cursor is not None or limit is not None, stream=stream,
+        )
+    searching = any(value is not None for value in (type_, dimension, name, sort, cursor, limit))
+    logger.info(f"Fetching locations page {page}, include_residents={include_residents}" + (f" (type={type_}, dimension={dimension}, name={name!r}, sort={sort})" if searching else ""))
     try:
-        if include_residents:
-            result = locations_service.get_locations_with_residents_page(page)
-            logger.info(f"Successfully fetched page {page}: {len(result.results)} locations with residents")
+        if searching:
+            etag = request_etag(request, await dataset_service.get_version())
+            if etag_matches(request, etag):
+                return not_modified(etag, LISTING_CACHE_CONTROL)
+            result = await locations_service.search_locations(
+                type_=type_, dimension=dimension, name=name, name_match=name_match,
+                sort=sort or "id", page=page, include_residents=include_residents, cursor=cursor, limit=limit,
+            )
+            logger.info(f"Successfully fetched page {page}: {len(result.results)} matching locations")
         else:
-            result = locations_service.get_locations_page(page)
-            logger.info(f"Successfully fetched page {page}: {len(result.results)} locations")
-        return result
+            version = await mirror_service.aget_version()
+            unchanged = version_not_modified(request, version, LISTING_CACHE_CONTROL)
+            if unchanged is not None:
+                return unchanged
+            if include_residents:
+                result = await locations_service.get_locations_with_residents_page(page)
+                logger.info(f"Successfully fetched page {page}: {len(result.results)} locations with residents")
+            else:
+                result = await locations_service.get_locations_page(page)
+                logger.info(f"Successfully fetched page {page}: {len(result.results)} locations")
+        if searching:
+            return json_response(result, headers=validator_headers(etag, LISTING_CACHE_CONTROL))
+        return cached_json_response(request, result, LISTING_CACHE_CONTROL, version=version)
     except ValueError as e:
-        logger.warning(f"Invalid page number: {page} {str(e)}")
+        logger.warning(f"Invalid locations query: page={page} {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching locations: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch locations")
 
 
+async def stream_locations(
+    type_: str | None,
+    dimension: str | None,
+    name: str | None,
+    name_match: str,
+    sort: str | None,
+    include_residents: bool,
+    lazy_residents: bool,
+    paginated: bool,
+    stream: bool,
+) -> StreamingResponse:
+    """Streams matching locations as NDJSON; errors surface before the first line is sent."""
+    logger.info(f"Streaming locations, include_residents={include_residents}, lazy_residents={lazy_residents} (type={type_}, dimension={dimension}, name={name!r}, sort={sort})")
+    try:
+        if not stream:
+            raise ValueError("lazy_residents requires stream=true")
+        if paginated:
+            raise ValueError("Stream mode returns every match; page, cursor and limit do not apply")
+        lines = await locations_service.stream_locations(
+            type_=type_, dimension=dimension, name=name, name_match=name_match, sort=sort or "id",
+            include_residents=include_residents or lazy_residents, lazy_residents=lazy_residents,
+        )
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    except ValueError as e:
+        logger.warning(f"Invalid locations stream query: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error streaming locations: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch locations")
+
+
 @router.get("/{location_id}", response_model=locations_models.LocationDetailed)
-async def get_location(location_id: int) -> locations_models.LocationDetailed:
+async def get_location(request: Request, location_id: int) -> Response:
     """Returns a single location by ID"""
     try:
-        return locations_service.get_location_by_id(location_id)
+        version = await mirror_service.aget_version()
+        unchanged = version_not_modified(request, version, ENTITY_CACHE_CONTROL)
+        if unchanged is not None:
+            return unchanged
+        return cached_json_response(request, await locations_service.get_location_by_id(location_id), ENTITY_CACHE_CONTROL, version=version)
     except Exception as e:
         logger.error(f"Error fetching location {location_id}: {e}")
         raise HTTPException(status_code=404, detail="Location not found")
@@ -1,55 +1,245 @@
 import logging
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
+from pydantic_core import to_json
+
+from src.core.blocking import sync_shim
+from src.core.serialization import trusted_models
 from src.core.utils import build_location_context, clean_prompt
-from src.domains.locations.models import LocationsPage, LocationDetailed, LocationsWithResidentsPage
+from src.domains.dataset.cursor import query_key, window_of
+from src.domains.dataset.index import NAME_MATCH_MODES
+from src.domains.dataset.service import PAGE_SIZE, dataset_service, page_of
+from src.domains.locations.models import (
+    LocationsPage,
+    LocationsCursorPage,
+    LocationDetailed,
+    LocationsWithResidentsPage,
+    LocationsWithResidentsCursorPage,
+    LocationContextSource,
+)
+from src.domains.mirror.service import mirror_service
+from src.integrations.rick_and_morty.queries.builder import select_fields
 from src.integrations.rick_and_morty.service import rick_and_morty_service
 
 logger = logging.getLogger(__name__)
 
+# Fields read by build_location_context; context lookups fetch only these
+CONTEXT_SELECTION = select_fields(
+    "name",
+    "type",
+    "dimension",
+    residents=select_fields("name", "status", "species"),
+)
+
+# Resident fields sent per location, matching the Character model
+RESIDENT_FIELDS = ("id", "name", "status", "species", "image")
+
+# Residents encoded per streamed chunk, bounding the buffer behind any one location
+STREAM_RESIDENTS_CHUNK = 256
+
 
 class LocationsService:
     """Service for location operations."""
     
     def __init__(self):
         self.rick_and_morty_service = rick_and_morty_service
+        self.mirror_service = mirror_service
+        self.dataset_service = dataset_service
     
-    def get_locations_page(self, page: int = 1) -> LocationsPage:
+    async def get_locations_page(self, page: int = 1) -> LocationsPage:
         """Returns paginated locations"""
         if page < 1:
             raise ValueError("Page must be >= 1")
         
         logger.debug(f"Fetching locations page {page}")
-        raw_data = self.rick_and_morty_service.fetch_locations_page(page)
-        locations_page = LocationsPage(**raw_data)
+        raw_data = await self.mirror_service.aget_locations_page(page)
+        if raw_data:
+            locations_page = LocationsPage(**raw_data)
+        else:
+            locations_page = trusted_models.validate(LocationsPage, await self.rick_and_morty_service.afetch_locations_page(page))
         logger.debug(f"Parsed {len(locations_page.results)} locations from page {page}")
         return locations_page
 
-    def get_location_by_id(self, location_id: int) -> LocationDetailed:
+    async def search_locations(
+        self,
+        type_: str | None = None,
+        dimension: str | None = None,
+        name: str | None = None,
+        name_match: str = "substring",
+        sort: str = "id",
+        page: int = 1,
+        include_residents: bool = False,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> LocationsPage | LocationsWithResidentsPage | LocationsCursorPage | LocationsWithResidentsCursorPage:
+        """
+        Filters, searches and sorts every location in process.
+
+        Returns one numbered page of the matches, or `limit` matches after `cursor`
+        when either is given.
+        """
+        if page < 1:
+            raise ValueError("Page must be >= 1")
+        if page > 1 and (cursor is not None or limit is not None):
+            raise ValueError("Use either page or cursor/limit, not both")
+
+        indexes = await self.dataset_service.get_indexes()
+        filters = {field: value for field, value in (("type", type_), ("dimension", dimension)) if value is not None}
+        rows = indexes.locations.query(filters=filters, name=name, name_match=name_match, sort=sort)
+        logger.debug(f"Matched {len(rows)} locations for filters {filters}, name={name!r}, sort={sort}")
+        if cursor is None and limit is None:
+            data = page_of(rows, page)
+            page_model, residents_page_model = LocationsPage, LocationsWithResidentsPage
+        else:
+            key = query_key("locations", name=name, name_match=name_match if name else None, sort=sort, **filters)
+            data = window_of(rows, key, cursor, limit or PAGE_SIZE)
+            page_model, residents_page_model = LocationsCursorPage, LocationsWithResidentsCursorPage
+        if not include_residents:
+            return page_model.model_validate(data)
+        data["results"] = [{**row, "residents": indexes.residents.get(row["id"], [])} for row in data["results"]]
+        return residents_page_model.model_validate(data)
+
+    async def stream_locations(
+        self,
+        type_: str | None = None,
+        dimension: str | None = None,
+        name: str | None = None,
+        name_match: str = "substring",
+        sort: str = "id",
+        include_residents: bool = False,
+        lazy_residents: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Returns every matching location as NDJSON, one location per line.
+
+        Reads the dataset indexes when they are already warm. Otherwise ID-ordered
+        streams page through the mirror (or upstream) and send each page as it
+        arrives; other sorts need every row first and wait for the snapshot. The
+        query and the first page run before this returns, so bad parameters raise
+        ValueError rather than breaking the stream. Resident lists are encoded in
+        chunks, or sent as ``resident_ids`` when `lazy_residents` is set.
+        """
+        filters = {field: value for field, value in (("type", type_), ("dimension", dimension)) if value is not None}
+        indexes = await self.dataset_service.get_warm_indexes()
+        if indexes is None and sort == "id":
+            if name and name_match not in NAME_MATCH_MODES:
+                raise ValueError(f"Name match must be one of: {', '.join(NAME_MATCH_MODES)}")
+            logger.debug(f"Streaming locations page by page for filters {filters}, name={name!r}")
+            rows = await self._paged_rows(filters, name, name_match, include_residents)
+            return self._encode_lines(rows, include_residents, lazy_residents)
+
+        indexes = indexes or await self.dataset_service.get_indexes()
+        rows = indexes.locations.query(filters=filters, name=name, name_match=name_match, sort=sort)
+        logger.debug(f"Streaming {len(rows)} locations for filters {filters}, name={name!r}, sort={sort}")
+
+        async def indexed_rows() -> AsyncIterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+            for row in rows:
+                yield row, indexes.residents.get(row["id"], []) if include_residents else []
+
+        return self._encode_lines(indexed_rows(), include_residents, lazy_residents)
+
+    async def _paged_rows(
+        self, filters: Dict[str, str], name: str | None, name_match: str, include_residents: bool
+    ) -> AsyncIterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Fetches the first location page, then walks the rest in ID order, filtering each as it arrives."""
+        fetch_page = self.get_locations_with_residents_page if include_residents else self.get_locations_page
+        first_page = (await fetch_page(1)).model_dump()
+        wanted = {field: value.casefold() for field, value in filters.items()}
+        needle = name.casefold() if name else None
+
+        def matches(row: Dict[str, Any]) -> bool:
+            if any((row.get(field) or "").casefold() != value for field, value in wanted.items()):
+                return False
+            if needle is None:
+                return True
+            row_name = row["name"].casefold()
+            return row_name.startswith(needle) if name_match == "prefix" else needle in row_name
+
+        async def rows() -> AsyncIterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+            data = first_page
+            while True:
+                for row in data["results"]:
+                    if matches(row):
+                        yield row, row.pop("residents", [])
+                if data["info"]["next"] is None:
+                    return
+                data = (await fetch_page(data["info"]["next"])).model_dump()
+
+        return rows()
+
+    async def _encode_lines(
+        self,
+        rows: AsyncIterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]],
+        include_residents: bool,
+        lazy_residents: bool,
+    ) -> AsyncIterator[bytes]:
+        """Encodes ``(location, residents)`` pairs as NDJSON lines."""
+        async for row, residents in rows:
+            head = to_json({key: row[key] for key in ("id", "name", "type", "dimension")})
+            if not include_residents:
+                yield head + b"\n"
+                continue
+            if lazy_residents:
+                yield head[:-1] + b',"resident_ids":' + to_json([resident["id"] for resident in residents]) + b"}\n"
+                continue
+            yield head[:-1] + b',"residents":['
+            for start in range(0, len(residents), STREAM_RESIDENTS_CHUNK):
+                chunk = residents[start:start + STREAM_RESIDENTS_CHUNK]
+                payload = to_json([{key: resident[key] for key in RESIDENT_FIELDS} for resident in chunk])[1:-1]
+                yield (b"," if start else b"") + payload
+            yield b"]}\n"
+
+    async def get_location_by_id(self, location_id: int) -> LocationDetailed:
         """Get a single location by ID with residents."""
         logger.debug(f"Fetching location {location_id}")
-        raw_data = self.rick_and_morty_service.fetch_location_by_id(location_id)
-        location = LocationDetailed(**raw_data)
+        raw_data = await self.mirror_service.aget_location_by_id(location_id)
+        if raw_data:
+            location = LocationDetailed(**raw_data)
+        else:
+            location = trusted_models.validate(LocationDetailed, await self.rick_and_morty_service.afetch_location_by_id(location_id))
         logger.debug(f"Fetched location: {location.name} with {len(location.residents)} residents")
         return location
 
 
-    def get_locations_with_residents_page(self, page: int = 1) -> LocationsWithResidentsPage:
+    async def get_locations_with_residents_page(self, page: int = 1) -> LocationsWithResidentsPage:
         """Returns paginated locations with residents."""
         if page < 1:
             raise ValueError("Page must be >= 1")
 
         logger.debug(f"Fetching locations with residents page {page}")
-        raw_data = self.rick_and_morty_service.fetch_locations_with_residents_page(page)
-        locations_page = LocationsWithResidentsPage(**raw_data)
+        raw_data = await self.mirror_service.aget_locations_with_residents_page(page)
+        if raw_data:
+            locations_page = LocationsWithResidentsPage(**raw_data)
+        else:
+            locations_page = trusted_models.validate(LocationsWithResidentsPage, await self.rick_and_morty_service.afetch_locations_with_residents_page(page))
         logger.debug(f"Parsed {len(locations_page.results)} locations with residents from page {page}")
         return locations_page
 
 
-    def get_location_context(self, location_id: int, include_all_residents_info: bool) -> str:
+    async def get_locations_by_ids(self, location_ids: list[int]) -> list[LocationDetailed]:
+        """Get several locations by ID with residents, in the order requested; unknown IDs are skipped."""
+        logger.debug(f"Fetching {len(location_ids)} locations by ID")
+        mirrored = await self.mirror_service.aget_locations_by_ids(location_ids) or {}
+        found = {entity_id: LocationDetailed(**raw_data) for entity_id, raw_data in mirrored.items()}
+        missing = [location_id for location_id in location_ids if location_id not in found]
+        if missing:
+            for raw_data in await self.rick_and_morty_service.afetch_locations_by_ids(missing):
+                found[int(raw_data["id"])] = trusted_models.validate(LocationDetailed, raw_data)
+        return [found[location_id] for location_id in dict.fromkeys(location_ids) if location_id in found]
+
+    async def get_location_context(self, location_id: int, include_all_residents_info: bool) -> str:
         """Get a structured context string for a location by ID."""
-        location = self.get_location_by_id(location_id)
+        raw_data = await self.mirror_service.aget_location_by_id(location_id)
+        if raw_data:
+            location = LocationContextSource(**raw_data)
+        else:
+            raw_data = await self.rick_and_morty_service.afetch_location_by_id(location_id, selection=CONTEXT_SELECTION)
+            location = trusted_models.validate(LocationContextSource, raw_data)
         context = build_location_context(location, include_all_residents_info)
         return clean_prompt(context)
 
 # Singleton instance
-locations_service = LocationsService()
\ No newline at end of file
+locations_service = LocationsService()
+
+# Blocking facade for scripts and other callers without an event loop
+locations_service_sync = sync_shim(locations_service)
\ No newline at end of file
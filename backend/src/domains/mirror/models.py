@@ -0,0 +1,99 @@
+from datetime import datetime
+from typing import Optional, Literal
+
+from sqlalchemy import BigInteger, Column, Integer, Text, DateTime, func
+from pydantic import BaseModel, ConfigDict
+
+from src.core.database.connection import Base
+
+
+class MirroredCharacter(Base):
+    """SQLAlchemy model for mirrored Rick & Morty characters."""
+    __tablename__ = "rm_characters"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(Text, nullable=False)
+    status = Column(Text, nullable=False, default="")
+    species = Column(Text, nullable=False, default="")
+    type = Column(Text, nullable=False, default="")
+    gender = Column(Text, nullable=False, default="")
+    image = Column(Text, nullable=False, default="")
+    created = Column(Text, nullable=False, default="")
+    origin_id = Column(Integer, nullable=True, index=True)
+    origin_name = Column(Text, nullable=False, default="")
+    location_id = Column(Integer, nullable=True, index=True)
+    location_name = Column(Text, nullable=False, default="")
+    content_hash = Column(Text, nullable=False)
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class MirroredLocation(Base):
+    """SQLAlchemy model for mirrored Rick & Morty locations."""
+    __tablename__ = "rm_locations"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(Text, nullable=False)
+    type = Column(Text, nullable=False, default="")
+    dimension = Column(Text, nullable=False, default="")
+    created = Column(Text, nullable=False, default="")
+    content_hash = Column(Text, nullable=False)
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class MirroredEpisode(Base):
+    """SQLAlchemy model for mirrored Rick & Morty episodes."""
+    __tablename__ = "rm_episodes"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(Text, nullable=False)
+    air_date = Column(Text, nullable=False, default="")
+    episode = Column(Text, nullable=False, default="")
+    created = Column(Text, nullable=False, default="")
+    content_hash = Column(Text, nullable=False)
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class MirroredCharacterEpisode(Base):
+    """SQLAlchemy model for character <-> episode appearances."""
+    __tablename__ = "rm_character_episodes"
+
+    character_id = Column(Integer, primary_key=True)
+    episode_id = Column(Integer, primary_key=True, index=True)
+
+
+class MirrorSyncState(Base):
+    """SQLAlchemy model tracking mirror sync progress per entity type."""
+    __tablename__ = "rm_sync_state"
+
+    entity_type = Column(Text, primary_key=True)
+    upstream_count = Column(Integer, nullable=False, default=0)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    last_full_sync_at = Column(DateTime(timezone=True), nullable=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+
+
+class EntitySyncStatus(BaseModel):
+    """Sync status for one mirrored entity type."""
+    model_config = ConfigDict(from_attributes=True)
+
+    entity_type: Literal["character", "location", "episode"]
+    upstream_count: int
+    last_synced_at: Optional[datetime] = None
+    last_full_sync_at: Optional[datetime] = None
+
+
+class MirrorStatusResponse(BaseModel):
+    """Response model for the mirror status."""
+    enabled: bool
+    ready: bool
+    syncing: bool
+    entities: list[EntitySyncStatus]
+
+
+class SyncReport(BaseModel):
+    """Summary of a single sync run."""
+    full: bool
+    pages_fetched: int = 0
+    upserted: dict[str, int] = {}
+    deleted: dict[str, int] = {}
+    duration_seconds: float = 0.0
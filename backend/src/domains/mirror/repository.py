@@ -0,0 +1,167 @@
+from datetime import datetime, timezone
+from typing import Any, Type
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.domains.mirror.models import (
+    MirroredCharacter,
+    MirroredCharacterEpisode,
+    MirroredEpisode,
+    MirroredLocation,
+    MirrorSyncState,
+)
+
+
+class MirrorRepository:
+    """Repository for the mirrored Rick & Morty tables."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Reads
+
+    def count(self, model: Type) -> int:
+        """Count mirrored rows of a model."""
+        return self.db.execute(select(func.count()).select_from(model)).scalar() or 0
+
+    def get_page(self, model: Type, offset: int, limit: int) -> list:
+        """Get rows of a model ordered by ID."""
+        stmt = select(model).order_by(model.id).offset(offset).limit(limit)
+        return list(self.db.execute(stmt).scalars())
+
+    def get_by_id(self, model: Type, id: int):
+        """Get a single mirrored row by ID."""
+        return self.db.get(model, id)
+
+    def get_by_ids(self, model: Type, ids: list[int]) -> dict[int, Any]:
+        """Get mirrored rows of a model keyed by ID."""
+        if not ids:
+            return {}
+        stmt = select(model).where(model.id.in_(ids))
+        return {row.id: row for row in self.db.execute(stmt).scalars()}
+
+    def get_locations_by_ids(self, ids: list[int]) -> dict[int, MirroredLocation]:
+        """Get locations keyed by ID."""
+        if not ids:
+            return {}
+        stmt = select(MirroredLocation).where(MirroredLocation.id.in_(ids))
+        return {row.id: row for row in self.db.execute(stmt).scalars()}
+
+    def get_residents(self, location_ids: list[int]) -> list[MirroredCharacter]:
+        """Get characters whose current location is one of the given locations."""
+        if not location_ids:
+            return []
+        stmt = (
+            select(MirroredCharacter)
+            .where(MirroredCharacter.location_id.in_(location_ids))
+            .order_by(MirroredCharacter.id)
+        )
+        return list(self.db.execute(stmt).scalars())
+
+    def get_episodes_for_characters(self, character_ids: list[int]) -> dict[int, list[MirroredEpisode]]:
+        """Get the episodes of several characters keyed by character ID."""
+        episodes: dict[int, list[MirroredEpisode]] = {character_id: [] for character_id in character_ids}
+        if not character_ids:
+            return episodes
+        stmt = (
+            select(MirroredCharacterEpisode.character_id, MirroredEpisode)
+            .join(MirroredEpisode, MirroredCharacterEpisode.episode_id == MirroredEpisode.id)
+            .where(MirroredCharacterEpisode.character_id.in_(character_ids))
+            .order_by(MirroredEpisode.id)
+        )
+        for character_id, episode in self.db.execute(stmt).all():
+            episodes[character_id].append(episode)
+        return episodes
+
+    def get_characters_for_episodes(self, episode_ids: list[int]) -> dict[int, list[MirroredCharacter]]:
+        """Get the characters of several episodes keyed by episode ID."""
+        characters: dict[int, list[MirroredCharacter]] = {episode_id: [] for episode_id in episode_ids}
+        if not episode_ids:
+            return characters
+        stmt = (
+            select(MirroredCharacterEpisode.episode_id, MirroredCharacter)
+            .join(MirroredCharacter, MirroredCharacterEpisode.character_id == MirroredCharacter.id)
+            .where(MirroredCharacterEpisode.episode_id.in_(episode_ids))
+            .order_by(MirroredCharacter.id)
+        )
+        for episode_id, character in self.db.execute(stmt).all():
+            characters[episode_id].append(character)
+        return characters
+
+    def get_all(self, model: Type) -> list:
+        """Get every row of a model ordered by ID."""
+        return list(self.db.execute(select(model).order_by(model.id)).scalars())
+
+    def get_appearances(self) -> list[tuple[int, int]]:
+        """Get every ``(character_id, episode_id)`` appearance."""
+        stmt = select(MirroredCharacterEpisode.character_id, MirroredCharacterEpisode.episode_id).order_by(
+            MirroredCharacterEpisode.character_id, MirroredCharacterEpisode.episode_id
+        )
+        return [tuple(row) for row in self.db.execute(stmt).all()]
+
+    def get_sync_states(self) -> list[MirrorSyncState]:
+        """Get sync state rows for all entity types."""
+        return list(self.db.execute(select(MirrorSyncState)).scalars())
+
+    def get_generation(self) -> int:
+        """Get the mirror generation: the sum of per-entity-type change counters."""
+        return self.db.execute(select(func.coalesce(func.sum(MirrorSyncState.generation), 0))).scalar() or 0
+
+    # Writes
+
+    def get_hashes(self, model: Type) -> dict[int, str]:
+        """Get content hashes of all mirrored rows keyed by ID."""
+        rows = self.db.execute(select(model.id, model.content_hash)).all()
+        return {row_id: content_hash for row_id, content_hash in rows}
+
+    def upsert(self, model: Type, rows: list[dict[str, Any]]) -> int:
+        """Insert or update rows by primary key."""
+        if not rows:
+            return 0
+        stmt = insert(model).values(rows)
+        update_columns = {
+            column: stmt.excluded[column] for column in rows[0].keys() if column != "id"
+        }
+        update_columns["synced_at"] = func.now()
+        self.db.execute(stmt.on_conflict_do_update(index_elements=["id"], set_=update_columns))
+        return len(rows)
+
+    def delete(self, model: Type, ids: list[int]) -> int:
+        """Delete rows by ID along with their episode links."""
+        if not ids:
+            return 0
+        if model is MirroredCharacter:
+            self.db.execute(delete(MirroredCharacterEpisode).where(MirroredCharacterEpisode.character_id.in_(ids)))
+        elif model is MirroredEpisode:
+            self.db.execute(delete(MirroredCharacterEpisode).where(MirroredCharacterEpisode.episode_id.in_(ids)))
+        self.db.execute(delete(model).where(model.id.in_(ids)))
+        return len(ids)
+
+    def replace_character_episodes(self, links: dict[int, list[int]]) -> None:
+        """Replace the episode links of the given characters."""
+        if not links:
+            return
+        self.db.execute(
+            delete(MirroredCharacterEpisode).where(MirroredCharacterEpisode.character_id.in_(list(links)))
+        )
+        pairs = [
+            {"character_id": character_id, "episode_id": episode_id}
+            for character_id, episode_ids in links.items()
+            for episode_id in episode_ids
+        ]
+        if pairs:
+            self.db.execute(insert(MirroredCharacterEpisode).values(pairs).on_conflict_do_nothing())
+
+    def set_sync_state(self, entity_type: str, upstream_count: int, full: bool, changed: bool) -> None:
+        """Record a completed sync for an entity type, bumping its generation if rows changed."""
+        now = datetime.now(timezone.utc)
+        values = {"entity_type": entity_type, "upstream_count": upstream_count, "last_synced_at": now}
+        if full:
+            values["last_full_sync_at"] = now
+        stmt = insert(MirrorSyncState).values({**values, "generation": int(changed)})
+        update_columns = {key: value for key, value in values.items() if key != "entity_type"}
+        if changed:
+            update_columns["generation"] = MirrorSyncState.generation + 1
+        self.db.execute(stmt.on_conflict_do_update(index_elements=["entity_type"], set_=update_columns))
@@ -0,0 +1,38 @@
+import logging
+from fastapi import APIRouter, HTTPException, Query
+
+from src.core.config import settings
+from src.domains.mirror import models as mirror_models
+from src.domains.mirror.service import mirror_service
+from src.domains.mirror.sync import mirror_sync_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/mirror", tags=["Mirror"])
+
+
+@router.get("/status", response_model=mirror_models.MirrorStatusResponse)
+async def get_mirror_status():
+    """Returns what has been mirrored locally and when."""
+    try:
+        return mirror_models.MirrorStatusResponse(
+            enabled=settings.MIRROR_ENABLED,
+            ready=await mirror_service.ais_ready(),
+            syncing=mirror_sync_service.syncing,
+            entities=await mirror_service.aget_sync_statuses(),
+        )
+    except Exception as e:
+        logger.error(f"Error fetching mirror status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch mirror status")
+
+
+@router.post("/sync", response_model=mirror_models.SyncReport)
+async def sync_mirror(full: bool = Query(False, description="Re-walk every page instead of a delta sync")):
+    """Runs a mirror sync immediately."""
+    if not settings.MIRROR_ENABLED:
+        raise HTTPException(status_code=400, detail="Mirror is disabled")
+    try:
+        return await mirror_sync_service.sync(full=full)
+    except Exception as e:
+        logger.error(f"Error syncing mirror: {e}")
+        raise HTTPException(status_code=500, detail="Mirror sync failed")
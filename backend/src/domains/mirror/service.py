@@ -0,0 +1,354 @@
+import asyncio
+import logging
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generator, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.database.connection import db_connection
+from src.domains.mirror.models import EntitySyncStatus, MirroredCharacter, MirroredEpisode, MirroredLocation
+from src.domains.mirror.repository import MirrorRepository
+
+logger = logging.getLogger(__name__)
+
+# Matches the upstream page size so page numbers stay stable when reads move to the mirror
+PAGE_SIZE = 20
+
+MIRRORED_ENTITY_TYPES = ("character", "location", "episode")
+
+
+class MirrorService:
+    """Serves Rick & Morty reads from the local mirror tables in the upstream response shape."""
+
+    READY_RECHECK_SECONDS = 30.0
+    GENERATION_RECHECK_SECONDS = 5.0
+
+    def __init__(self):
+        self._ready = False
+        self._last_ready_check = 0.0
+        # Last generation read from rm_sync_state; any worker's sync that changes rows bumps it there
+        self._generation = 0
+        self._last_generation_check = 0.0
+
+    @contextmanager
+    def session(self) -> Generator[Session, None, None]:
+        """Opens a short-lived session outside of a request dependency."""
+        db = db_connection.SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def is_ready(self) -> bool:
+        """Whether every entity type has been mirrored at least once."""
+        if not settings.MIRROR_ENABLED or db_connection.SessionLocal is None:
+            return False
+        if self._ready:
+            return True
+
+        now = time.monotonic()
+        if now - self._last_ready_check < self.READY_RECHECK_SECONDS:
+            return False
+        self._last_ready_check = now
+
+        try:
+            with self.session() as db:
+                states = MirrorRepository(db).get_sync_states()
+                synced = {state.entity_type for state in states if state.last_synced_at is not None}
+            self._ready = all(entity_type in synced for entity_type in MIRRORED_ENTITY_TYPES)
+        except Exception as e:
+            logger.warning(f"Mirror readiness check failed: {e}")
+        return self._ready
+
+    async def ais_ready(self) -> bool:
+        """Async variant of `is_ready`; only the periodic recheck runs in a worker thread."""
+        if not settings.MIRROR_ENABLED or db_connection.SessionLocal is None:
+            return False
+        if self._ready or time.monotonic() - self._last_ready_check < self.READY_RECHECK_SECONDS:
+            return self._ready
+        return await asyncio.to_thread(self.is_ready)
+
+    def mark_ready(self) -> None:
+        """Marks the mirror as populated after a successful sync and forces a generation re-read."""
+        self._ready = True
+        self._last_generation_check = 0.0
+
+    def _load_generation(self) -> int:
+        with self.session() as db:
+            return MirrorRepository(db).get_generation()
+
+    async def aget_generation(self) -> int:
+        """
+        Returns the mirror generation, re-read from the database at most every
+        `GENERATION_RECHECK_SECONDS` so derived indexes in every worker notice syncs.
+        """
+        if not settings.MIRROR_ENABLED or db_connection.SessionLocal is None:
+            return 0
+        now = time.monotonic()
+        if now - self._last_generation_check < self.GENERATION_RECHECK_SECONDS:
+            return self._generation
+        self._last_generation_check = now
+        try:
+            self._generation = await asyncio.to_thread(self._load_generation)
+        except Exception as e:
+            logger.warning(f"Mirror generation check failed: {e}")
+        return self._generation
+
+    async def aget_version(self) -> Optional[str]:
+        """Identifies the mirror contents for response validators, or None while reads go upstream."""
+        if not await self.ais_ready():
+            return None
+        return f"mirror:{await self.aget_generation()}"
+
+    def _read(self, description: str, reader: Callable[[MirrorRepository], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Runs a read against the mirror, returning None so callers can fall back to upstream."""
+        if not self.is_ready():
+            return None
+        try:
+            with self.session() as db:
+                result = reader(MirrorRepository(db))
+            if result is not None:
+                logger.debug(f"Served {description} from mirror")
+            return result
+        except Exception as e:
+            logger.warning(f"Mirror read failed for {description}, falling back to upstream: {e}")
+            return None
+
+    async def _aread(self, read: Callable[..., Optional[Any]], *args: Any) -> Optional[Any]:
+        """Runs a sync mirror read in a worker thread so database I/O stays off the event loop."""
+        if not settings.MIRROR_ENABLED or db_connection.SessionLocal is None:
+            return None
+        return await asyncio.to_thread(read, *args)
+
+    def _page_info(self, count: int, page: int) -> Dict[str, Any]:
+        """Builds upstream-style pagination info."""
+        pages = math.ceil(count / PAGE_SIZE)
+        return {
+            "count": count,
+            "pages": pages,
+            "next": page + 1 if page < pages else None,
+            "prev": page - 1 if page > 1 else None,
+        }
+
+    def _character_summary(self, row: MirroredCharacter) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "name": row.name,
+            "status": row.status,
+            "species": row.species,
+            "image": row.image,
+        }
+
+    def _location_summary(self, row: MirroredLocation) -> Dict[str, Any]:
+        return {"id": row.id, "name": row.name, "type": row.type, "dimension": row.dimension}
+
+    def _episode_summary(self, row: MirroredEpisode) -> Dict[str, Any]:
+        return {"id": row.id, "name": row.name, "air_date": row.air_date, "episode": row.episode}
+
+    def _place(self, location: Optional[MirroredLocation], fallback_name: str) -> Dict[str, Any]:
+        """Builds a character origin/location reference."""
+        if location is None:
+            return {"name": fallback_name or "unknown", "type": None, "dimension": None}
+        return {"name": location.name, "type": location.type, "dimension": location.dimension}
+
+    def _residents_by_location(self, repository: MirrorRepository, location_ids: list[int]) -> Dict[int, list]:
+        residents: Dict[int, list] = {location_id: [] for location_id in location_ids}
+        for resident in repository.get_residents(location_ids):
+            residents[resident.location_id].append(self._character_summary(resident))
+        return residents
+
+    def get_characters_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Returns a characters page shaped like `fetch_characters_page`."""
+        def reader(repository: MirrorRepository):
+            rows = repository.get_page(MirroredCharacter, (page - 1) * PAGE_SIZE, PAGE_SIZE)
+            info = self._page_info(repository.count(MirroredCharacter), page)
+            return {"info": info, "results": [self._character_summary(row) for row in rows]}
+        return self._read(f"characters page {page}", reader)
+
+    async def aget_characters_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Async variant of `get_characters_page`."""
+        return await self._aread(self.get_characters_page, page)
+
+    def _character_details(self, repository: MirrorRepository, ids: list[int]) -> Dict[int, Dict[str, Any]]:
+        """Builds detailed characters keyed by ID, loading relations in bulk."""
+        rows = repository.get_by_ids(MirroredCharacter, ids)
+        place_ids = {i for row in rows.values() for i in (row.origin_id, row.location_id) if i is not None}
+        places = repository.get_locations_by_ids(list(place_ids))
+        episodes = repository.get_episodes_for_characters(list(rows))
+        return {
+            row.id: {
+                **self._character_summary(row),
+                "type": row.type,
+                "gender": row.gender,
+                "origin": self._place(places.get(row.origin_id), row.origin_name),
+                "location": self._place(places.get(row.location_id), row.location_name),
+                "episode": [{"name": episode.name, "air_date": episode.air_date} for episode in episodes[row.id]],
+                "created": row.created,
+            }
+            for row in rows.values()
+        }
+
+    def get_character_by_id(self, character_id: int) -> Optional[Dict[str, Any]]:
+        """Returns a character shaped like `fetch_character_by_id`."""
+        def reader(repository: MirrorRepository):
+            return self._character_details(repository, [character_id]).get(character_id)
+        return self._read(f"character {character_id}", reader)
+
+    async def aget_character_by_id(self, character_id: int) -> Optional[Dict[str, Any]]:
+        """Async variant of `get_character_by_id`."""
+        return await self._aread(self.get_character_by_id, character_id)
+
+    def get_characters_by_ids(self, character_ids: list[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Returns mirrored characters keyed by ID; IDs not mirrored are left out."""
+        def reader(repository: MirrorRepository):
+            return self._character_details(repository, character_ids)
+        return self._read(f"{len(character_ids)} characters", reader)
+
+    async def aget_characters_by_ids(self, character_ids: list[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Async variant of `get_characters_by_ids`."""
+        return await self._aread(self.get_characters_by_ids, character_ids)
+
+    def get_locations_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Returns a locations page shaped like `fetch_locations_page`."""
+        def reader(repository: MirrorRepository):
+            rows = repository.get_page(MirroredLocation, (page - 1) * PAGE_SIZE, PAGE_SIZE)
+            info = self._page_info(repository.count(MirroredLocation), page)
+            return {"info": info, "results": [self._location_summary(row) for row in rows]}
+        return self._read(f"locations page {page}", reader)
+
+    async def aget_locations_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Async variant of `get_locations_page`."""
+        return await self._aread(self.get_locations_page, page)
+
+    def get_locations_with_residents_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Returns a locations page shaped like `fetch_locations_with_residents_page`."""
+        def reader(repository: MirrorRepository):
+            rows = repository.get_page(MirroredLocation, (page - 1) * PAGE_SIZE, PAGE_SIZE)
+            info = self._page_info(repository.count(MirroredLocation), page)
+            residents = self._residents_by_location(repository, [row.id for row in rows])
+            results = [{**self._location_summary(row), "residents": residents[row.id]} for row in rows]
+            return {"info": info, "results": results}
+        return self._read(f"locations with residents page {page}", reader)
+
+    async def aget_locations_with_residents_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Async variant of `get_locations_with_residents_page`."""
+        return await self._aread(self.get_locations_with_residents_page, page)
+
+    def _location_details(self, repository: MirrorRepository, ids: list[int]) -> Dict[int, Dict[str, Any]]:
+        """Builds locations with residents keyed by ID."""
+        rows = repository.get_by_ids(MirroredLocation, ids)
+        residents = self._residents_by_location(repository, list(rows))
+        return {row.id: {**self._location_summary(row), "residents": residents[row.id]} for row in rows.values()}
+
+    def get_location_by_id(self, location_id: int) -> Optional[Dict[str, Any]]:
+        """Returns a location shaped like `fetch_location_by_id`."""
+        def reader(repository: MirrorRepository):
+            return self._location_details(repository, [location_id]).get(location_id)
+        return self._read(f"location {location_id}", reader)
+
+    async def aget_location_by_id(self, location_id: int) -> Optional[Dict[str, Any]]:
+        """Async variant of `get_location_by_id`."""
+        return await self._aread(self.get_location_by_id, location_id)
+
+    def get_locations_by_ids(self, location_ids: list[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Returns mirrored locations with residents keyed by ID; IDs not mirrored are left out."""
+        def reader(repository: MirrorRepository):
+            return self._location_details(repository, location_ids)
+        return self._read(f"{len(location_ids)} locations", reader)
+
+    async def aget_locations_by_ids(self, location_ids: list[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Async variant of `get_locations_by_ids`."""
+        return await self._aread(self.get_locations_by_ids, location_ids)
+
+    def get_episodes_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Returns an episodes page shaped like `fetch_episodes_page`."""
+        def reader(repository: MirrorRepository):
+            rows = repository.get_page(MirroredEpisode, (page - 1) * PAGE_SIZE, PAGE_SIZE)
+            info = self._page_info(repository.count(MirroredEpisode), page)
+            return {"info": info, "results": [self._episode_summary(row) for row in rows]}
+        return self._read(f"episodes page {page}", reader)
+
+    async def aget_episodes_page(self, page: int = 1) -> Optional[Dict[str, Any]]:
+        """Async variant of `get_episodes_page`."""
+        return await self._aread(self.get_episodes_page, page)
+
+    def _episode_details(self, repository: MirrorRepository, ids: list[int]) -> Dict[int, Dict[str, Any]]:
+        """Builds episodes with characters keyed by ID."""
+        rows = repository.get_by_ids(MirroredEpisode, ids)
+        characters = repository.get_characters_for_episodes(list(rows))
+        return {
+            row.id: {
+                **self._episode_summary(row),
+                "characters": [self._character_summary(character) for character in characters[row.id]],
+                "created": row.created,
+            }
+            for row in rows.values()
+        }
+
+    def get_episode_by_id(self, episode_id: int) -> Optional[Dict[str, Any]]:
+        """Returns an episode shaped like `fetch_episode_by_id`."""
+        def reader(repository: MirrorRepository):
+            return self._episode_details(repository, [episode_id]).get(episode_id)
+        return self._read(f"episode {episode_id}", reader)
+
+    async def aget_episode_by_id(self, episode_id: int) -> Optional[Dict[str, Any]]:
+        """Async variant of `get_episode_by_id`."""
+        return await self._aread(self.get_episode_by_id, episode_id)
+
+    def get_episodes_by_ids(self, episode_ids: list[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Returns mirrored episodes with characters keyed by ID; IDs not mirrored are left out."""
+        def reader(repository: MirrorRepository):
+            return self._episode_details(repository, episode_ids)
+        return self._read(f"{len(episode_ids)} episodes", reader)
+
+    async def aget_episodes_by_ids(self, episode_ids: list[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Async variant of `get_episodes_by_ids`."""
+        return await self._aread(self.get_episodes_by_ids, episode_ids)
+
+    def get_dataset(self) -> Optional[Dict[str, list]]:
+        """Returns every mirrored row as flat dicts, characters with their relation IDs, for in-process indexes."""
+        def reader(repository: MirrorRepository):
+            episode_ids: Dict[int, list] = {}
+            for character_id, episode_id in repository.get_appearances():
+                episode_ids.setdefault(character_id, []).append(episode_id)
+            return {
+                "characters": [
+                    {
+                        **self._character_summary(row),
+                        "type": row.type,
+                        "gender": row.gender,
+                        "origin_id": row.origin_id,
+                        "location_id": row.location_id,
+                        "episode_ids": episode_ids.get(row.id, []),
+                    }
+                    for row in repository.get_all(MirroredCharacter)
+                ],
+                "locations": [self._location_summary(row) for row in repository.get_all(MirroredLocation)],
+                "episodes": [self._episode_summary(row) for row in repository.get_all(MirroredEpisode)],
+            }
+        return self._read("dataset", reader)
+
+    async def aget_dataset(self) -> Optional[Dict[str, list]]:
+        """Async variant of `get_dataset`."""
+        return await self._aread(self.get_dataset)
+
+    def get_sync_statuses(self) -> list[EntitySyncStatus]:
+        """Returns the recorded sync state of every mirrored entity type."""
+        with self.session() as db:
+            states = MirrorRepository(db).get_sync_states()
+            return [EntitySyncStatus.model_validate(state) for state in states]
+
+    async def aget_sync_statuses(self) -> list[EntitySyncStatus]:
+        """Async variant of `get_sync_statuses`; empty while the mirror is disabled."""
+        return await self._aread(self.get_sync_statuses) or []
+
+
+# Singleton instance
+mirror_service = MirrorService()
@@ -0,0 +1,286 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from src.core.config import settings
+from src.core.database.connection import db_connection
+from src.domains.mirror.models import (
+    MirroredCharacter,
+    MirroredEpisode,
+    MirroredLocation,
+    SyncReport,
+)
+from src.domains.mirror.repository import MirrorRepository
+from src.domains.mirror.service import MIRRORED_ENTITY_TYPES, PAGE_SIZE, MirrorService, mirror_service
+from src.integrations.rick_and_morty.queries.characters import CharacterQueries
+from src.integrations.rick_and_morty.queries.episodes import EpisodeQueries
+from src.integrations.rick_and_morty.queries.locations import LocationQueries
+from src.integrations.rick_and_morty.service import rick_and_morty_service
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key so only one worker runs a sync at a time
+SYNC_ADVISORY_LOCK_KEY = 7_303_118
+
+
+def _content_hash(row: Dict[str, Any]) -> str:
+    """Stable hash of a mirrored row used to skip unchanged upserts."""
+    return hashlib.sha256(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _to_id(value: Any) -> Optional[int]:
+    return int(value) if value not in (None, "") else None
+
+
+def _character_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    origin = raw.get("origin") or {}
+    location = raw.get("location") or {}
+    return {
+        "id": int(raw["id"]),
+        "name": raw["name"],
+        "status": raw.get("status") or "",
+        "species": raw.get("species") or "",
+        "type": raw.get("type") or "",
+        "gender": raw.get("gender") or "",
+        "image": raw.get("image") or "",
+        "created": raw.get("created") or "",
+        "origin_id": _to_id(origin.get("id")),
+        "origin_name": origin.get("name") or "",
+        "location_id": _to_id(location.get("id")),
+        "location_name": location.get("name") or "",
+    }
+
+
+def _location_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": int(raw["id"]),
+        "name": raw["name"],
+        "type": raw.get("type") or "",
+        "dimension": raw.get("dimension") or "",
+        "created": raw.get("created") or "",
+    }
+
+
+def _episode_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": int(raw["id"]),
+        "name": raw["name"],
+        "air_date": raw.get("air_date") or "",
+        "episode": raw.get("episode") or "",
+        "created": raw.get("created") or "",
+    }
+
+
+class MirrorSyncService:
+    """Pulls the Rick & Morty dataset into the local mirror tables and keeps it in sync."""
+
+    def __init__(self, mirror: MirrorService):
+        self.mirror = mirror
+        self.upstream = rick_and_morty_service
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self.last_report: SyncReport | None = None
+
+    @property
+    def syncing(self) -> bool:
+        return self._lock.locked()
+
+    def _entity_specs(self) -> list[tuple[str, type, Callable[[int], Awaitable[Dict[str, Any]]], str, Callable]]:
+        """Entity types in dependency order: locations and episodes before characters."""
+        return [
+            ("location", MirroredLocation, self.upstream.afetch_locations_sync_page, LocationQueries.GET_LOCATIONS_SYNC_PAGE, _location_row),
+            ("episode", MirroredEpisode, self.upstream.afetch_episodes_sync_page, EpisodeQueries.GET_EPISODES_SYNC_PAGE, _episode_row),
+            ("character", MirroredCharacter, self.upstream.afetch_characters_sync_page, CharacterQueries.GET_CHARACTERS_SYNC_PAGE, _character_row),
+        ]
+
+    async def sync(self, full: bool = False) -> SyncReport:
+        """
+        Runs one sync pass.
+
+        A delta pass fetches page 1, the last locally mirrored page and any pages
+        past it (the upstream orders entities by ID). It picks up new rows, and
+        turns into a full pass when the re-read pages show edited rows or the
+        upstream count dropped; edits elsewhere wait for the next full sync. A full
+        pass re-walks every page, upserts whatever changed according to the stored
+        content hashes and deletes IDs no longer present upstream.
+        """
+        async with self._lock:
+            # Hold a dedicated connection so the session-level advisory lock outlives commits
+            connection = await asyncio.to_thread(db_connection.get_engine().connect)
+            try:
+                locked = await asyncio.to_thread(self._try_lock, connection)
+                if not locked:
+                    logger.info("Mirror sync already running in another worker; skipping")
+                    return SyncReport(full=full)
+                try:
+                    return await self._sync_entities(full)
+                finally:
+                    await asyncio.to_thread(self._unlock, connection)
+            finally:
+                await asyncio.to_thread(connection.close)
+
+    def _try_lock(self, connection) -> bool:
+        locked = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SYNC_ADVISORY_LOCK_KEY}).scalar()
+        connection.commit()
+        return bool(locked)
+
+    def _unlock(self, connection) -> None:
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SYNC_ADVISORY_LOCK_KEY})
+        connection.commit()
+
+    def _load_local_state(self, model: type) -> tuple[int, Dict[int, str]]:
+        """Returns the mirrored row count and content hashes for a model."""
+        with self.mirror.session() as db:
+            repository = MirrorRepository(db)
+            return repository.count(model), repository.get_hashes(model)
+
+    def _write(
+        self,
+        entity_type: str,
+        model: type,
+        rows: list[Dict[str, Any]],
+        links: Dict[int, list[int]],
+        removed: list[int],
+        upstream_count: int,
+        full: bool,
+    ) -> tuple[int, int]:
+        """Upserts changed rows and relations and deletes removed rows in one transaction."""
+        with self.mirror.session() as db:
+            repository = MirrorRepository(db)
+            upserted = repository.upsert(model, rows)
+            repository.replace_character_episodes(links)
+            deleted = repository.delete(model, removed)
+            repository.set_sync_state(entity_type, upstream_count, full=full, changed=bool(rows or removed))
+        return upserted, deleted
+
+    async def _fetch_pages(self, entity_type: str, page_query: str, page_numbers: range) -> list[Dict[str, Any]]:
+        """Fetches pages as aliased multi-page documents rather than one request each."""
+        return await self.upstream.afetch_pages(
+            page_query,
+            page_numbers,
+            f"{entity_type}s sync",
+            concurrency=settings.MIRROR_SYNC_CONCURRENCY,
+        )
+
+    def _parse(
+        self, entity_type: str, to_row: Callable, pages: list[Dict[str, Any]]
+    ) -> list[tuple[Dict[str, Any], list[int]]]:
+        """Turns upstream pages into hashed mirror rows paired with their episode IDs."""
+        parsed = []
+        for page_data in pages:
+            for raw in page_data["results"]:
+                row = to_row(raw)
+                episode_ids = [int(e["id"]) for e in raw["episode"]] if entity_type == "character" else []
+                row["content_hash"] = _content_hash({**row, "episodes": episode_ids})
+                parsed.append((row, episode_ids))
+        return parsed
+
+    def _has_edits(self, parsed: list[tuple[Dict[str, Any], list[int]]], known_hashes: Dict[int, str]) -> bool:
+        """Whether any already-mirrored row among the fetched ones changed upstream."""
+        return any(
+            known_hashes.get(row["id"], row["content_hash"]) != row["content_hash"] for row, _ in parsed
+        )
+
+    async def _sync_entities(self, full: bool) -> SyncReport:
+        started = time.perf_counter()
+        report = SyncReport(full=full)
+
+        for entity_type, model, fetch_page, page_query, to_row in self._entity_specs():
+            first_page = await fetch_page(1)
+            upstream_count = first_page["info"]["count"]
+            total_pages = first_page["info"]["pages"]
+
+            local_count, known_hashes = await asyncio.to_thread(self._load_local_state, model)
+            full_pass = full or local_count == 0
+            # A delta pass re-reads the last locally mirrored page along with page 1 as a spot check
+            start_page = 2 if full_pass else max(math.ceil(local_count / PAGE_SIZE), 2)
+            pages = [first_page] + await self._fetch_pages(entity_type, page_query, range(start_page, total_pages + 1))
+            parsed = self._parse(entity_type, to_row, pages)
+
+            if not full_pass and (upstream_count < local_count or self._has_edits(parsed, known_hashes)):
+                logger.info(f"Delta {entity_type} sync found edited or removed rows; re-walking every page")
+                earlier_pages = await self._fetch_pages(entity_type, page_query, range(2, start_page))
+                pages += earlier_pages
+                parsed += self._parse(entity_type, to_row, earlier_pages)
+                full_pass = True
+            report.pages_fetched += len(pages)
+
+            rows, links, seen = [], {}, set()
+            for row, episode_ids in parsed:
+                seen.add(row["id"])
+                if known_hashes.get(row["id"]) == row["content_hash"]:
+                    continue
+                rows.append(row)
+                if entity_type == "character":
+                    links[row["id"]] = episode_ids
+
+            removed: list[int] = []
+            if full_pass:
+                # Only a complete walk proves an ID is gone upstream
+                if len(seen) == upstream_count:
+                    removed = sorted(set(known_hashes) - seen)
+                else:
+                    logger.warning(
+                        f"Full {entity_type} sync saw {len(seen)} of {upstream_count} upstream; skipping deletions"
+                    )
+
+            report.upserted[entity_type], report.deleted[entity_type] = await asyncio.to_thread(
+                self._write, entity_type, model, rows, links, removed, upstream_count, full_pass
+            )
+            logger.info(
+                f"Mirrored {entity_type}s: {len(rows)} changed, {len(removed)} removed of {upstream_count} upstream"
+            )
+
+        report.duration_seconds = round(time.perf_counter() - started, 3)
+        self.last_report = report
+        self.mirror.mark_ready()
+        logger.info(f"Mirror sync finished: {report.model_dump()}")
+        return report
+
+    def _needs_full_sync(self) -> bool:
+        """Whether the oldest full reconciliation is older than the configured interval."""
+        with self.mirror.session() as db:
+            states = MirrorRepository(db).get_sync_states()
+            full_syncs = [state.last_full_sync_at for state in states if state.last_full_sync_at is not None]
+        if len(full_syncs) < len(MIRRORED_ENTITY_TYPES):
+            return True
+        age = datetime.now(timezone.utc) - min(full_syncs)
+        return age.total_seconds() >= settings.MIRROR_FULL_SYNC_INTERVAL_SECONDS
+
+    async def _run_forever(self) -> None:
+        """Scheduled loop: delta syncs on an interval, full reconciliation less often."""
+        while True:
+            try:
+                full = await asyncio.to_thread(self._needs_full_sync)
+                await self.sync(full=full)
+            except Exception as e:
+                logger.error(f"Mirror sync failed: {e}")
+            await asyncio.sleep(settings.MIRROR_SYNC_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """Starts the scheduled sync loop in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever())
+            logger.info("Mirror sync scheduler started")
+
+    async def stop(self) -> None:
+        """Stops the scheduled sync loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Mirror sync scheduler stopped")
+
+
+# Singleton instance
+mirror_sync_service = MirrorSyncService(mirror_service)
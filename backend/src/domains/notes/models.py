@@ -16,6 +16,8 @@ class Note(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Incremented by NotesRepository.update; the notes endpoints use it as their ETag
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
 
 class NoteCreate(BaseModel):
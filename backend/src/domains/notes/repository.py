@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import Optional, Tuple
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
 from src.core.database.repository import BaseRepository
@@ -34,3 +35,31 @@ class NotesRepository(BaseRepository):
         return self.db.query(self.model).filter(
             self.model.character_id == character_id
         ).count()
+    
+    def update(self, id: int, **kwargs):
+        """Update a note and increment its version in one statement; returns None if it no longer exists."""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(version=self.model.version + 1, **kwargs)
+            .returning(self.model)
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+    
+    def delete(self, id: int) -> bool:
+        """Delete a note in one statement; losing a concurrent delete returns False rather than erroring."""
+        return self.db.query(self.model).filter(self.model.id == id).delete(synchronize_session=False) > 0
+    
+    def get_version(self, note_id: int) -> Optional[int]:
+        """Get a note's version counter without loading the note."""
+        return self.db.query(self.model.version).filter(self.model.id == note_id).scalar()
+    
+    def get_version_by_character_id(self, character_id: int) -> Tuple[int, int, int]:
+        """Count, highest ID and summed versions of a character's notes; any create, update or delete changes one of them."""
+        return tuple(self.db.query(
+            func.count(self.model.id),
+            func.coalesce(func.max(self.model.id), 0),
+            func.coalesce(func.sum(self.model.version), 0),
+        ).filter(
+            self.model.character_id == character_id
+        ).one())
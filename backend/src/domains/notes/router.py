@@ -1,8 +1,10 @@
 import logging
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from src.core.database.connection import db_connection
+from src.core.http_cache import NOTES_CACHE_CONTROL, etag_matches, make_etag, not_modified, validator_headers
+from src.core.serialization import json_response
 from src.domains.notes import models as notes_models
 from src.domains.notes.service import NotesService
 
@@ -28,29 +30,42 @@ async def create_note(
 
 @router.get("/character/{character_id}", response_model=notes_models.NotesListResponse)
 async def get_character_notes(
+    request: Request,
     character_id: int,
     limit: int = Query(None, ge=1, le=100, description="Maximum number of notes to return"),
     offset: int = Query(0, ge=0, description="Number of notes to skip"),
     db: Session = Depends(db_connection.get_db)
-):
+) -> Response:
     """Get all notes for a specific character."""
     try:
         service = NotesService(db)
+        etag = make_etag("notes", character_id, limit, offset, service.get_character_notes_version(character_id))
+        if etag_matches(request, etag):
+            return not_modified(etag, NOTES_CACHE_CONTROL)
         notes, total = service.get_notes_with_count(character_id, limit, offset)
-        return notes_models.NotesListResponse(notes=notes, total=total)
+        return json_response(
+            notes_models.NotesListResponse(notes=notes, total=total),
+            headers=validator_headers(etag, NOTES_CACHE_CONTROL),
+        )
     except Exception as e:
         logger.error(f"Error fetching notes for character {character_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch notes: {str(e)}")
 
 
 @router.get("/{note_id}", response_model=notes_models.NoteResponse)
-async def get_note(note_id: int, db: Session = Depends(db_connection.get_db)):
+async def get_note(request: Request, note_id: int, db: Session = Depends(db_connection.get_db)) -> Response:
     """Get a specific note by ID."""
     service = NotesService(db)
+    version = service.get_note_version(note_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Note {note_id} not found")
+    etag = make_etag("note", note_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag, NOTES_CACHE_CONTROL)
     note = service.get_note(note_id)
     if not note:
         raise HTTPException(status_code=404, detail=f"Note {note_id} not found")
-    return note
+    return json_response(note, headers=validator_headers(etag, NOTES_CACHE_CONTROL))
 
 
 @router.put("/{note_id}", response_model=notes_models.NoteResponse)
@@ -74,3 +74,11 @@ class NotesService:
     def count_notes_by_character(self, character_id: int) -> int:
         """Count total notes for a character."""
         return self.repository.count_by_character_id(character_id)
+    
+    def get_note_version(self, note_id: int) -> Optional[int]:
+        """Version counter of a note, or None if it does not exist."""
+        return self.repository.get_version(note_id)
+    
+    def get_character_notes_version(self, character_id: int) -> Tuple[int, int, int]:
+        """Summary that changes whenever any of a character's notes does."""
+        return self.repository.get_version_by_character_id(character_id)
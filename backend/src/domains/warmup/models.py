@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class WarmupReport(BaseModel):
+    """What the startup warm-up loaded and how long it took."""
+    status: Literal["pending", "running", "complete", "timed_out", "disabled"]
+    started_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    loaded: dict[str, int] = {}
+    failed: list[str] = []
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from src.core.config import settings
+from src.core.http_cache import encoded_bodies
+from src.domains.characters.service import characters_service
+from src.domains.episodes.service import episodes_service
+from src.domains.graph.service import graph_service
+from src.domains.locations.service import locations_service
+from src.domains.warmup.models import WarmupReport
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupService:
+    """
+    Preloads hot list pages and entities at startup.
+
+    Loads go through the regular domain services, so they fill the upstream cache
+    tiers and the response body/ETag memo the same way a first request would. The
+    worker reports not ready until every load finished or the deadline passed.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self.status = "pending"
+        self.started_at: datetime | None = None
+        self.duration_seconds: float | None = None
+        self.loaded: Counter = Counter()
+        self.failed: List[str] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.status not in ("pending", "running")
+
+    def _jobs(self) -> List[Tuple[str, str, Callable[[], Awaitable[Any]]]]:
+        """(kind, label, loader) for everything configured to be preloaded."""
+        jobs: List[Tuple[str, str, Callable[[], Awaitable[Any]]]] = []
+        for page in range(1, settings.WARMUP_PAGES + 1):
+            jobs.append(("character_pages", f"characters page {page}", lambda page=page: characters_service.get_characters_page(page)))
+            jobs.append(("location_pages", f"locations page {page}", lambda page=page: locations_service.get_locations_with_residents_page(page)))
+            jobs.append(("episode_pages", f"episodes page {page}", lambda page=page: episodes_service.get_episodes_page(page)))
+        for character_id in settings.WARMUP_CHARACTER_IDS:
+            jobs.append(("characters", f"character {character_id}", lambda i=character_id: characters_service.get_character_by_id(i)))
+        for location_id in settings.WARMUP_LOCATION_IDS:
+            jobs.append(("locations", f"location {location_id}", lambda i=location_id: locations_service.get_location_by_id(i)))
+        for episode_id in settings.WARMUP_EPISODE_IDS:
+            jobs.append(("episodes", f"episode {episode_id}", lambda i=episode_id: episodes_service.get_episode_by_id(i)))
+        if settings.WARMUP_DATASET:
+            jobs.append(("dataset", "dataset snapshot and relationship graph", graph_service.get_graph))
+        return jobs
+
+    async def _load(self, kind: str, label: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            result = await loader()
+        except Exception as e:
+            logger.warning(f"Warm-up failed to load {label}: {e}")
+            self.failed.append(label)
+            return
+        if kind != "dataset":
+            encoded_bodies.prime(result)
+        self.loaded[kind] += 1
+
+    async def _run(self) -> None:
+        jobs = self._jobs()
+        self.status = "running"
+        self.started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        logger.info(f"Warm-up started: {len(jobs)} loads, deadline {settings.WARMUP_DEADLINE_SECONDS}s")
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self._load(kind, label, loader) for kind, label, loader in jobs)),
+                timeout=settings.WARMUP_DEADLINE_SECONDS,
+            )
+            self.status = "complete"
+        except asyncio.TimeoutError:
+            self.status = "timed_out"
+        self.duration_seconds = round(time.perf_counter() - started, 3)
+        logger.info(
+            f"Warm-up {self.status} in {self.duration_seconds}s: loaded {dict(self.loaded)}"
+            + (f", failed {len(self.failed)}" if self.failed else "")
+        )
+
+    def start(self) -> None:
+        """Starts warm-up in the background; the worker serves requests meanwhile but reports not ready."""
+        if not settings.WARMUP_ENABLED:
+            self.status = "disabled"
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancels a warm-up still in progress."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_report(self) -> WarmupReport:
+        return WarmupReport(
+            status=self.status,
+            started_at=self.started_at,
+            duration_seconds=self.duration_seconds,
+            loaded=dict(self.loaded),
+            failed=list(self.failed),
+        )
+
+
+# Singleton instance
+warmup_service = WarmupService()
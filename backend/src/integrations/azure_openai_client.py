@@ -1,28 +1,111 @@
-import asyncio
 import logging
-from typing import Dict, Any
-from openai import AzureOpenAI
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+from openai import AsyncAzureOpenAI, AsyncStream
+from openai.types.chat import ChatCompletionChunk
 
 from src.core.config import settings
+from src.core.sse import EventStream
+from src.integrations.azure_openai_scheduler import AzureOpenAIScheduler
+from src.integrations.embedding_batcher import EmbeddingBatcher, estimate_tokens
+from src.integrations.embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
+# First API version that accepts stream_options and reports usage on streamed completions
+STREAM_USAGE_API_VERSION = "2024-09-01-preview"
+
+
+def reports_stream_usage(api_version: str) -> bool:
+    """Whether `api_version` (dated ``YYYY-MM-DD``, optionally ``-preview``) supports ``stream_options``."""
+    return api_version[:10] >= STREAM_USAGE_API_VERSION[:10]
+
+
+def _timeout(read: float) -> httpx.Timeout:
+    return httpx.Timeout(
+        read,
+        connect=settings.AZURE_OPENAI_CONNECT_TIMEOUT,
+        pool=settings.AZURE_OPENAI_POOL_TIMEOUT,
+    )
+
 
 class AzureOpenAIClient:
-    """Wrapper for Azure OpenAI API client."""
-    
+    """
+    Wrapper for the async Azure OpenAI API client.
+
+    Calls run on the event loop over one pooled HTTP client, so in-flight requests
+    hold a socket rather than a worker thread; the pool size, keep-alive and
+    per-call timeouts come from settings. Single-text embedding calls are batched
+    with concurrent ones into multi-input requests (see `EmbeddingBatcher`), behind
+    a two-tier cache of previously embedded texts (see `EmbeddingCache`).
+
+    Every API call is admitted by the scheduler of its deployment (see
+    `AzureOpenAIScheduler`), which keeps traffic under the RPM/TPM quota, shares it
+    between priority classes and owns retries; callers pass their class as
+    `priority`.
+    """
+
     def __init__(self):
         """Initialize Azure OpenAI client."""
         if not settings.AZURE_OPENAI_API_KEY or not settings.AZURE_OPENAI_ENDPOINT:
             raise ValueError("Azure OpenAI client not configured. Set AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT")
-        
-        self.client = AzureOpenAI(
+
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.AZURE_OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.AZURE_OPENAI_KEEPALIVE_EXPIRY,
+            ),
+            timeout=_timeout(settings.AZURE_OPENAI_COMPLETION_TIMEOUT),
+        )
+        self.client = AsyncAzureOpenAI(
             api_key=settings.AZURE_OPENAI_API_KEY,
             api_version=settings.AZURE_OPENAI_API_VERSION,
-            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT
+            azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+            # Retries go through the scheduler so a 429 pauses every queued call
+            max_retries=0,
+            http_client=self.http_client,
+        )
+        self.completion_timeout = _timeout(settings.AZURE_OPENAI_COMPLETION_TIMEOUT)
+        self.stream_usage = reports_stream_usage(settings.AZURE_OPENAI_API_VERSION)
+        if not self.stream_usage:
+            logger.info(
+                f"Azure OpenAI API version {settings.AZURE_OPENAI_API_VERSION} does not report usage on streamed "
+                f"completions; set AZURE_OPENAI_API_VERSION to {STREAM_USAGE_API_VERSION} or later to enable it"
+            )
+        self.embedding_timeout = _timeout(settings.AZURE_OPENAI_EMBEDDING_TIMEOUT)
+        self.chat_scheduler = AzureOpenAIScheduler(
+            "chat",
+            rpm=settings.AZURE_OPENAI_CHAT_RPM,
+            tpm=settings.AZURE_OPENAI_CHAT_TPM,
+            weights=settings.AZURE_OPENAI_PRIORITY_WEIGHTS,
+            burst_seconds=settings.AZURE_OPENAI_RATE_BURST_SECONDS,
+            max_retries=settings.AZURE_OPENAI_MAX_RETRIES,
         )
-        logger.info("Azure OpenAI client initialized")
-    
+        self.embedding_scheduler = AzureOpenAIScheduler(
+            "embeddings",
+            rpm=settings.AZURE_OPENAI_EMBEDDING_RPM,
+            tpm=settings.AZURE_OPENAI_EMBEDDING_TPM,
+            weights=settings.AZURE_OPENAI_PRIORITY_WEIGHTS,
+            burst_seconds=settings.AZURE_OPENAI_RATE_BURST_SECONDS,
+            max_retries=settings.AZURE_OPENAI_MAX_RETRIES,
+        )
+        self.embedding_batcher = EmbeddingBatcher(
+            self.generate_embeddings,
+            window_ms=settings.AZURE_OPENAI_EMBEDDING_BATCH_WINDOW_MS,
+            max_inputs=settings.AZURE_OPENAI_EMBEDDING_BATCH_MAX_INPUTS,
+            max_tokens=settings.AZURE_OPENAI_EMBEDDING_BATCH_MAX_TOKENS,
+            max_input_tokens=settings.AZURE_OPENAI_EMBEDDING_MAX_INPUT_TOKENS,
+        )
+        self.embedding_cache = EmbeddingCache(
+            model=settings.AZURE_OPENAI_EMBEDDING_MODEL,
+            dimensions=settings.AZURE_OPENAI_EMBEDDING_DIMENSIONS,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            persist=settings.EMBEDDING_CACHE_PERSIST,
+        ) if settings.EMBEDDING_CACHE_ENABLED else None
+        logger.info(f"Azure OpenAI client initialized (max {settings.AZURE_OPENAI_MAX_CONNECTIONS} connections)")
+
     async def generate_completion(
         self,
         system_prompt: str,
@@ -30,37 +113,41 @@ class AzureOpenAIClient:
         temperature: float = 0.7,
         max_tokens: int = 500,
         response_format: Dict[str, Any] | None = None,
+        priority: str = "interactive",
     ) -> Dict[str, Any]:
         """
         Generate a completion using Azure OpenAI.
-        
+
         Args:
             system_prompt: System-level instructions
             user_prompt: User query/input
             temperature: Randomness (0.0-1.0)
             max_tokens: Maximum tokens in response
             response_format: Optional response_format payload (e.g. {"type": "json_object"})
-            
+            priority: Scheduling class ("interactive", "search", "evaluation", "bulk")
+
         Returns:
             Dict containing response text, usage, and metadata
         """
         try:
-            def _create_completion():
-                kwargs: Dict[str, Any] = {
-                    "model": settings.AZURE_OPENAI_DEPLOYMENT,
-                    "messages": [
+            kwargs: Dict[str, Any] = {
+                "model": settings.AZURE_OPENAI_DEPLOYMENT,
+                "messages": [
                     {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
+                    {"role": "user", "content": user_prompt},
                 ],
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                }
-                if response_format is not None:
-                    kwargs["response_format"] = response_format
-                return self.client.chat.completions.create(**kwargs)
-
-            response = await asyncio.to_thread(_create_completion)
-            
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "timeout": self.completion_timeout,
+            }
+            if response_format is not None:
+                kwargs["response_format"] = response_format
+            response = await self.chat_scheduler.run(
+                priority,
+                self._completion_cost(system_prompt, user_prompt, max_tokens),
+                lambda: self.client.chat.completions.create(**kwargs),
+            )
+
             return {
                 "text": response.choices[0].message.content,
                 "usage": {
@@ -71,29 +158,139 @@ class AzureOpenAIClient:
                 "model": response.model,
                 "finish_reason": response.choices[0].finish_reason,
             }
-            
+
         except Exception as e:
             logger.error(f"Azure OpenAI API error: {e}")
             raise
-    
+
+    async def stream_completion(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        priority: str = "interactive",
+    ) -> EventStream[Dict[str, Any]]:
+        """
+        Stream a completion using Azure OpenAI.
+
+        Returns once the API has accepted the request, so connection and request
+        errors raise here rather than mid-stream. The iterator yields
+        ``{"type": "delta", "text": ...}`` events as tokens arrive and ends with one
+        ``{"type": "done", ...}`` event carrying usage (None on API versions before
+        `STREAM_USAGE_API_VERSION`), model and finish_reason.
+        Chunks are read only as the consumer asks for them, so a slow client slows
+        the upstream read instead of buffering the completion in memory. Closing the
+        iterator closes the upstream stream, whether or not it was iterated.
+        """
+        kwargs: Dict[str, Any] = {
+            "model": settings.AZURE_OPENAI_DEPLOYMENT,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "timeout": self.completion_timeout,
+        }
+        if self.stream_usage:
+            kwargs["stream_options"] = {"include_usage": True}
+        try:
+            stream = await self.chat_scheduler.run(
+                priority,
+                self._completion_cost(system_prompt, user_prompt, max_tokens),
+                lambda: self.client.chat.completions.create(**kwargs),
+            )
+        except Exception as e:
+            logger.error(f"Azure OpenAI API error: {e}")
+            raise
+        return EventStream(self._completion_events(stream), stream.close)
+
+    @staticmethod
+    def _completion_cost(system_prompt: str, user_prompt: str, max_tokens: int) -> int:
+        """Tokens a completion counts against TPM: Azure charges the prompt estimate plus max_tokens up front."""
+        return estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + max_tokens
+
+    async def _completion_events(self, stream: AsyncStream[ChatCompletionChunk]) -> AsyncIterator[Dict[str, Any]]:
+        done: Dict[str, Any] = {"type": "done", "usage": None, "model": None, "finish_reason": None}
+        try:
+            async for chunk in stream:
+                done["model"] = chunk.model or done["model"]
+                if chunk.usage is not None:
+                    # Sent on the final chunk, which has no choices
+                    done["usage"] = {
+                        "prompt_tokens": chunk.usage.prompt_tokens,
+                        "completion_tokens": chunk.usage.completion_tokens,
+                        "total_tokens": chunk.usage.total_tokens,
+                    }
+                for choice in chunk.choices:
+                    if choice.delta.content:
+                        yield {"type": "delta", "text": choice.delta.content}
+                    if choice.finish_reason is not None:
+                        done["finish_reason"] = choice.finish_reason
+            yield done
+        except Exception as e:
+            logger.error(f"Azure OpenAI stream error: {e}")
+            raise
+        finally:
+            # Releases the connection when the consumer stops early
+            await stream.close()
+
     async def generate_embedding(
         self,
         text: str,
+        priority: str = "interactive",
     ) -> list[float]:
-        """Generate an embedding vector for text using Azure OpenAI."""
+        """Generate an embedding vector for text, from the cache or batched with concurrent calls."""
+        if self.embedding_cache is None:
+            return await self.embedding_batcher.embed(text, priority)
+        return await self.embedding_cache.get_or_embed(text, lambda t: self.embedding_batcher.embed(t, priority))
+
+    async def generate_embeddings(
+        self,
+        texts: list[str],
+        priority: str = "interactive",
+    ) -> list[list[float]]:
+        """Generate embedding vectors for several texts in one request, in input order."""
         try:
-            response = await asyncio.to_thread(
-                self.client.embeddings.create,
-                model=settings.AZURE_OPENAI_EMBEDDING_MODEL,
-                input=text
+            kwargs: Dict[str, Any] = {
+                "model": settings.AZURE_OPENAI_EMBEDDING_MODEL,
+                "input": texts,
+                "timeout": self.embedding_timeout,
+            }
+            if settings.AZURE_OPENAI_EMBEDDING_DIMENSIONS:
+                kwargs["dimensions"] = settings.AZURE_OPENAI_EMBEDDING_DIMENSIONS
+            response = await self.embedding_scheduler.run(
+                priority,
+                sum(estimate_tokens(text) for text in texts),
+                lambda: self.client.embeddings.create(**kwargs),
             )
-            
-            return response.data[0].embedding
-            
+
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
         except Exception as e:
-            logger.error(f"Azure OpenAI embedding error: {e}")
+            logger.error(f"Azure OpenAI embedding error ({len(texts)} inputs): {e}")
             raise
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns scheduler, embedding batching and cache counters."""
+        return {
+            "chat_scheduler": self.chat_scheduler.stats(),
+            "embedding_scheduler": self.embedding_scheduler.stats(),
+            "embedding_batcher": self.embedding_batcher.stats(),
+            "embedding_cache": self.embedding_cache.stats() if self.embedding_cache is not None else None,
+        }
+
+    async def aclose(self) -> None:
+        """Finishes pending embedding cache writes and closes the pooled HTTP connections."""
+        if self.embedding_cache is not None:
+            await self.embedding_cache.flush()
+        await self.chat_scheduler.aclose()
+        await self.embedding_scheduler.aclose()
+        await self.client.close()
+        logger.info("Closed Azure OpenAI connections")
+
 
 # Singleton instance
 azure_openai_client = AzureOpenAIClient()
@@ -0,0 +1,292 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Priority classes, most latency-sensitive first
+PRIORITIES = ("interactive", "search", "evaluation", "bulk")
+
+
+def retry_after_seconds(error: openai.APIStatusError) -> Optional[float]:
+    """Delay requested by a 429 via ``retry-after-ms`` or ``retry-after`` (seconds or HTTP date)."""
+    headers = error.response.headers if error.response is not None else {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateBudget:
+    """
+    Token bucket refilled continuously from a per-minute limit; 0 disables it.
+
+    Holds `burst_seconds` worth of quota, mirroring Azure enforcing its per-minute
+    limits over short windows. A cost larger than the bucket is admitted once the
+    bucket is full and paid back as debt.
+    """
+
+    def __init__(self, per_minute: int, burst_seconds: float):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_minute > 0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, cost: float, now: float) -> float:
+        """Seconds until `cost` can be admitted."""
+        if not self.enabled:
+            return 0.0
+        self._refill(now)
+        needed = min(cost, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, cost: float, now: float) -> None:
+        if self.enabled:
+            self._refill(now)
+            self.level -= cost
+
+    def refund(self, cost: float, now: float) -> None:
+        """Returns quota taken for a call that was never made."""
+        if self.enabled:
+            self._refill(now)
+            self.level = min(self.capacity, self.level + cost)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"per_minute": self.per_minute, "available": round(self.level, 1) if self.enabled else None}
+
+
+class _Ticket:
+    __slots__ = ("priority", "cost", "start", "finish", "seq", "future", "enqueued")
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.finish, self.seq) < (other.finish, other.seq)
+
+
+class AzureOpenAIScheduler:
+    """
+    Admits calls to one Azure OpenAI deployment under its RPM/TPM quota.
+
+    Calls wait in a single queue ordered by virtual finish time, as in weighted fair
+    queueing: each call is tagged with its class's previous finish tag (or the
+    current virtual time, if later) plus cost/weight, so under contention classes
+    share the token budget in proportion to their weights and a bulk backlog cannot
+    hold back interactive calls. A caller that gives up while queued hands its
+    share back to its class; one cancelled between admission and making its call
+    also hands its quota back to the buckets. The head of the queue is admitted
+    once the request and token buckets cover it. A 429 pauses admission
+    for the `Retry-After` the service asked for; 429s, connection errors and 5xx
+    responses are retried up to `max_retries` times.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int,
+        tpm: int,
+        weights: Dict[str, int],
+        burst_seconds: float = 10.0,
+        max_retries: int = 2,
+    ):
+        unknown = set(weights) - set(PRIORITIES)
+        if unknown:
+            raise ValueError(f"Unknown priority classes: {sorted(unknown)}")
+        self.name = name
+        self.requests = RateBudget(rpm, burst_seconds)
+        self.tokens = RateBudget(tpm, burst_seconds)
+        self.weights = {priority: max(1, weights.get(priority, 1)) for priority in PRIORITIES}
+        self.max_retries = max_retries
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._paused_until = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self.dispatched: Counter = Counter()
+        self.wait_seconds: Counter = Counter()
+        self.max_wait_seconds: Dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+        self.rate_limited = 0
+        self.retries = 0
+
+    async def run(self, priority: str, cost: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Runs `call` once admitted, retrying rate-limited and transient failures."""
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority class: {priority}")
+        attempt = 0
+        while True:
+            await self._acquire(priority, cost)
+            try:
+                return await call()
+            except openai.RateLimitError as e:
+                self.rate_limited += 1
+                delay = retry_after_seconds(e) or self._backoff(attempt)
+                self._pause(delay)
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Azure OpenAI {self.name} rate limited; pausing {delay:.2f}s")
+            except (openai.APIConnectionError, openai.InternalServerError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Azure OpenAI {self.name} call failed ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            attempt += 1
+            self.retries += 1
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return min(8.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def _pause(self, delay: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queued futures and the dispatcher belong to the loop that created them
+            self._loop = loop
+            self._queue = []
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    def _delay(self, cost: int, now: float) -> float:
+        return max(self._paused_until - now, self.requests.delay(1, now), self.tokens.delay(cost, now))
+
+    def _admit(self, priority: str, cost: int, now: float, waited: float) -> None:
+        self.requests.take(1, now)
+        self.tokens.take(cost, now)
+        self.dispatched[priority] += 1
+        self.wait_seconds[priority] += waited
+        self.max_wait_seconds[priority] = max(self.max_wait_seconds[priority], waited)
+
+    async def _acquire(self, priority: str, cost: int) -> None:
+        self._bind_loop()
+        start = max(self._virtual_time, self._last_finish[priority])
+        finish = start + max(cost, 1) / self.weights[priority]
+        self._last_finish[priority] = finish
+
+        now = time.monotonic()
+        if not self._queue and self._delay(cost, now) == 0:
+            self._virtual_time = start
+            self._admit(priority, cost, now, 0.0)
+            return
+
+        ticket = _Ticket()
+        ticket.priority, ticket.cost, ticket.start, ticket.finish = priority, cost, start, finish
+        ticket.seq = next(self._seq)
+        ticket.future = self._loop.create_future()
+        ticket.enqueued = now
+        heapq.heappush(self._queue, ticket)
+        # A new head may be cheaper or due sooner than the one being waited on
+        self._wakeup.set()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if not ticket.future.cancelled():
+                # Admitted, but cancelled before resuming: the call will never be made
+                now = time.monotonic()
+                self.requests.refund(1, now)
+                self.tokens.refund(cost, now)
+                self._wakeup.set()
+            self._withdraw(ticket)
+            raise
+
+    def _withdraw(self, ticket: _Ticket) -> None:
+        """Refunds a cancelled ticket's share so its class is not charged for a call it never made."""
+        share = ticket.finish - ticket.start
+        self._last_finish[ticket.priority] -= share
+        for other in self._queue:
+            if other.priority == ticket.priority and other.seq > ticket.seq:
+                other.start -= share
+                other.finish -= share
+        heapq.heapify(self._queue)
+
+    async def _dispatch(self) -> None:
+        while True:
+            while self._queue and self._queue[0].future.done():
+                # Caller gave up while queued
+                heapq.heappop(self._queue)
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            head = self._queue[0]
+            now = time.monotonic()
+            delay = self._delay(head.cost, now)
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._queue)
+            self._virtual_time = head.start
+            self._admit(head.priority, head.cost, now, now - head.enqueued)
+            head.future.set_result(None)
+
+    async def aclose(self) -> None:
+        """Stops the dispatcher; callers still queued are cancelled."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        for ticket in self._queue:
+            ticket.future.cancel()
+        self._queue = []
+
+    def stats(self) -> Dict[str, Any]:
+        queued = Counter(ticket.priority for ticket in self._queue if not ticket.future.done())
+        return {
+            "requests": self.requests.stats(),
+            "tokens": self.tokens.stats(),
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "queue_depth": sum(queued.values()),
+            "classes": {
+                priority: {
+                    "weight": self.weights[priority],
+                    "queued": queued[priority],
+                    "dispatched": self.dispatched[priority],
+                    "mean_wait_seconds": round(self.wait_seconds[priority] / self.dispatched[priority], 4) if self.dispatched[priority] else 0.0,
+                    "max_wait_seconds": round(self.max_wait_seconds[priority], 4),
+                }
+                for priority in PRIORITIES
+            },
+        }
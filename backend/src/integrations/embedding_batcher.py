@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+Vector = List[float]
+
+
+def estimate_tokens(text: str) -> int:
+    """Upper-bound token estimate for budgeting; English averages ~4 bytes per token, 3 leaves headroom."""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+class _Batch:
+    """Texts queued for one priority class; identical texts share an entry."""
+
+    __slots__ = ("waiters", "tokens", "timer")
+
+    def __init__(self):
+        self.waiters: Dict[str, List[asyncio.Future]] = {}
+        self.tokens = 0
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding calls into multi-input requests.
+
+    Texts queue for at most `window_ms` milliseconds; the batch is sent earlier once
+    it holds `max_inputs` texts or adding a text would exceed `max_tokens`. Vectors
+    are fanned back out to the waiters in order. Identical queued texts share one
+    input, so waiters may receive the same list object and must treat it as
+    read-only. A failed request fails every waiter in its batch. Texts estimated
+    above `max_input_tokens` are sent on their own, so a rejection only reaches
+    that caller. Each priority class is batched separately and sent at its own
+    priority.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[str], str], Awaitable[List[Vector]]],
+        window_ms: float = 5.0,
+        max_inputs: int = 128,
+        max_tokens: int = 100_000,
+        max_input_tokens: int = 8191,
+    ):
+        self._send = send
+        self.window = window_ms / 1000
+        self.max_inputs = max_inputs
+        self.max_tokens = max_tokens
+        self.max_input_tokens = max_input_tokens
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._batches: Dict[str, _Batch] = {}
+        self._requests: Set[asyncio.Task] = set()
+        self.calls = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.inputs = 0
+        self.oversized = 0
+
+    async def embed(self, text: str, priority: str = "interactive") -> Vector:
+        """Returns the embedding for `text`, sent together with concurrent callers of the same priority."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queued futures are bound to the loop that created them
+            self._loop = loop
+            self._batches = {}
+        self.calls += 1
+
+        tokens = estimate_tokens(text)
+        if tokens > self.max_input_tokens:
+            self.oversized += 1
+            self.batches += 1
+            self.inputs += 1
+            return (await self._send([text], priority))[0]
+
+        future = loop.create_future()
+        batch = self._batches.setdefault(priority, _Batch())
+        waiters = batch.waiters.get(text)
+        if waiters is not None:
+            self.coalesced += 1
+            waiters.append(future)
+            return await future
+
+        if batch.waiters and batch.tokens + tokens > self.max_tokens:
+            self._flush(priority)
+            batch = self._batches.setdefault(priority, _Batch())
+        batch.waiters[text] = [future]
+        batch.tokens += tokens
+        if len(batch.waiters) >= self.max_inputs:
+            self._flush(priority)
+        elif batch.timer is None:
+            batch.timer = loop.call_later(self.window, self._flush, priority)
+        return await future
+
+    def _flush(self, priority: str) -> None:
+        batch = self._batches.pop(priority, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self.batches += 1
+        self.inputs += len(batch.waiters)
+        # The request runs in its own task so a cancelled waiter does not cancel the batch
+        task = asyncio.ensure_future(self._request(batch.waiters, priority))
+        self._requests.add(task)
+        task.add_done_callback(self._requests.discard)
+
+    async def _request(self, batch: Dict[str, List[asyncio.Future]], priority: str) -> None:
+        try:
+            vectors = await self._send(list(batch), priority)
+        except asyncio.CancelledError:
+            for waiters in batch.values():
+                for future in waiters:
+                    future.cancel()
+            raise
+        except Exception as e:
+            for waiters in batch.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for vector, waiters in zip(vectors, batch.values()):
+            for future in waiters:
+                if not future.done():
+                    future.set_result(vector)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "requests": self.batches,
+            "inputs": self.inputs,
+            "oversized": self.oversized,
+            "mean_batch_size": round(self.inputs / self.batches, 2) if self.batches else 0.0,
+        }
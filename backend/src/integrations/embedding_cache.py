@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, DateTime, Integer, Text, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.database.connection import Base, db_connection
+from src.integrations.rick_and_morty.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# (model, dimensions, sha256 of the normalized text)
+CacheKey = Tuple[str, int, str]
+
+
+class CachedEmbedding(Base):
+    """SQLAlchemy model for the embedding_cache table."""
+
+    __tablename__ = "embedding_cache"
+
+    model = Column(Text, primary_key=True)
+    dimensions = Column(Integer, primary_key=True)  # 0 when the model's default size is used
+    text_hash = Column(Text, primary_key=True)
+    embedding = Column(Vector(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC with whitespace runs collapsed and trimmed, so trivially different texts share an entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed embedding cache.
+
+    Vectors are keyed by embedding model, dimensions and the SHA-256 of the
+    normalized text. The first tier is an in-process LRU holding float32 arrays; the
+    second is the `embedding_cache` table, shared by every worker and kept across
+    restarts. Concurrent misses for one text share a single lookup. Misses are
+    embedded and written to both tiers; database writes happen in the background
+    and failures only cost a future miss. Changing the model or dimensions changes
+    every key; rows for the previous model stay until removed by hand, so workers
+    still on it during a rolling deploy keep their hits.
+    """
+
+    def __init__(self, model: str, dimensions: int, max_entries: int = 2048, persist: bool = True):
+        self.model = model
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries: "OrderedDict[CacheKey, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes: Set[asyncio.Task] = set()
+        self.singleflight = SingleFlight()
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> CacheKey:
+        return (self.model, self.dimensions, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+    async def get_or_embed(self, text: str, embed: Callable[[str], Awaitable[List[float]]]) -> List[float]:
+        """Returns the cached vector for `text`, calling `embed` with the normalized text on a miss."""
+        normalized = normalize_text(text)
+        key = self.key(normalized)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return cached.tolist()
+
+        return await self.singleflight.do(key, lambda: self._resolve(key, normalized, embed))
+
+    async def _resolve(self, key: CacheKey, text: str, embed: Callable[[str], Awaitable[List[float]]]) -> List[float]:
+        if self._persistent():
+            try:
+                stored = await asyncio.to_thread(self._load, key)
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                stored = None
+            if stored is not None:
+                self.database_hits += 1
+                self._remember(key, stored)
+                return stored
+
+        self.misses += 1
+        vector = await embed(text)
+        self._remember(key, vector)
+        if self._persistent():
+            task = asyncio.ensure_future(asyncio.to_thread(self._store, key, vector))
+            self._writes.add(task)
+            task.add_done_callback(self._finish_write)
+        return vector
+
+    def _persistent(self) -> bool:
+        return self.persist and db_connection.SessionLocal is not None
+
+    def _remember(self, key: CacheKey, vector: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = array("f", vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _load(self, key: CacheKey) -> Optional[List[float]]:
+        db = db_connection.SessionLocal()
+        try:
+            stmt = select(CachedEmbedding.embedding).where(
+                CachedEmbedding.model == key[0],
+                CachedEmbedding.dimensions == key[1],
+                CachedEmbedding.text_hash == key[2],
+            )
+            row = db.execute(stmt).scalar()
+            return [float(value) for value in row] if row is not None else None
+        finally:
+            db.close()
+
+    def _store(self, key: CacheKey, vector: List[float]) -> None:
+        db = db_connection.SessionLocal()
+        try:
+            stmt = insert(CachedEmbedding).values(
+                model=key[0], dimensions=key[1], text_hash=key[2], embedding=vector
+            ).on_conflict_do_nothing()
+            db.execute(stmt)
+            db.commit()
+        finally:
+            db.close()
+
+    def _finish_write(self, task: asyncio.Task) -> None:
+        self._writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Embedding cache write failed: {task.exception()}")
+
+    async def flush(self) -> None:
+        """Waits for background database writes."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        # Callers that joined an in-flight lookup were spared an API call too
+        hits = self.memory_hits + self.database_hits + self.singleflight.coalesced
+        lookups = hits + self.misses
+        return {
+            "model": self.model,
+            "dimensions": self.dimensions,
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "database_hits": self.database_hits,
+            "coalesced": self.singleflight.coalesced,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
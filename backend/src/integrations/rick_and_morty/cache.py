@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Tuple
+
+from pydantic_core import from_json, to_json
+
+from src.integrations.rick_and_morty.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its freshness deadlines and approximate size."""
+
+    value: Any
+    size: int
+    fresh_until: float
+    stale_until: float
+
+
+class EntityCache:
+    """
+    Bounded in-process TTL + LRU cache for upstream payloads.
+
+    Keys are tuples whose first element is the TTL kind (e.g. ``("character", 1)`` or
+    ``("page", "characters", 2)``). An entry is fresh until its TTL passes, then stale
+    (still servable while a refresh runs) until the stale window closes.
+    """
+
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        stale_ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        disk: DiskCache | None = None,
+    ):
+        self.ttls = ttls
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.disk = disk
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Tuple, allow_expired: bool = False) -> Tuple[Any, bool] | None:
+        """
+        Returns ``(value, is_stale)`` from memory, or None when the key is missing or fully
+        expired. The disk tier is only consulted by `aget`/`aget_many`.
+
+        With `allow_expired`, entries past the stale window are still returned (as stale)
+        rather than dropped; used while the upstream is known to be down.
+        """
+        found = self._lookup(key, allow_expired)
+        if found is None:
+            with self._lock:
+                self.misses += 1
+        return found
+
+    async def aget(self, key: Tuple, allow_expired: bool = False) -> Tuple[Any, bool] | None:
+        """Like `get`, promoting the entry from the disk tier on a memory miss."""
+        return (await self.aget_many([key], allow_expired)).get(key)
+
+    async def aget_many(self, keys: List[Tuple], allow_expired: bool = False) -> Dict[Tuple, Tuple[Any, bool]]:
+        """
+        Looks up several keys, returning ``{key: (value, is_stale)}`` for the ones found.
+
+        Memory misses are read and decoded from the disk tier in one worker thread, so
+        SQLite never runs on the event loop and the memory lock is not held across it.
+        """
+        found: Dict[Tuple, Tuple[Any, bool]] = {}
+        missing: List[Tuple] = []
+        for key in keys:
+            cached = self._lookup(key, allow_expired)
+            if cached is None:
+                missing.append(key)
+            else:
+                found[key] = cached
+
+        if missing and self.disk is not None:
+            loaded = await asyncio.to_thread(self._load_from_disk, missing)
+            with self._lock:
+                for key, entry in loaded.items():
+                    self._insert(key, entry)
+            for key in loaded:
+                cached = self._lookup(key, allow_expired)
+                if cached is not None:
+                    found[key] = cached
+
+        with self._lock:
+            self.misses += len(keys) - len(found)
+        return found
+
+    def _lookup(self, key: Tuple, allow_expired: bool) -> Tuple[Any, bool] | None:
+        """Serves a key from memory, counting hits and expirations but not misses."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now >= entry.stale_until and not allow_expired:
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self.hits += 1
+                return entry.value, False
+            self.stale_hits += 1
+            return entry.value, True
+
+    def _load_from_disk(self, keys: List[Tuple]) -> Dict[Tuple, CacheEntry]:
+        """Reads and decodes entries from the disk tier, keeping their remaining lifetime."""
+        loaded: Dict[Tuple, CacheEntry] = {}
+        for key, (payload, fresh_until, stale_until) in self.disk.get_many(keys).items():
+            now = time.monotonic()
+            wall_now = time.time()
+            loaded[key] = CacheEntry(
+                value=from_json(payload),
+                size=len(payload),
+                fresh_until=now + fresh_until - wall_now,
+                stale_until=now + stale_until - wall_now,
+            )
+        return loaded
+
+    def set(self, key: Tuple, value: Any) -> None:
+        """Stores a value, evicting least recently used entries beyond the caps."""
+        ttl = self.ttls.get(key[0], self.ttls.get("default", 300))
+        # Encoded once: the length sizes the entry and the bytes go to the disk tier as-is
+        payload = to_json(value, fallback=str)
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+
+        now = time.monotonic()
+        entry = CacheEntry(value=value, size=size, fresh_until=now + ttl, stale_until=now + ttl + self.stale_ttl)
+        with self._lock:
+            self._insert(key, entry)
+        if self.disk is not None:
+            self.disk.set(key, payload, ttl, self.stale_ttl)
+
+    def _insert(self, key: Tuple, entry: CacheEntry) -> None:
+        # Called with the lock held
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate(self, key: Tuple) -> None:
+        """Drops a single entry."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Drops every entry, including the disk tier."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def close(self) -> None:
+        """Flushes and closes the disk tier."""
+        if self.disk is not None:
+            self.disk.close()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/eviction counters and current usage."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
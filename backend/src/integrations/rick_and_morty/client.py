@@ -1,10 +1,15 @@
+import asyncio
 import logging
+import weakref
 from typing import Dict, Any
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
+
+import aiohttp
+from pydantic_core import from_json
 
 from src.core.config import settings
-from src.core.exceptions import ExternalServiceException
+from src.core.exceptions import ExternalServiceException, UpstreamRejectedException
+from src.integrations.rick_and_morty.queries.registry import CompiledQuery, query_registry
+from src.integrations.rick_and_morty.resilience import UpstreamGuard
 
 logger = logging.getLogger(__name__)
 
@@ -14,31 +19,123 @@ class GraphQLClient:
     
     def __init__(self):
         """Initializes the GraphQL client with transport configuration."""
-        transport = RequestsHTTPTransport(
-            url=settings.RICK_MORTY_GRAPHQL_URL,
-            retries=3,
-            timeout=30
+        # Rate limit, adaptive concurrency, circuit breaker and hedging
+        self.guard = UpstreamGuard()
+
+        # Pooled sessions are bound to the event loop that created them, so each loop gets its own
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
         )
-        self.client = Client(transport=transport, fetch_schema_from_transport=False)
-    
-    def execute(self, query: str, variables: Dict[str, Any] = None) -> Dict[str, Any]:
+
+    async def aexecute(
+        self,
+        query: str | CompiledQuery,
+        variables: Dict[str, Any] = None,
+        timeout: float | None = None,
+    ) -> Dict[str, Any]:
         """
-        Executes a GraphQL query against the API.
-        
+        Executes a GraphQL query against the API without blocking the event loop.
+
+        Requests share a pooled keep-alive session, so many calls can be in flight
+        on a single worker.
+
         Args:
-            query: GraphQL query string
+            query: Compiled query, or a query string compiled through the registry
             variables: Query variables dictionary
-            
+            timeout: Optional per-request timeout in seconds (defaults to settings)
+
         Returns:
             Query result as dictionary
-            
+
         Raises:
             ExternalServiceException: If query execution fails
         """
+        compiled = query if isinstance(query, CompiledQuery) else query_registry.get(query)
+        body = compiled.build_body(variables)
         try:
-            gql_query = gql(query)
-            result = self.client.execute(gql_query, variable_values=variables or {})
-            return result
+            return await self.guard.run(lambda: self._apost(body, timeout))
+        except ExternalServiceException:
+            raise
         except Exception as e:
             logger.error(f"GraphQL query execution failed: {e}")
             raise ExternalServiceException(f"Failed to execute GraphQL query: {str(e)}")
+
+    async def _apost(self, body: bytes, timeout: float | None) -> Dict[str, Any]:
+        """Posts a request body on the pooled session, retrying stale connections."""
+        request_timeout = aiohttp.ClientTimeout(
+            total=timeout or settings.RICK_MORTY_REQUEST_TIMEOUT,
+            connect=settings.RICK_MORTY_CONNECT_TIMEOUT,
+        )
+
+        attempts = settings.RICK_MORTY_RETRIES + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                session = self._get_session()
+                async with session.post(
+                    settings.RICK_MORTY_GRAPHQL_URL,
+                    data=body,
+                    timeout=request_timeout,
+                ) as response:
+                    if response.status >= 400:
+                        error_body = await response.text()
+                        message = f"Upstream returned HTTP {response.status}: {error_body[:200]}"
+                        # Only server errors and throttling say anything about upstream health
+                        if response.status >= 500 or response.status == 429:
+                            raise ExternalServiceException(message)
+                        raise UpstreamRejectedException(message)
+                    # Decode the raw body in one pass rather than through an intermediate str
+                    result = from_json(await response.read())
+
+                if result.get("errors"):
+                    raise UpstreamRejectedException(f"GraphQL errors: {result['errors']}")
+                return result.get("data") or {}
+            except aiohttp.ClientConnectionError as e:
+                # Stale keep-alive sockets surface as connection errors; retry on a fresh one
+                if attempt < attempts:
+                    logger.warning(f"GraphQL connection error (attempt {attempt}/{attempts}): {e}")
+                    continue
+                logger.error(f"GraphQL query execution failed: {e}")
+                raise ExternalServiceException(f"Failed to execute GraphQL query: {str(e)}")
+            except ExternalServiceException as e:
+                logger.error(f"GraphQL query execution failed: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"GraphQL query execution failed: {e}")
+                raise ExternalServiceException(f"Failed to execute GraphQL query: {str(e)}")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled session for the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.RICK_MORTY_POOL_SIZE,
+                limit_per_host=settings.RICK_MORTY_POOL_SIZE,
+                keepalive_timeout=settings.RICK_MORTY_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+            )
+            self._sessions[loop] = session
+            logger.info(f"Opened pooled GraphQL session (pool size: {settings.RICK_MORTY_POOL_SIZE})")
+        return session
+
+    async def aclose(self) -> None:
+        """Closes the pooled sessions of every event loop and their keep-alive connections."""
+        current = asyncio.get_running_loop()
+        sessions = list(self._sessions.items())
+        self._sessions.clear()
+        for loop, session in sessions:
+            if session.closed:
+                continue
+            if loop is current:
+                await session.close()
+            elif loop.is_running():
+                # Its sockets belong to that loop, so the close has to run there
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+            else:
+                # The loop is gone and its transports with it; mark the session closed
+                session.detach()
+            logger.info("Closed pooled GraphQL session")
@@ -0,0 +1,273 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_key(key: Tuple) -> str:
+    """Stable text form of a cache key; nested tuples become JSON arrays."""
+    return json.dumps(key, separators=(",", ":"), default=str)
+
+
+class DiskCache:
+    """
+    SQLite-backed second tier for `EntityCache` that survives restarts.
+
+    Expiry uses wall-clock deadlines so entries keep their remaining lifetime across
+    processes. The database runs in WAL mode, so workers on one host can share a
+    file; read-only workers open it with ``mode=ro`` and never write. Writes are
+    queued and flushed in batches by a background thread to keep SQLite off the
+    request path. Lookups use one read connection per calling thread, so WAL readers
+    never wait on the writer connection held by flushes and compaction. Connections
+    are opened lazily on first use.
+    """
+
+    COMPACT_EVERY_WRITES = 1000
+    FLUSH_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, path: Path, max_bytes: int, read_only: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.compactions = 0
+        self.disabled = False
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._pending: Dict[str, Tuple[bytes, int, float, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        # Compact on the first flush after startup
+        self._writes_since_compaction = self.COMPACT_EVERY_WRITES
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Opens the database on first use; failures disable the tier instead of raising."""
+        if self._conn is not None or self.disabled:
+            return self._conn
+        if self.read_only and not self.path.exists():
+            # The writing worker has not created it yet; try again on the next lookup
+            return None
+        try:
+            if self.read_only:
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS entries (
+                        key TEXT PRIMARY KEY,
+                        value BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        fresh_until REAL NOT NULL,
+                        stale_until REAL NOT NULL,
+                        written_at REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_written_at ON entries (written_at)")
+                conn.commit()
+            conn.execute("PRAGMA busy_timeout=2000")
+            self._conn = conn
+            logger.info(f"Opened Rick & Morty disk cache at {self.path}{' (read-only)' if self.read_only else ''}")
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache unavailable at {self.path}, continuing without it: {e}")
+            self.disabled = True
+        return self._conn
+
+    def _reader(self) -> sqlite3.Connection | None:
+        """This thread's read connection, opened once the database exists."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None or self.disabled:
+            return conn
+        if not self.read_only and self._conn is None:
+            # The writer creates the schema; later lookups skip its lock entirely
+            with self._lock:
+                if self._connect() is None:
+                    return None
+        elif self.read_only and not self.path.exists():
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout=2000")
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read connection failed: {e}")
+            return None
+        self._local.conn = conn
+        with self._readers_lock:
+            self._readers.append(conn)
+        return conn
+
+    def get(self, key: Tuple) -> Tuple[bytes, float, float] | None:
+        """Returns ``(payload, fresh_until, stale_until)`` with wall-clock deadlines, or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[Tuple]) -> Dict[Tuple, Tuple[bytes, float, float]]:
+        """Looks up several keys at once; blocking, so async callers run it in a worker thread."""
+        found: Dict[Tuple, Tuple[bytes, float, float]] = {}
+        encoded: Dict[str, Tuple] = {}
+        with self._pending_lock:
+            for key in keys:
+                encoded_key = _encode_key(key)
+                pending = self._pending.get(encoded_key)
+                if pending is None:
+                    encoded[encoded_key] = key
+                else:
+                    value, _, fresh_until, stale_until = pending
+                    found[key] = (value, fresh_until, stale_until)
+        if not encoded:
+            return found
+
+        conn = self._reader()
+        if conn is None:
+            return found
+        rows = []
+        try:
+            names = list(encoded)
+            # Chunked to stay under SQLite's bound-parameter limit
+            for i in range(0, len(names), 500):
+                chunk = names[i:i + 500]
+                rows.extend(conn.execute(
+                    f"SELECT key, value, fresh_until, stale_until FROM entries WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall())
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return found
+
+        now = time.time()
+        for encoded_key, value, fresh_until, stale_until in rows:
+            if stale_until > now:
+                found[encoded[encoded_key]] = (value, fresh_until, stale_until)
+        hits = sum(1 for key in encoded.values() if key in found)
+        self.hits += hits
+        self.misses += len(encoded) - hits
+        return found
+
+    def set(self, key: Tuple, payload: bytes, ttl: float, stale_ttl: float) -> None:
+        """Queues an already-encoded JSON payload for the next batched write."""
+        if self.read_only or self.disabled:
+            return
+        now = time.time()
+        with self._pending_lock:
+            self._pending[_encode_key(key)] = (payload, len(payload), now + ttl, now + ttl + stale_ttl)
+        self._ensure_flusher()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="rm-disk-cache", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.FLUSH_INTERVAL_SECONDS)
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes queued entries in one transaction and compacts every so often."""
+        with self._pending_lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO entries (key, value, size, fresh_until, stale_until, written_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [(key, value, size, fresh, stale, now) for key, (value, size, fresh, stale) in batch.items()],
+                    )
+                self.writes += len(batch)
+                self._writes_since_compaction += len(batch)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache write of {len(batch)} entries failed: {e}")
+                return
+
+        if self._writes_since_compaction >= self.COMPACT_EVERY_WRITES:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drops expired entries, then the oldest writes until the file fits its size cap."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None or self.read_only:
+                return
+            try:
+                with conn:
+                    conn.execute("DELETE FROM entries WHERE stale_until <= ?", (time.time(),))
+                    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                    if total > self.max_bytes:
+                        # Trim to 90% so compaction does not run again on the next write
+                        excess = total - int(self.max_bytes * 0.9)
+                        conn.execute(
+                            """
+                            DELETE FROM entries WHERE key IN (
+                                SELECT key FROM (
+                                    SELECT key, size, SUM(size) OVER (ORDER BY written_at, key) AS running
+                                    FROM entries
+                                ) WHERE running - size < ?
+                            )
+                            """,
+                            (excess,),
+                        )
+                conn.execute("PRAGMA incremental_vacuum")
+                self.compactions += 1
+                self._writes_since_compaction = 0
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache compaction failed: {e}")
+
+    def clear(self) -> None:
+        """Drops every entry, queued or stored."""
+        with self._pending_lock:
+            self._pending.clear()
+        with self._lock:
+            conn = self._connect()
+            if conn is not None and not self.read_only:
+                with conn:
+                    conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Flushes queued writes and closes the database."""
+        self.flush()
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+            self._local = threading.local()
+        for conn in readers:
+            conn.close()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss/write counters and the on-disk footprint."""
+        size = self.path.stat().st_size if self.path.exists() else 0
+        return {
+            "path": str(self.path),
+            "read_only": self.read_only,
+            "disabled": self.disabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "pending": len(self._pending),
+            "compactions": self.compactions,
+            "file_bytes": size,
+        }
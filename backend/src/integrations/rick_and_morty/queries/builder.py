@@ -0,0 +1,65 @@
+import hashlib
+import logging
+from typing import Dict, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# A selection is an ordered tuple of field names and (field name, nested selection) pairs
+Selection = Tuple[Union[str, Tuple[str, "Selection"]], ...]
+
+
+def select_fields(*names: str, **nested: Selection) -> Selection:
+    """
+    Builds a hashable field selection.
+
+    Example: ``select_fields("name", "status", origin=select_fields("name"))``
+    selects ``name status origin { name }``.
+    """
+    return tuple(names) + tuple(nested.items())
+
+
+def render_selection(selection: Selection) -> str:
+    """Renders a selection as a GraphQL selection set body."""
+    parts = []
+    for field in selection:
+        if isinstance(field, str):
+            parts.append(field)
+        else:
+            name, nested = field
+            parts.append(f"{name} {{ {render_selection(nested)} }}")
+    return " ".join(parts)
+
+
+class QueryBuilder:
+    """Generates query documents for a root field and field selection, once per combination."""
+
+    def __init__(self):
+        self._sources: Dict[Tuple, str] = {}
+
+    def build(self, root_field: str, selection: Selection, variables: Tuple[Tuple[str, str], ...] = (("id", "ID!"),)) -> str:
+        """
+        Returns the query source selecting `selection` under `root_field`.
+
+        `variables` are ``(name, type)`` pairs passed through as arguments of the same
+        name. The source is stable for a given input, so the registry compiles and
+        validates it only on first use.
+        """
+        key = (root_field, selection, variables)
+        source = self._sources.get(key)
+        if source is not None:
+            return source
+
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:8]
+        operation_name = f"{root_field[0].upper()}{root_field[1:]}Projection_{digest}"
+        definitions = ", ".join(f"${name}: {type_}" for name, type_ in variables)
+        arguments = ", ".join(f"{name}: ${name}" for name, _ in variables)
+        signature = f"{operation_name}({definitions})" if variables else operation_name
+        field = f"{root_field}({arguments})" if variables else root_field
+        source = f"query {signature} {{ {field} {{ {render_selection(selection)} }} }}"
+        self._sources[key] = source
+        logger.debug(f"Built projected query {operation_name}")
+        return source
+
+
+# Singleton instance
+query_builder = QueryBuilder()
@@ -49,3 +49,66 @@ class CharacterQueries:
             }
         }
     """
+
+    GET_CHARACTERS_SYNC_PAGE = """
+        query GetCharactersSyncPage($page: Int!) {
+            characters(page: $page) {
+                info {
+                    count
+                    pages
+                    next
+                    prev
+                }
+                results {
+                    id
+                    name
+                    status
+                    species
+                    type
+                    gender
+                    image
+                    created
+                    origin {
+                        id
+                        name
+                    }
+                    location {
+                        id
+                        name
+                    }
+                    episode {
+                        id
+                    }
+                }
+            }
+        }
+    """
+
+    GET_CHARACTERS_BY_IDS = """
+        query GetCharactersByIds($ids: [ID!]!) {
+            charactersByIds(ids: $ids) {
+                id
+                name
+                status
+                species
+                type
+                gender
+                origin {
+                    name
+                    type
+                    dimension
+                }
+                location {
+                    name
+                    type
+                    dimension
+                }
+                image
+                episode {
+                    name
+                    air_date
+                }
+                created
+            }
+        }
+    """
@@ -39,4 +39,41 @@ class EpisodeQueries:
         }
     """
 
+    GET_EPISODES_SYNC_PAGE = """
+        query GetEpisodesSyncPage($page: Int!) {
+            episodes(page: $page) {
+                info {
+                    count
+                    pages
+                    next
+                    prev
+                }
+                results {
+                    id
+                    name
+                    air_date
+                    episode
+                    created
+                }
+            }
+        }
+    """
 
+    GET_EPISODES_BY_IDS = """
+        query GetEpisodesByIds($ids: [ID!]!) {
+            episodesByIds(ids: $ids) {
+                id
+                name
+                air_date
+                episode
+                characters {
+                    id
+                    name
+                    status
+                    species
+                    image
+                }
+                created
+            }
+        }
+    """
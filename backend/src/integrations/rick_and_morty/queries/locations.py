@@ -63,3 +63,41 @@ class LocationQueries:
             }
         }
     """
+
+    GET_LOCATIONS_SYNC_PAGE = """
+        query GetLocationsSyncPage($page: Int!) {
+            locations(page: $page) {
+                info {
+                    count
+                    pages
+                    next
+                    prev
+                }
+                results {
+                    id
+                    name
+                    type
+                    dimension
+                    created
+                }
+            }
+        }
+    """
+
+    GET_LOCATIONS_BY_IDS = """
+        query GetLocationsByIds($ids: [ID!]!) {
+            locationsByIds(ids: $ids) {
+                id
+                name
+                type
+                dimension
+                residents {
+                    id
+                    name
+                    status
+                    species
+                    image
+                }
+            }
+        }
+    """
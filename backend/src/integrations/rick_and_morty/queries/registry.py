@@ -0,0 +1,174 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Iterable, Tuple
+
+from graphql import (
+    ArgumentNode,
+    DocumentNode,
+    FieldNode,
+    GraphQLSchema,
+    IntValueNode,
+    NameNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    build_schema,
+    parse,
+    print_ast,
+    validate,
+)
+from graphql.utilities import strip_ignored_characters
+
+from src.core.config import settings
+from src.integrations.rick_and_morty.queries.characters import CharacterQueries
+from src.integrations.rick_and_morty.queries.episodes import EpisodeQueries
+from src.integrations.rick_and_morty.queries.locations import LocationQueries
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = Path(__file__).with_name("schema.graphql")
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """A query parsed once, with its request body pre-serialized up to the variables."""
+
+    name: str
+    document: DocumentNode
+    operation_name: str | None
+    body_prefix: bytes
+
+    def build_body(self, variables: Dict[str, Any] | None = None) -> bytes:
+        """Returns the JSON request body; only the variables are serialized per call."""
+        return self.body_prefix + json.dumps(variables or {}, separators=(",", ":")).encode() + b"}"
+
+
+def page_alias(page: int) -> str:
+    """Response key of a page inside a multi-page document."""
+    return f"p{page}"
+
+
+class QueryRegistry:
+    """Parses GraphQL query documents once and hands out compiled queries."""
+
+    def __init__(self, schema: GraphQLSchema | None = None):
+        self.schema = schema
+        self._queries: Dict[str, CompiledQuery] = {}
+        self._paged: Dict[Tuple[str, Tuple[int, ...]], CompiledQuery] = {}
+
+    def register(self, source: str, name: str | None = None) -> CompiledQuery:
+        """Parses, validates and caches a query document keyed by its source string."""
+        compiled = self._queries.get(source)
+        if compiled is not None:
+            return compiled
+
+        document = parse(source)
+        if self.schema is not None:
+            errors = validate(self.schema, document)
+            if errors:
+                raise ValueError(f"Invalid GraphQL query {name or 'document'}: {'; '.join(e.message for e in errors)}")
+
+        operation_name = next(
+            (
+                definition.name.value
+                for definition in document.definitions
+                if isinstance(definition, OperationDefinitionNode) and definition.name
+            ),
+            None,
+        )
+        query_json = json.dumps(strip_ignored_characters(source))
+        operation_json = json.dumps(operation_name)
+        body_prefix = f'{{"query":{query_json},"operationName":{operation_json},"variables":'.encode()
+
+        compiled = CompiledQuery(
+            name=name or operation_name or "anonymous",
+            document=document,
+            operation_name=operation_name,
+            body_prefix=body_prefix,
+        )
+        self._queries[source] = compiled
+        return compiled
+
+    def register_class(self, queries_class: type) -> None:
+        """Registers every query string constant defined on a queries class."""
+        for attr, value in vars(queries_class).items():
+            if attr.isupper() and isinstance(value, str):
+                self.register(value, name=f"{queries_class.__name__}.{attr}")
+
+    def get(self, source: str) -> CompiledQuery:
+        """Returns the compiled query for a source string, compiling it on first use."""
+        compiled = self._queries.get(source)
+        if compiled is None:
+            compiled = self.register(source)
+        return compiled
+
+    def compile_pages(self, source: str, pages: Iterable[int]) -> CompiledQuery:
+        """
+        Rewrites a single-page query into one document fetching several pages.
+
+        The root field of `source` must take a `page` argument; it is repeated once per
+        page under the alias ``p<page>`` with the page inlined, so the response holds
+        each page under its alias. Other variables are kept as-is.
+        """
+        pages = tuple(pages)
+        compiled = self._paged.get((source, pages))
+        if compiled is not None:
+            return compiled
+
+        operation = next(
+            definition for definition in parse(source).definitions if isinstance(definition, OperationDefinitionNode)
+        )
+        root = operation.selection_set.selections[0]
+        if not isinstance(root, FieldNode) or not any(arg.name.value == "page" for arg in root.arguments):
+            raise ValueError("Multi-page queries need a root field with a `page` argument")
+
+        fields = tuple(
+            FieldNode(
+                alias=NameNode(value=page_alias(page)),
+                name=root.name,
+                arguments=tuple(
+                    ArgumentNode(name=arg.name, value=IntValueNode(value=str(page))) if arg.name.value == "page" else arg
+                    for arg in root.arguments
+                ),
+                directives=root.directives,
+                selection_set=root.selection_set,
+            )
+            for page in pages
+        )
+        operation_name = f"{operation.name.value if operation.name else root.name.value}Bulk"
+        document = DocumentNode(
+            definitions=(
+                OperationDefinitionNode(
+                    operation=operation.operation,
+                    name=NameNode(value=operation_name),
+                    variable_definitions=tuple(
+                        definition
+                        for definition in operation.variable_definitions
+                        if definition.variable.name.value != "page"
+                    ),
+                    directives=operation.directives,
+                    selection_set=SelectionSetNode(selections=fields),
+                ),
+            )
+        )
+        compiled = self.register(print_ast(document), name=operation_name)
+        self._paged[(source, pages)] = compiled
+        return compiled
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+
+def _load_schema() -> GraphQLSchema | None:
+    """Loads the bundled upstream schema when query validation is enabled."""
+    if not settings.RICK_MORTY_VALIDATE_QUERIES:
+        return None
+    return build_schema(SCHEMA_PATH.read_text())
+
+
+# Singleton instance; static query documents are compiled at import (startup) time
+query_registry = QueryRegistry(schema=_load_schema())
+for _queries_class in (CharacterQueries, LocationQueries, EpisodeQueries):
+    query_registry.register_class(_queries_class)
+logger.info(f"Compiled {len(query_registry)} Rick & Morty query documents")
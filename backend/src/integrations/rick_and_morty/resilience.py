@@ -0,0 +1,401 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from src.core.config import settings
+from src.core.exceptions import UpstreamRejectedException, UpstreamUnavailableException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit shared by tasks on every event loop.
+
+    The limit grows by roughly one slot per limit's worth of fast successes and is cut
+    multiplicatively on errors or when latency exceeds the target, at most once per
+    target interval so one slow burst does not collapse it to the floor.
+    """
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int, latency_target: float, backoff: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self.rejected = 0
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._async_waiters: deque[asyncio.Future] = deque()
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def try_acquire(self) -> bool:
+        """Takes a slot only if one is free right now."""
+        with self._lock:
+            if self._has_capacity():
+                self.in_flight += 1
+                return True
+            return False
+
+    async def acquire(self, timeout: float) -> None:
+        """Waits up to `timeout` seconds for a slot, then rejects."""
+        with self._lock:
+            if self._has_capacity() and not self._async_waiters:
+                self.in_flight += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._async_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except BaseException as e:
+            with self._lock:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+                owns_slot = waiter.done() and not waiter.cancelled()
+                # A hand-off still in flight is given back by `_resolve`
+                waiter.cancel()
+            if owns_slot:
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject()
+            raise
+
+    def _reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+        raise UpstreamUnavailableException("Rick & Morty API concurrency limit reached")
+
+    def release(self) -> None:
+        """Returns a slot and hands free capacity to waiters."""
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Adjusts the limit from the outcome of a finished call."""
+        with self._lock:
+            now = time.monotonic()
+            if not ok or latency > self.latency_target:
+                if now - self._last_decrease >= self.latency_target:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif self.limit < self.max_limit:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                self.increases += 1
+            self._wake()
+
+    def _wake(self) -> None:
+        # Called with the lock held
+        while self._async_waiters and self._has_capacity():
+            waiter = self._async_waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.get_loop().call_soon_threadsafe(self._resolve, waiter)
+
+    def _resolve(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            # Waiter gave up between the hand-off and this callback
+            self.release()
+        else:
+            waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self._async_waiters),
+            "rejected": self.rejected,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+class TokenBucket:
+    """Smooths the request rate; callers reserve a token and sleep until it is due."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _reserve(self) -> float:
+        """Takes a token, possibly borrowed from the future, and returns the wait in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(float(self.burst), self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            if wait:
+                self.throttled += 1
+                self.throttled_seconds += wait
+            return wait
+
+    async def acquire(self) -> None:
+        if self.enabled:
+            wait = self._reserve()
+            if wait:
+                await asyncio.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+class CircuitBreaker:
+    """
+    Opens when the failure rate over a rolling window crosses a threshold.
+
+    While open, calls are rejected immediately; after the cool-down a limited number of
+    probe calls are let through (half-open) and the first outcome decides whether the
+    circuit closes again or re-opens.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_rate: float, min_calls: int, window: float, open_seconds: float, half_open_calls: int = 1):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = self.CLOSED
+        self.opened = 0
+        self.rejected = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are being short-circuited (probes are still let through when half-open)."""
+        with self._lock:
+            return self._current_state(time.monotonic()) == self.OPEN
+
+    def _current_state(self, now: float) -> str:
+        # Re-arm probes each cool-down so a probe that never reported back cannot wedge the breaker
+        if self.state != self.CLOSED and now - self._opened_at >= self.open_seconds:
+            self.state = self.HALF_OPEN
+            self._opened_at = now
+            self._probes = 0
+        return self.state
+
+    def allow(self) -> None:
+        """Raises when the call must not reach the upstream."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            self.rejected += 1
+        raise UpstreamUnavailableException("Rick & Morty API circuit breaker is open")
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == self.HALF_OPEN:
+                if ok:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info("Rick & Morty circuit breaker closed")
+                else:
+                    self._trip(now)
+                return
+            if state == self.OPEN:
+                return
+
+            self._outcomes.append((now, ok))
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._outcomes.popleft()
+            if len(self._outcomes) >= self.min_calls and self._failure_ratio() >= self.failure_rate:
+                self._trip(now)
+
+    def _failure_ratio(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def _trip(self, now: float) -> None:
+        self.state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened += 1
+        logger.warning(f"Rick & Morty circuit breaker opened for {self.open_seconds}s")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return {
+                "state": state,
+                "failure_rate": round(self._failure_ratio(), 4),
+                "window_calls": len(self._outcomes),
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+class LatencyTracker:
+    """Keeps recent successful call latencies to derive the hedging delay."""
+
+    def __init__(self, size: int = 512):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def quantile(self, q: float) -> float | None:
+        with self._lock:
+            if len(self._samples) < 20:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class UpstreamGuard:
+    """
+    Wraps upstream calls with a rate limit, an adaptive concurrency limit, a circuit
+    breaker and hedging of calls slower than the recent latency quantile.
+    """
+
+    def __init__(self):
+        self.bucket = TokenBucket(settings.RICK_MORTY_RATE_LIMIT, settings.RICK_MORTY_RATE_BURST)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=settings.RICK_MORTY_CONCURRENCY_INITIAL,
+            min_limit=settings.RICK_MORTY_CONCURRENCY_MIN,
+            max_limit=settings.RICK_MORTY_CONCURRENCY_MAX,
+            latency_target=settings.RICK_MORTY_LATENCY_TARGET,
+        )
+        self.breaker = CircuitBreaker(
+            failure_rate=settings.RICK_MORTY_BREAKER_FAILURE_RATE,
+            min_calls=settings.RICK_MORTY_BREAKER_MIN_CALLS,
+            window=settings.RICK_MORTY_BREAKER_WINDOW,
+            open_seconds=settings.RICK_MORTY_BREAKER_OPEN_SECONDS,
+        )
+        self.latencies = LatencyTracker()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def _hedge_delay(self) -> float | None:
+        """Delay before a hedge is sent, or None when hedging is off or over budget."""
+        if not settings.RICK_MORTY_HEDGE_ENABLED:
+            return None
+        if self.hedged >= settings.RICK_MORTY_HEDGE_BUDGET * max(self.calls, 1):
+            return None
+        quantile = self.latencies.quantile(settings.RICK_MORTY_HEDGE_QUANTILE)
+        if quantile is None:
+            return None
+        return max(quantile, settings.RICK_MORTY_HEDGE_MIN_DELAY)
+
+    def _record(self, started: float, ok: bool) -> None:
+        latency = time.monotonic() - started
+        self.limiter.record(latency, ok)
+        self.breaker.record(ok)
+        if ok:
+            self.latencies.observe(latency)
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]], acquired: bool = False) -> T:
+        """One limited, measured call to the upstream."""
+        if not acquired:
+            await self.bucket.acquire()
+            await self.limiter.acquire(settings.RICK_MORTY_LIMITER_QUEUE_TIMEOUT)
+        started = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            raise
+        except UpstreamRejectedException:
+            # The upstream answered; a rejected request says nothing about its health
+            self._record(started, ok=True)
+            raise
+        except Exception:
+            self._record(started, ok=False)
+            raise
+        else:
+            self._record(started, ok=True)
+            return result
+        finally:
+            self.limiter.release()
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Runs an async upstream call under every guard."""
+        self.breaker.allow()
+        self.calls += 1
+        primary = asyncio.ensure_future(self._attempt(call))
+        delay = self._hedge_delay()
+        if delay is None:
+            return await primary
+
+        hedge: asyncio.Future | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            # Only hedge with spare capacity so hedges never queue behind real traffic
+            if done or not self.limiter.try_acquire():
+                return await primary
+
+            self.hedged += 1
+            hedge = asyncio.ensure_future(self._attempt(call, acquired=True))
+            pending = {primary, hedge}
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also reached when the caller is cancelled while waiting
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the state of every guard."""
+        return {
+            "calls": self.calls,
+            "concurrency": self.limiter.stats(),
+            "rate_limit": self.bucket.stats(),
+            "circuit_breaker": self.breaker.stats(),
+            "hedging": {
+                "enabled": settings.RICK_MORTY_HEDGE_ENABLED,
+                "delay": self._hedge_delay(),
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+            },
+        }
@@ -1,11 +1,21 @@
+import asyncio
 import logging
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from src.core.config import settings
 
 from src.core.exceptions import ExternalServiceException
+from src.core.serialization import trusted_models
+from src.integrations.rick_and_morty.cache import EntityCache
 from src.integrations.rick_and_morty.client import GraphQLClient
+from src.integrations.rick_and_morty.disk_cache import DiskCache
 from src.integrations.rick_and_morty.queries.locations import LocationQueries
 from src.integrations.rick_and_morty.queries.characters import CharacterQueries
 from src.integrations.rick_and_morty.queries.episodes import EpisodeQueries
+from src.integrations.rick_and_morty.queries.builder import Selection, query_builder
+from src.integrations.rick_and_morty.queries.registry import page_alias, query_registry
+from src.integrations.rick_and_morty.singleflight import SingleFlight, request_key
 
 logger = logging.getLogger(__name__)
 
@@ -14,106 +24,386 @@ class RickAndMortyService:
     """Provides methods to fetch locations, characters and episodes from Rick & Morty API."""
     
     def __init__(self):
-        """Initializes the service with a GraphQL client."""
+        """Initializes the service with a GraphQL client and the compiled query registry."""
         self.client = GraphQLClient()
-    
-    def fetch_locations_page(self, page: int = 1) -> Dict[str, Any]:
-        """Fetches a paginated list of locations with basic information."""
-        try:
-            result = self.client.execute(
-                LocationQueries.GET_LOCATIONS_PAGE,
-                variables={"page": page}
+        self.queries = query_registry
+        self.query_builder = query_builder
+        self.singleflight = SingleFlight()
+        self.cache = (
+            EntityCache(
+                ttls=settings.RICK_MORTY_CACHE_TTLS,
+                stale_ttl=settings.RICK_MORTY_CACHE_STALE_TTL,
+                max_entries=settings.RICK_MORTY_CACHE_MAX_ENTRIES,
+                max_bytes=settings.RICK_MORTY_CACHE_MAX_BYTES,
+                disk=(
+                    DiskCache(
+                        path=Path(settings.RICK_MORTY_DISK_CACHE_DIR) / "responses.sqlite3",
+                        max_bytes=settings.RICK_MORTY_DISK_CACHE_MAX_BYTES,
+                        read_only=settings.RICK_MORTY_DISK_CACHE_READ_ONLY,
+                    )
+                    if settings.RICK_MORTY_DISK_CACHE_ENABLED
+                    else None
+                ),
             )
-            locations_data = result['locations']
-            logger.info(f"Fetched page {page}: {len(locations_data['results'])} locations")
-            return locations_data
-        except Exception as e:
-            logger.error(f"Error fetching locations page {page}: {e}")
-            raise ExternalServiceException(f"Failed to fetch locations: {str(e)}")
-    
-    def fetch_location_by_id(self, location_id: int) -> Dict[str, Any]:
-        """Fetches a single location by ID including all resident characters."""
+            if settings.RICK_MORTY_CACHE_ENABLED
+            else None
+        )
+        self.cache_refreshes = 0
+        self._refreshing: set[Tuple] = set()
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    async def _afetch(
+        self,
+        query: str,
+        variables: Dict[str, Any],
+        root_key: str,
+        description: str,
+        cache_key: Tuple | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes a query and returns the data under `root_key`, through the cache when
+        `cache_key` is given. Stale entries are served while refreshed in the background.
+        """
+        if cache_key is not None and self.cache is not None:
+            cached = await self.cache.aget(cache_key, allow_expired=self._upstream_down())
+            if cached is not None:
+                value, stale = cached
+                if stale and not self._upstream_down():
+                    self._refresh_in_background(query, variables, root_key, description, cache_key)
+                return value
+
+        data = await self._afetch_upstream(query, variables, root_key, description)
+        if cache_key is not None and self.cache is not None:
+            self.cache.set(cache_key, data)
+        return data
+
+    def _upstream_down(self) -> bool:
+        """Whether the circuit breaker is open, so cached data is served regardless of age."""
+        return self.client.guard.breaker.is_open
+
+    async def _afetch_upstream(self, query: str, variables: Dict[str, Any], root_key: str, description: str) -> Dict[str, Any]:
+        """Executes a query against the upstream on the pooled transport, coalescing identical concurrent calls."""
         try:
-            result = self.client.execute(
-                LocationQueries.GET_LOCATION_BY_ID,
-                variables={"id": str(location_id)}
+            compiled = self.queries.get(query)
+            result = await self.singleflight.do(
+                request_key(compiled, variables),
+                lambda: self.client.aexecute(compiled, variables=variables),
             )
-            location_data = result['location']
-            logger.info(f"Fetched location: {location_data['name']}")
-            return location_data
+            return self._extract(result, root_key, description)
         except Exception as e:
-            logger.error(f"Error fetching location {location_id}: {e}")
-            raise ExternalServiceException(f"Failed to fetch location: {str(e)}")
-    
-    def fetch_locations_with_residents_page(self, page: int = 1) -> Dict[str, Any]:
-        """Fetches a paginated list of locations with their resident characters."""
+            logger.error(f"Error fetching {description}: {e}")
+            raise ExternalServiceException(f"Failed to fetch {description}: {str(e)}")
+
+    def _refresh_in_background(self, query: str, variables: Dict[str, Any], root_key: str, description: str, cache_key: Tuple) -> None:
+        """Schedules one refresh task per stale key; failures keep the stale entry."""
+        if cache_key in self._refreshing:
+            return
+        self._refreshing.add(cache_key)
+
+        async def refresh():
+            try:
+                data = await self._afetch_upstream(query, variables, root_key, description)
+                self.cache.set(cache_key, data)
+                self.cache_refreshes += 1
+            except Exception as e:
+                logger.warning(f"Background refresh of {description} failed, serving stale: {e}")
+            finally:
+                self._refreshing.discard(cache_key)
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _split_cached(self, kind: str, ids: List[int]) -> Tuple[Dict[int, Any], Dict[int, Any], List[int]]:
+        """Splits IDs into fresh cached entities, stale cached entities and IDs to fetch."""
+        fresh: Dict[int, Any] = {}
+        stale: Dict[int, Any] = {}
+        missing: List[int] = []
+        upstream_down = self._upstream_down()
+        cached = {}
+        if self.cache is not None:
+            cached = await self.cache.aget_many([(kind, entity_id) for entity_id in ids], allow_expired=upstream_down)
+        for entity_id in ids:
+            entry = cached.get((kind, entity_id))
+            if entry is None:
+                missing.append(entity_id)
+                continue
+            value, is_stale = entry
+            if is_stale and not upstream_down:
+                stale[entity_id] = value
+                missing.append(entity_id)
+            else:
+                fresh[entity_id] = value
+        return fresh, stale, missing
+
+    def _chunks(self, ids: List[int]) -> List[List[int]]:
+        """Splits an ID list into batches no larger than the configured batch size."""
+        size = max(1, settings.RICK_MORTY_BATCH_SIZE)
+        return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+    def _store_batch(self, kind: str, entities: List[Dict[str, Any]], found: Dict[int, Any]) -> None:
+        """Caches fetched entities individually so single-ID lookups can reuse them."""
+        for entity in entities:
+            if entity is None:
+                continue
+            entity_id = int(entity["id"])
+            found[entity_id] = entity
+            if self.cache is not None:
+                self.cache.set((kind, entity_id), entity)
+
+    def _serve_stale_batch(self, chunk: List[int], stale: Dict[int, Any], found: Dict[int, Any], error: Exception) -> None:
+        """Falls back to stale entries for a failed batch, re-raising when any ID has none."""
+        if not all(entity_id in stale for entity_id in chunk):
+            raise error
+        logger.warning(f"Batch refresh of {len(chunk)} entities failed, serving stale: {error}")
+        found.update({entity_id: stale[entity_id] for entity_id in chunk})
+
+    async def _afetch_many(self, query: str, ids: Iterable[int], root_key: str, kind: str) -> List[Dict[str, Any]]:
+        """Fetches entities by ID in concurrent chunks, skipping fresh cache hits; returns them in input order."""
+        ordered = list(dict.fromkeys(int(entity_id) for entity_id in ids))
+        found, stale, missing = await self._split_cached(kind, ordered)
+        chunks = self._chunks(missing)
+        results = await asyncio.gather(
+            *(
+                self._afetch_upstream(query, {"ids": [str(i) for i in chunk]}, root_key, f"{len(chunk)} {root_key}")
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        for chunk, entities in zip(chunks, results):
+            if isinstance(entities, ExternalServiceException):
+                self._serve_stale_batch(chunk, stale, found, entities)
+            elif isinstance(entities, BaseException):
+                raise entities
+            else:
+                self._store_batch(kind, entities, found)
+        return [found[entity_id] for entity_id in ordered if entity_id in found]
+
+    def _page_groups(self, pages: Iterable[int]) -> List[List[int]]:
+        """Splits page numbers into groups that each fit in one aliased document."""
+        pages = list(pages)
+        budget = max(1, settings.RICK_MORTY_BULK_PAGE_BUDGET)
+        return [pages[i:i + budget] for i in range(0, len(pages), budget)]
+
+    def _extract_pages(self, result: Dict[str, Any], pages: List[int], description: str) -> List[Dict[str, Any]]:
+        """Pulls each aliased page out of a multi-page result."""
+        data = []
+        for page in pages:
+            page_data = result.get(page_alias(page))
+            if page_data is None:
+                raise ExternalServiceException(f"No data returned for {description} page {page}")
+            data.append(page_data)
+        logger.info(f"Fetched {description} pages {pages[0]}-{pages[-1]} in one request")
+        return data
+
+    def _cache_pages(self, page_kind: Optional[str], pages: List[int], data: List[Dict[str, Any]]) -> None:
+        """Stores bulk-fetched pages under the keys used by the single-page fetchers."""
+        if page_kind is None or self.cache is None:
+            return
+        for page, page_data in zip(pages, data):
+            self.cache.set(("page", page_kind, page), page_data)
+
+    async def _afetch_page_group(self, query: str, pages: List[int], description: str, page_kind: Optional[str]) -> List[Dict[str, Any]]:
+        """Fetches a group of pages with one aliased request."""
         try:
-            result = self.client.execute(
-                LocationQueries.GET_LOCATIONS_WITH_RESIDENTS_PAGE,
-                variables={"page": page}
-            )
-            locations_data = result['locations']
-            logger.info(f"Fetched page {page}: {len(locations_data['results'])} locations")
-            return locations_data
+            compiled = self.queries.compile_pages(query, pages)
+            result = await self.singleflight.do(request_key(compiled, None), lambda: self.client.aexecute(compiled))
+            data = self._extract_pages(result, pages, description)
         except Exception as e:
-            logger.error(f"Error fetching locations page {page}: {e}")
-            raise ExternalServiceException(f"Failed to fetch locations: {str(e)}")
-    
-    def fetch_characters_page(self, page: int = 1) -> Dict[str, Any]:
+            logger.error(f"Error fetching {description} pages {pages}: {e}")
+            raise ExternalServiceException(f"Failed to fetch {description} pages {pages}: {str(e)}")
+        self._cache_pages(page_kind, pages, data)
+        return data
+
+    async def afetch_pages(
+        self,
+        query: str,
+        pages: Iterable[int],
+        description: str,
+        page_kind: Optional[str] = None,
+        concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches several pages of a paginated query, `RICK_MORTY_BULK_PAGE_BUDGET` pages
+        per request, with groups running concurrently (bounded by `concurrency`).
+        Returns page payloads in the order requested; when `page_kind` is given they
+        also refresh the single-page cache entries.
+        """
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def fetch(group: List[int]) -> List[Dict[str, Any]]:
+            if semaphore is None:
+                return await self._afetch_page_group(query, group, description, page_kind)
+            async with semaphore:
+                return await self._afetch_page_group(query, group, description, page_kind)
+
+        groups = await asyncio.gather(*(fetch(group) for group in self._page_groups(pages)))
+        return [page_data for group in groups for page_data in group]
+
+    def _merge_pages(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merges page payloads into a single page-shaped result covering the whole dataset."""
+        info = data[0]["info"]
+        return {
+            "info": {"count": info["count"], "pages": info["pages"], "next": None, "prev": None},
+            "results": [result for page_data in data[:info["pages"]] for result in page_data["results"]],
+        }
+
+    async def afetch_all_pages(
+        self,
+        query: str,
+        description: str,
+        page_kind: Optional[str] = None,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Walks every page of a paginated query in a handful of requests.
+
+        The first request covers the first page budget and reveals the page count; the
+        remaining pages follow in budget-sized groups.
+        """
+        first_group = self._page_groups(range(1, settings.RICK_MORTY_BULK_PAGE_BUDGET + 1))[0]
+        data = await self._afetch_page_group(query, first_group, description, page_kind)
+        total_pages = data[0]["info"]["pages"]
+        data.extend(
+            await self.afetch_pages(query, range(len(first_group) + 1, total_pages + 1), description, page_kind, concurrency)
+        )
+        return self._merge_pages(data)
+
+    def _extract(self, result: Dict[str, Any], root_key: str, description: str) -> Dict[str, Any]:
+        """Pulls the root field out of a query result and logs what was fetched."""
+        data = result[root_key]
+        if data is None:
+            raise ExternalServiceException(f"No data returned for {description}")
+        if isinstance(data, list):
+            logger.info(f"Fetched {description}: {len(data)} returned")
+        elif "results" in data:
+            logger.info(f"Fetched {description}: {len(data['results'])} {root_key}")
+        else:
+            logger.info(f"Fetched {root_key}: {data.get('name')}")
+        return data
+
+    def _projection(self, root_field: str, entity_id: int, selection: Selection) -> Tuple[str, Dict[str, Any], Tuple]:
+        """Query, variables and cache key for a by-ID fetch restricted to `selection`."""
+        query = self.query_builder.build(root_field, selection)
+        return query, {"id": str(entity_id)}, (root_field, entity_id, selection)
+
+    async def _cached_full(self, kind: str, entity_id: int) -> Dict[str, Any] | None:
+        """A fresh full entity from the cache; it is a superset of any projection of it."""
+        if self.cache is None:
+            return None
+        cached = await self.cache.aget((kind, entity_id))
+        if cached is None or cached[1]:
+            return None
+        return cached[0]
+
+    async def _afetch_projected(self, root_field: str, entity_id: int, selection: Selection) -> Dict[str, Any]:
+        """Fetches only the selected fields of an entity, reusing a cached full entity if present."""
+        full = await self._cached_full(root_field, entity_id)
+        if full is not None:
+            return full
+        query, variables, cache_key = self._projection(root_field, entity_id, selection)
+        return await self._afetch(query, variables, root_field, f"{root_field} {entity_id} (projected)", cache_key)
+
+    async def afetch_locations_page(self, page: int = 1) -> Dict[str, Any]:
+        """Fetches a paginated list of locations with basic information."""
+        return await self._afetch(LocationQueries.GET_LOCATIONS_PAGE, {"page": page}, "locations", f"locations page {page}", ("page", "locations", page))
+
+    async def afetch_location_by_id(self, location_id: int, selection: Selection | None = None) -> Dict[str, Any]:
+        """Fetches a single location by ID including all resident characters, or only the fields in `selection` when given."""
+        if selection is not None:
+            return await self._afetch_projected("location", location_id, selection)
+        return await self._afetch(LocationQueries.GET_LOCATION_BY_ID, {"id": str(location_id)}, "location", f"location {location_id}", ("location", location_id))
+
+    async def afetch_locations_with_residents_page(self, page: int = 1) -> Dict[str, Any]:
+        """Fetches a paginated list of locations with their resident characters."""
+        return await self._afetch(
+            LocationQueries.GET_LOCATIONS_WITH_RESIDENTS_PAGE,
+            {"page": page},
+            "locations",
+            f"locations with residents page {page}",
+            ("page", "locations_with_residents", page),
+        )
+
+    async def afetch_characters_page(self, page: int = 1) -> Dict[str, Any]:
         """Fetches a paginated list of characters with basic information."""
-        try:
-            result = self.client.execute(
-                CharacterQueries.GET_CHARACTERS_PAGE,
-                variables={"page": page}
-            )
-            characters_data = result['characters']
-            logger.info(f"Fetched page {page}: {len(characters_data['results'])} characters")
-            return characters_data
-        except Exception as e:
-            logger.error(f"Error fetching characters page {page}: {e}")
-            raise ExternalServiceException(f"Failed to fetch characters: {str(e)}")
-    
-    def fetch_character_by_id(self, character_id: int) -> Dict[str, Any]:
-        """Fetches a single character by ID including all available details."""
-        try:
-            result = self.client.execute(
-                CharacterQueries.GET_CHARACTER_BY_ID,
-                variables={"id": str(character_id)}
-            )
-            character_data = result['character']
-            logger.info(f"Fetched character: {character_data['name']}")
-            return character_data
-        except Exception as e:
-            logger.error(f"Error fetching character {character_id}: {e}")
-            raise ExternalServiceException(f"Failed to fetch character: {str(e)}")
+        return await self._afetch(CharacterQueries.GET_CHARACTERS_PAGE, {"page": page}, "characters", f"characters page {page}", ("page", "characters", page))
+
+    async def afetch_character_by_id(self, character_id: int, selection: Selection | None = None) -> Dict[str, Any]:
+        """Fetches a single character by ID including all available details, or only the fields in `selection` when given."""
+        if selection is not None:
+            return await self._afetch_projected("character", character_id, selection)
+        return await self._afetch(CharacterQueries.GET_CHARACTER_BY_ID, {"id": str(character_id)}, "character", f"character {character_id}", ("character", character_id))
 
-    def fetch_episodes_page(self, page: int = 1) -> Dict[str, Any]:
+    async def afetch_episodes_page(self, page: int = 1) -> Dict[str, Any]:
         """Fetches a paginated list of episodes with basic information."""
-        try:
-            result = self.client.execute(
-                EpisodeQueries.GET_EPISODES_PAGE,
-                variables={"page": page}
-            )
-            episodes_data = result["episodes"]
-            logger.info(f"Fetched page {page}: {len(episodes_data['results'])} episodes")
-            return episodes_data
-        except Exception as e:
-            logger.error(f"Error fetching episodes page {page}: {e}")
-            raise ExternalServiceException(f"Failed to fetch episodes: {str(e)}")
+        return await self._afetch(EpisodeQueries.GET_EPISODES_PAGE, {"page": page}, "episodes", f"episodes page {page}", ("page", "episodes", page))
 
-    def fetch_episode_by_id(self, episode_id: int) -> Dict[str, Any]:
-        """Fetches a single episode by ID including all available details."""
-        try:
-            result = self.client.execute(
-                EpisodeQueries.GET_EPISODE_BY_ID,
-                variables={"id": str(episode_id)}
-            )
-            episode_data = result["episode"]
-            logger.info(f"Fetched episode: {episode_data['name']}")
-            return episode_data
-        except Exception as e:
-            logger.error(f"Error fetching episode {episode_id}: {e}")
-            raise ExternalServiceException(f"Failed to fetch episode: {str(e)}")
+    async def afetch_episode_by_id(self, episode_id: int, selection: Selection | None = None) -> Dict[str, Any]:
+        """Fetches a single episode by ID including all available details, or only the fields in `selection` when given."""
+        if selection is not None:
+            return await self._afetch_projected("episode", episode_id, selection)
+        return await self._afetch(EpisodeQueries.GET_EPISODE_BY_ID, {"id": str(episode_id)}, "episode", f"episode {episode_id}", ("episode", episode_id))
+
+    async def afetch_characters_by_ids(self, character_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Fetches many characters by ID in batched round trips, in the order requested."""
+        return await self._afetch_many(CharacterQueries.GET_CHARACTERS_BY_IDS, character_ids, "charactersByIds", "character")
+
+    async def afetch_locations_by_ids(self, location_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Fetches many locations with residents by ID in batched round trips, in the order requested."""
+        return await self._afetch_many(LocationQueries.GET_LOCATIONS_BY_IDS, location_ids, "locationsByIds", "location")
+
+    async def afetch_episodes_by_ids(self, episode_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Fetches many episodes with characters by ID in batched round trips, in the order requested."""
+        return await self._afetch_many(EpisodeQueries.GET_EPISODES_BY_IDS, episode_ids, "episodesByIds", "episode")
+
+    async def afetch_all_characters(self) -> Dict[str, Any]:
+        """Fetches every character with basic information using aliased multi-page requests."""
+        return await self.afetch_all_pages(CharacterQueries.GET_CHARACTERS_PAGE, "characters", page_kind="characters")
+
+    async def afetch_all_locations(self) -> Dict[str, Any]:
+        """Fetches every location with basic information using aliased multi-page requests."""
+        return await self.afetch_all_pages(LocationQueries.GET_LOCATIONS_PAGE, "locations", page_kind="locations")
+
+    async def afetch_all_locations_with_residents(self) -> Dict[str, Any]:
+        """Fetches every location with its residents using aliased multi-page requests."""
+        return await self.afetch_all_pages(
+            LocationQueries.GET_LOCATIONS_WITH_RESIDENTS_PAGE, "locations with residents", page_kind="locations_with_residents"
+        )
+
+    async def afetch_all_episodes(self) -> Dict[str, Any]:
+        """Fetches every episode with basic information using aliased multi-page requests."""
+        return await self.afetch_all_pages(EpisodeQueries.GET_EPISODES_PAGE, "episodes", page_kind="episodes")
+
+    async def afetch_all_characters_with_links(self) -> Dict[str, Any]:
+        """Fetches every character with all fields plus origin, location and episode IDs."""
+        return await self.afetch_all_pages(CharacterQueries.GET_CHARACTERS_SYNC_PAGE, "characters with links")
+
+    async def afetch_characters_sync_page(self, page: int = 1) -> Dict[str, Any]:
+        """Fetches a page of characters with the relation IDs needed by the local mirror."""
+        return await self._afetch(CharacterQueries.GET_CHARACTERS_SYNC_PAGE, {"page": page}, "characters", f"characters sync page {page}")
+
+    async def afetch_locations_sync_page(self, page: int = 1) -> Dict[str, Any]:
+        """Fetches a page of locations with the fields stored by the local mirror."""
+        return await self._afetch(LocationQueries.GET_LOCATIONS_SYNC_PAGE, {"page": page}, "locations", f"locations sync page {page}")
+
+    async def afetch_episodes_sync_page(self, page: int = 1) -> Dict[str, Any]:
+        """Fetches a page of episodes with the fields stored by the local mirror."""
+        return await self._afetch(EpisodeQueries.GET_EPISODES_SYNC_PAGE, {"page": page}, "episodes", f"episodes sync page {page}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns upstream request counters."""
+        return {
+            "singleflight": self.singleflight.stats(),
+            "upstream": self.client.guard.stats(),
+            "cache": {**self.cache.stats(), "refreshes": self.cache_refreshes} if self.cache is not None else None,
+            "trusted_models": trusted_models.stats(),
+        }
+
+    async def aclose(self) -> None:
+        """Releases pooled upstream connections and flushes the disk cache."""
+        await self.client.aclose()
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.close)
 
 
 # Singleton instance
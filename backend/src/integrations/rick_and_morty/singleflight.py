@@ -0,0 +1,61 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from src.integrations.rick_and_morty.queries.registry import CompiledQuery
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def request_key(query: CompiledQuery, variables: Dict[str, Any] | None) -> tuple[bytes, str]:
+    """Builds a coalescing key from a compiled query and its variables."""
+    return query.body_prefix, json.dumps(variables or {}, sort_keys=True, separators=(",", ":"))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into a single execution.
+
+    Every caller waiting on the same key receives the same result object (or the
+    same exception), so results must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Runs `fn` once per key while a call for that key is in flight."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            logger.debug("Coalesced in-flight upstream request")
+        else:
+            self.executions += 1
+            # Run in its own task so a cancelled caller does not cancel the shared call
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns coalescing counters."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
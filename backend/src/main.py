@@ -5,8 +5,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import core configuration
+from src.core.compression import CompressionMiddleware
 from src.core.config import settings
 from src.core.database.connection import db_connection, Base
+from src.core.http_cache import encoded_bodies
+from src.core.serialization import FastJSONResponse
+from src.domains.mirror.sync import mirror_sync_service
+from src.domains.warmup.service import warmup_service
+from src.integrations.azure_openai_client import azure_openai_client
+from src.integrations.rick_and_morty.service import rick_and_morty_service
 
 # Import API routers
 from src.api.v1.router import router as api_router_v1
@@ -27,10 +34,22 @@ async def lifespan(app: FastAPI):
         db_connection.init_db()
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
+
+    if settings.MIRROR_ENABLED and db_connection.SessionLocal is not None:
+        mirror_sync_service.start()
+
+    warmup_service.start()
     
     yield
     
     # Shutdown
+    await warmup_service.stop()
+    await mirror_sync_service.stop()
+
+    logger.info("Closing upstream connections...")
+    await rick_and_morty_service.aclose()
+    await azure_openai_client.aclose()
+
     logger.info("Closing database connection...")
     db_connection.close_db()
     logger.info("Database connection closed")
@@ -41,6 +60,7 @@ app = FastAPI(
     version=settings.VERSION,
     description="Rick & Morty Locations API",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -50,6 +70,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    flush_size=settings.COMPRESSION_FLUSH_SIZE,
+)
 
 app.include_router(api_router_v1, prefix=settings.API_V1_PREFIX)
 
@@ -71,8 +98,26 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint; reports 503 until the startup warm-up finished or hit its deadline."""
+    warmup = warmup_service.get_report().model_dump(mode="json")
+    if not warmup_service.ready:
+        return FastJSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "version": settings.VERSION, "warmup": warmup},
+        )
     return {
         "status": "healthy",
-        "version": settings.VERSION
-    }
\ No newline at end of file
+        "version": settings.VERSION,
+        "warmup": warmup,
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Integration-layer counters."""
+    return {
+        "rick_and_morty": rick_and_morty_service.get_stats(),
+        "azure_openai": azure_openai_client.get_stats(),
+        "encoded_bodies": encoded_bodies.stats(),
+        "warmup": warmup_service.get_report().model_dump(mode="json"),
+    }
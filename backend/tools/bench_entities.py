@@ -0,0 +1,182 @@
+"""
+Throughput benchmark for the character, location and episode endpoints.
+
+Starts the stand-in upstream with a fixed latency and one uvicorn worker pointed
+at it, with the response caches and the mirror disabled so every request reaches
+the upstream, then drives the entity endpoints from concurrent clients and
+reports requests/s and latency percentiles.
+
+Usage (from ``backend/``, with a corpus built by ``tools.standin_server``):
+
+    python -m tools.bench_entities --corpus .standin --latency 0.1 --concurrency 50
+
+Pass ``--url`` to benchmark an already running backend instead; the stand-in and
+the worker are then not started.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger("bench")
+
+# Entity endpoints and the ID/page range each is exercised over
+ENDPOINTS = (
+    ("/api/v1/characters?page={n}", 42),
+    ("/api/v1/characters/{n}", 826),
+    ("/api/v1/locations?page={n}", 7),
+    ("/api/v1/locations?page={n}&include_residents=true", 7),
+    ("/api/v1/locations/{n}", 126),
+    ("/api/v1/episodes?page={n}", 3),
+    ("/api/v1/episodes/{n}", 51),
+)
+
+
+@contextmanager
+def process(args: List[str], env: Dict[str, str], name: str) -> Iterator[subprocess.Popen]:
+    """Runs a child process for the duration of the block."""
+    proc = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    logger.info(f"Started {name} (pid {proc.pid})")
+    try:
+        yield proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def wait_until_up(url: str, timeout: float = 30.0) -> None:
+    """Polls `url` until it answers or `timeout` passes."""
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(url) as response:
+                    if response.status < 500:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, seed: int) -> Dict[str, float]:
+    """Issues requests from `concurrency` clients for `duration` seconds."""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        nonlocal errors
+        while time.monotonic() < deadline:
+            path, upper = rng.choice(ENDPOINTS)
+            started = time.perf_counter()
+            try:
+                async with session.get(base_url + path.format(n=rng.randint(1, upper))) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+                        continue
+            except aiohttp.ClientError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.monotonic()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def quantile(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": quantile(0.50),
+        "p95_ms": quantile(0.95),
+        "p99_ms": quantile(0.99),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def report(result: Dict[str, float], latency: Optional[float], concurrency: int) -> None:
+    upstream = f"upstream latency {latency * 1000:.0f} ms, " if latency is not None else ""
+    print(
+        f"{upstream}concurrency {concurrency}: "
+        f"{result['requests_per_second']:.1f} req/s over {result['requests']} requests "
+        f"({result['errors']} errors), p50 {result['p50_ms']:.1f} ms, "
+        f"p95 {result['p95_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default=None, help="Benchmark a running backend instead of starting one")
+    parser.add_argument("--corpus", type=Path, default=Path(".standin"), help="Stand-in corpus directory")
+    parser.add_argument("--latency", type=float, default=0.1, help="Fixed upstream latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load after warm-up")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--standin-port", type=int, default=9941)
+    parser.add_argument("--port", type=int, default=8041)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def bench(base_url: str) -> Dict[str, float]:
+        await wait_until_up(f"{base_url}/health")
+        if args.warmup > 0:
+            await run_load(base_url, args.concurrency, args.warmup, args.seed + 1)
+        return await run_load(base_url, args.concurrency, args.duration, args.seed)
+
+    if args.url:
+        report(asyncio.run(bench(args.url.rstrip("/"))), None, args.concurrency)
+        return
+
+    env = {
+        **os.environ,
+        "RICK_MORTY_GRAPHQL_URL": f"http://127.0.0.1:{args.standin_port}/graphql",
+        "RICK_MORTY_CACHE_ENABLED": "false",
+        "MIRROR_ENABLED": "false",
+        "RICK_MORTY_HEDGE_ENABLED": "false",
+        "RICK_MORTY_RATE_LIMIT": "0",
+    }
+    standin = [
+        sys.executable, "-m", "tools.standin_server", "serve",
+        "--corpus", str(args.corpus),
+        "--port", str(args.standin_port),
+        "--latency", f"fixed:{args.latency}",
+    ]
+    backend = [
+        sys.executable, "-m", "uvicorn", "src.main:app",
+        "--port", str(args.port),
+        "--workers", "1",
+        "--log-level", "warning",
+    ]
+    with process(standin, env, "stand-in upstream"), process(backend, env, "backend worker"):
+        result = asyncio.run(bench(f"http://127.0.0.1:{args.port}"))
+    report(result, args.latency, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Bytes-on-the-wire and serialization CPU benchmark for the heaviest responses.
+
+For each endpoint it reports the body size per content encoding (identity, gzip,
+br) as sent by the compression middleware, then, in process, the CPU time to
+serialize the response model with the stdlib encoder (``jsonable_encoder`` +
+``json.dumps``, FastAPI's old default path), orjson and Pydantic, and the CPU
+time to compress the body with each encoder.
+
+Usage (from ``backend/``, with a corpus built by ``tools.standin_server``):
+
+    python -m tools.bench_payloads --corpus .standin
+
+Pass ``--url`` to measure an already running backend instead.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import aiohttp
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from src.core.compression import _Encoder, supported_encodings
+from src.core.serialization import type_adapter
+from src.domains.characters.models import CharacterDetailed, CharactersCursorPage
+from src.domains.episodes.models import EpisodeDetailed
+from src.domains.locations.models import LocationsWithResidentsCursorPage, LocationsWithResidentsPage
+from tools.bench_entities import process, wait_until_up
+
+logger = logging.getLogger("bench")
+
+# Heavy responses and the model each one is serialized from
+ENDPOINTS: Tuple[Tuple[str, Optional[Type[BaseModel]]], ...] = (
+    ("/api/v1/locations?page=1&include_residents=true", LocationsWithResidentsPage),
+    ("/api/v1/locations?limit=200&include_residents=true", LocationsWithResidentsCursorPage),
+    ("/api/v1/locations?stream=true&include_residents=true", None),
+    ("/api/v1/characters?limit=200", CharactersCursorPage),
+    ("/api/v1/characters/1", CharacterDetailed),
+    ("/api/v1/episodes/1", EpisodeDetailed),
+)
+
+# An embedding-sized payload, as returned alongside evaluation results
+EMBEDDING = {"embedding": [i / 1536 for i in range(1536)]}
+
+
+def cpu_ms(func: Callable[[], Any], repeat: int) -> float:
+    """Mean process CPU time of `func` in milliseconds."""
+    started = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - started) / repeat * 1000
+
+
+async def wire_sizes(base_url: str, path: str) -> Tuple[bytes, Dict[str, int]]:
+    """Fetches `path` once per encoding; returns the identity body and the on-the-wire size per encoding."""
+    sizes: Dict[str, int] = {}
+    body = b""
+    async with aiohttp.ClientSession(auto_decompress=False) as session:
+        for encoding in ("identity",) + supported_encodings():
+            async with session.get(base_url + path, headers={"Accept-Encoding": encoding}) as response:
+                payload = await response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"{path} returned {response.status}")
+                sizes[response.headers.get("Content-Encoding", "identity")] = len(payload)
+                if encoding == "identity":
+                    body = payload
+    return body, sizes
+
+
+def serialization_costs(body: bytes, model: Optional[Type[BaseModel]], repeat: int) -> Dict[str, float]:
+    if model is None:
+        data = [json.loads(line) for line in body.splitlines()]
+        return {
+            "stdlib": cpu_ms(lambda: b"\n".join(json.dumps(row).encode() for row in data), repeat),
+            "orjson": cpu_ms(lambda: b"\n".join(orjson.dumps(row) for row in data), repeat),
+        }
+    instance = model.model_validate_json(body)
+    adapter = type_adapter(model)
+    return {
+        "stdlib": cpu_ms(lambda: json.dumps(jsonable_encoder(instance)).encode(), repeat),
+        "orjson": cpu_ms(lambda: orjson.dumps(instance.model_dump()), repeat),
+        "pydantic": cpu_ms(lambda: adapter.dump_json(instance), repeat),
+    }
+
+
+def compression_costs(body: bytes, gzip_level: int, brotli_quality: int, repeat: int) -> Dict[str, float]:
+    return {
+        encoding: cpu_ms(lambda: _Encoder(encoding, gzip_level, brotli_quality).finish(body), repeat)
+        for encoding in supported_encodings()
+    }
+
+
+def report(rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        sizes = ", ".join(
+            f"{encoding} {size / 1024:.1f} KiB" + (f" ({size / row['sizes']['identity']:.0%})" if encoding != "identity" else "")
+            for encoding, size in row["sizes"].items()
+        )
+        encode = ", ".join(f"{name} {ms:.2f} ms" for name, ms in row["serialize"].items())
+        compress = ", ".join(f"{name} {ms:.2f} ms" for name, ms in row["compress"].items())
+        print(f"{row['path']}\n  wire: {sizes}\n  serialize: {encode}\n  compress: {compress}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default=None, help="Measure a running backend instead of starting one")
+    parser.add_argument("--corpus", type=Path, default=Path(".standin"), help="Stand-in corpus directory")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per CPU measurement")
+    parser.add_argument("--gzip-level", type=int, default=6)
+    parser.add_argument("--brotli-quality", type=int, default=4)
+    parser.add_argument("--standin-port", type=int, default=9942)
+    parser.add_argument("--port", type=int, default=8042)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def measure(base_url: str) -> List[Dict[str, Any]]:
+        await wait_until_up(f"{base_url}/health")
+        rows = []
+        for path, model in ENDPOINTS:
+            body, sizes = await wire_sizes(base_url, path)
+            rows.append({
+                "path": path,
+                "sizes": sizes,
+                "serialize": serialization_costs(body, model, args.repeat),
+                "compress": compression_costs(body, args.gzip_level, args.brotli_quality, args.repeat),
+            })
+        embedding = orjson.dumps(EMBEDDING)
+        rows.append({
+            "path": "(1536-float embedding)",
+            "sizes": {"identity": len(embedding)},
+            "serialize": {
+                "stdlib": cpu_ms(lambda: json.dumps(EMBEDDING).encode(), args.repeat),
+                "orjson": cpu_ms(lambda: orjson.dumps(EMBEDDING), args.repeat),
+            },
+            "compress": compression_costs(embedding, args.gzip_level, args.brotli_quality, args.repeat),
+        })
+        return rows
+
+    if args.url:
+        report(asyncio.run(measure(args.url.rstrip("/"))))
+        return
+
+    env = {
+        **os.environ,
+        "RICK_MORTY_GRAPHQL_URL": f"http://127.0.0.1:{args.standin_port}/graphql",
+        "MIRROR_ENABLED": "false",
+        "COMPRESSION_GZIP_LEVEL": str(args.gzip_level),
+        "COMPRESSION_BROTLI_QUALITY": str(args.brotli_quality),
+    }
+    standin = [
+        sys.executable, "-m", "tools.standin_server", "serve",
+        "--corpus", str(args.corpus),
+        "--port", str(args.standin_port),
+    ]
+    backend = [
+        sys.executable, "-m", "uvicorn", "src.main:app",
+        "--port", str(args.port),
+        "--workers", "1",
+        "--log-level", "warning",
+    ]
+    with process(standin, env, "stand-in upstream"), process(backend, env, "backend worker"):
+        rows = asyncio.run(measure(f"http://127.0.0.1:{args.port}"))
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,539 @@
+"""
+Local stand-in for the Rick & Morty GraphQL API.
+
+Serves any query document the backend sends (pages, by-ID lookups, aliased bulk
+pages, projections) from a fixture corpus, with configurable latency and error
+injection, so the backend can be benchmarked offline.
+
+A corpus directory holds up to two files:
+
+- ``dataset.json``: normalized characters, locations and episodes. Queries are
+  executed against it with the bundled schema, so every query shape is served.
+- ``recordings.jsonl``: exact upstream responses captured in record mode. A
+  request matching a recording (same normalized query and variables) is replayed
+  verbatim, optionally with the latency observed when it was recorded.
+
+Usage (from ``backend/``):
+
+    # Build a corpus: snapshot the real API once, or synthesize one for air-gapped boxes
+    python -m tools.standin_server snapshot --corpus .standin
+    python -m tools.standin_server synthesize --corpus .standin
+
+    # Capture real traffic while proxying to the upstream
+    python -m tools.standin_server record --corpus .standin --port 9911
+
+    # Serve it; point RICK_MORTY_GRAPHQL_URL at http://localhost:9911/graphql
+    python -m tools.standin_server serve --corpus .standin --port 9911 \\
+        --latency lognormal:0.08:0.5 --tail-rate 0.01 --tail-latency 1.5 --error-rate 0.02
+
+While serving, ``GET /_standin/stats`` returns counters and ``POST /_standin/config``
+accepts a JSON object with any of the injection options to change them at runtime.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+from graphql import build_schema, graphql
+from graphql.utilities import strip_ignored_characters
+
+from src.integrations.rick_and_morty.queries.registry import SCHEMA_PATH
+
+logger = logging.getLogger("standin")
+
+DEFAULT_UPSTREAM = "https://rickandmortyapi.com/graphql"
+PAGE_SIZE = 20
+
+
+def request_key(query: str, variables: Optional[Dict[str, Any]]) -> str:
+    """Normalized key of a GraphQL request; whitespace and variable order do not matter."""
+    return json.dumps(
+        [strip_ignored_characters(query), variables or {}],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+# Latency and error injection
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Parses a latency distribution spec into a sampler returning seconds.
+
+    Supported: ``none``, ``fixed:S``, ``uniform:LOW:HIGH``, ``normal:MEAN:STDDEV``,
+    ``lognormal:MEDIAN:SIGMA``, ``exponential:MEAN`` and ``recorded`` (replay the
+    latency stored with each recording; dataset responses get none).
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(":")] if params else []
+    if kind in ("none", "recorded"):
+        return lambda: 0.0
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(math.log(values[0]), values[1])
+    if kind == "exponential":
+        return lambda: random.expovariate(1.0 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+@dataclass
+class InjectionConfig:
+    """Latency and failure injection applied to every GraphQL request."""
+
+    latency: str = "none"
+    tail_rate: float = 0.0
+    tail_latency: float = 1.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    graphql_error_rate: float = 0.0
+    drop_rate: float = 0.0
+
+    def sampler(self) -> Callable[[], float]:
+        return parse_latency(self.latency)
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """Applies new values; nothing changes if any of them is invalid."""
+        updates = {
+            field.name: type(getattr(self, field.name))(values[field.name])
+            for field in fields(self)
+            if field.name in values
+        }
+        parse_latency(updates.get("latency", self.latency))
+        for name, value in updates.items():
+            setattr(self, name, value)
+
+
+# Dataset-backed resolution
+
+class Dataset:
+    """Normalized entities with the relation indexes needed to resolve any query shape."""
+
+    def __init__(self, data: Dict[str, List[Dict[str, Any]]]):
+        self.characters = {int(c["id"]): c for c in data.get("characters", [])}
+        self.locations = {int(l["id"]): l for l in data.get("locations", [])}
+        self.episodes = {int(e["id"]): e for e in data.get("episodes", [])}
+        self.residents: Dict[int, List[int]] = {}
+        self.appearances: Dict[int, List[int]] = {}
+        for character_id, character in sorted(self.characters.items()):
+            if character.get("location_id") is not None:
+                self.residents.setdefault(character["location_id"], []).append(character_id)
+            for episode_id in character.get("episode_ids", []):
+                self.appearances.setdefault(episode_id, []).append(character_id)
+
+    @classmethod
+    def load(cls, path: Path) -> "Dataset":
+        return cls(json.loads(path.read_text()))
+
+    # Views: dicts whose relation fields are callables, resolved lazily by graphql-core
+
+    def character(self, character_id: Any) -> Optional[Dict[str, Any]]:
+        character = self.characters.get(int(character_id))
+        if character is None:
+            return None
+        view = {key: character.get(key) for key in ("name", "status", "species", "type", "gender", "image", "created")}
+        view["id"] = str(character["id"])
+        view["origin"] = lambda info: self._place(character.get("origin_id"), character.get("origin_name"))
+        view["location"] = lambda info: self._place(character.get("location_id"), character.get("location_name"))
+        view["episode"] = lambda info: [self.episode(i) for i in character.get("episode_ids", [])]
+        return view
+
+    def location(self, location_id: Any) -> Optional[Dict[str, Any]]:
+        location = self.locations.get(int(location_id))
+        if location is None:
+            return None
+        view = {key: location.get(key) for key in ("name", "type", "dimension", "created")}
+        view["id"] = str(location["id"])
+        view["residents"] = lambda info: [self.character(i) for i in self.residents.get(location["id"], [])]
+        return view
+
+    def episode(self, episode_id: Any) -> Optional[Dict[str, Any]]:
+        episode = self.episodes.get(int(episode_id))
+        if episode is None:
+            return None
+        view = {key: episode.get(key) for key in ("name", "air_date", "episode", "created")}
+        view["id"] = str(episode["id"])
+        view["characters"] = lambda info: [self.character(i) for i in self.appearances.get(episode["id"], [])]
+        return view
+
+    def _place(self, location_id: Optional[int], name: Optional[str]) -> Dict[str, Any]:
+        if location_id is not None and location_id in self.locations:
+            return self.location(location_id)
+        # The upstream reports unknown origins as a location without an ID
+        return {"id": None, "name": name or "unknown", "type": None, "dimension": None, "residents": [], "created": None}
+
+    def _page(self, entities: Dict[int, Dict[str, Any]], view: Callable, page: Optional[int], filter: Optional[Dict[str, str]]):
+        ids = sorted(entities)
+        for field, expected in (filter or {}).items():
+            if expected:
+                ids = [i for i in ids if expected.lower() in str(entities[i].get(field) or "").lower()]
+        page = page or 1
+        count = len(ids)
+        pages = math.ceil(count / PAGE_SIZE)
+        return {
+            "info": {
+                "count": count,
+                "pages": pages,
+                "next": page + 1 if page < pages else None,
+                "prev": page - 1 if page > 1 else None,
+            },
+            "results": [view(i) for i in ids[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]],
+        }
+
+    def root(self) -> Dict[str, Callable]:
+        """Root resolvers for the Query type."""
+        return {
+            "character": lambda info, id: self.character(id),
+            "location": lambda info, id: self.location(id),
+            "episode": lambda info, id: self.episode(id),
+            "characters": lambda info, page=None, filter=None: self._page(self.characters, self.character, page, filter),
+            "locations": lambda info, page=None, filter=None: self._page(self.locations, self.location, page, filter),
+            "episodes": lambda info, page=None, filter=None: self._page(self.episodes, self.episode, page, filter),
+            "charactersByIds": lambda info, ids: [self.character(i) for i in ids],
+            "locationsByIds": lambda info, ids: [self.location(i) for i in ids],
+            "episodesByIds": lambda info, ids: [self.episode(i) for i in ids],
+        }
+
+
+class Corpus:
+    """Recorded responses plus an optional dataset to resolve anything not recorded."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.recordings: Dict[str, Dict[str, Any]] = {}
+        self.dataset: Optional[Dataset] = None
+        recordings_path = path / "recordings.jsonl"
+        if recordings_path.exists():
+            for line in recordings_path.read_text().splitlines():
+                if line.strip():
+                    recording = json.loads(line)
+                    self.recordings[request_key(recording["query"], recording.get("variables"))] = recording
+        dataset_path = path / "dataset.json"
+        if dataset_path.exists():
+            self.dataset = Dataset.load(dataset_path)
+        logger.info(
+            f"Loaded corpus {path}: {len(self.recordings)} recordings, "
+            f"dataset {'present' if self.dataset else 'absent'}"
+        )
+
+    def append_recording(self, recording: Dict[str, Any]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / "recordings.jsonl", "a") as recordings_file:
+            recordings_file.write(json.dumps(recording) + "\n")
+        self.recordings[request_key(recording["query"], recording.get("variables"))] = recording
+
+
+# Server
+
+class StandInServer:
+    """aiohttp application serving the corpus with injected latency and failures."""
+
+    RESOLVED_CACHE_SIZE = 20000
+
+    def __init__(self, corpus: Corpus, config: InjectionConfig, upstream: Optional[str] = None):
+        self.corpus = corpus
+        self.config = config
+        self.upstream = upstream
+        self.schema = build_schema(SCHEMA_PATH.read_text())
+        self.root = corpus.dataset.root() if corpus.dataset else None
+        self.sample_latency = config.sampler()
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "replayed": 0,
+            "resolved": 0,
+            "recorded": 0,
+            "misses": 0,
+            "injected_errors": 0,
+            "injected_graphql_errors": 0,
+            "dropped": 0,
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._resolved: Dict[str, bytes] = {}
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/graphql", self.handle_graphql)
+        app.router.add_get("/_standin/stats", self.handle_stats)
+        app.router.add_post("/_standin/config", self.handle_config)
+        app.on_cleanup.append(self._close_session)
+        return app
+
+    async def _close_session(self, app: web.Application) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.stats, "config": asdict(self.config)})
+
+    async def handle_config(self, request: web.Request) -> web.Response:
+        try:
+            self.config.update(await request.json())
+        except (ValueError, TypeError, IndexError) as e:
+            return web.json_response({"error": str(e)}, status=400)
+        self.sample_latency = self.config.sampler()
+        return web.json_response(asdict(self.config))
+
+    async def handle_graphql(self, request: web.Request) -> web.StreamResponse:
+        self.stats["requests"] += 1
+        body = await request.json()
+        query, variables = body.get("query", ""), body.get("variables") or {}
+
+        if self.upstream is not None:
+            return await self._record(query, variables, body)
+
+        recording = self.corpus.recordings.get(request_key(query, variables))
+        delay = self.sample_latency()
+        if recording is not None and self.config.latency == "recorded":
+            delay = recording.get("latency", 0.0)
+        if random.random() < self.config.tail_rate:
+            delay = max(delay, self.config.tail_latency)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if random.random() < self.config.drop_rate:
+            self.stats["dropped"] += 1
+            if request.transport is not None:
+                request.transport.close()
+            return web.Response(status=500)
+        if random.random() < self.config.error_rate:
+            self.stats["injected_errors"] += 1
+            return web.Response(status=self.config.error_status, text="Injected upstream failure")
+        if random.random() < self.config.graphql_error_rate:
+            self.stats["injected_graphql_errors"] += 1
+            return web.json_response({"data": None, "errors": [{"message": "Injected GraphQL error"}]})
+
+        if recording is not None:
+            self.stats["replayed"] += 1
+            return web.Response(status=recording.get("status", 200), body=recording["body"], content_type="application/json")
+        if self.root is not None:
+            self.stats["resolved"] += 1
+            payload = await self._resolve(query, variables, body.get("operationName"))
+            return web.Response(body=payload, content_type="application/json")
+
+        self.stats["misses"] += 1
+        return web.json_response({"data": None, "errors": [{"message": "No recording for this request"}]})
+
+    async def _resolve(self, query: str, variables: Dict[str, Any], operation_name: Optional[str]) -> bytes:
+        """Executes a query against the dataset; the dataset is static, so encoded results are reused."""
+        key = json.dumps([request_key(query, variables), operation_name])
+        payload = self._resolved.get(key)
+        if payload is not None:
+            return payload
+
+        result = await graphql(
+            self.schema,
+            query,
+            root_value=self.root,
+            variable_values=variables,
+            operation_name=operation_name,
+        )
+        response: Dict[str, Any] = {"data": result.data}
+        if result.errors:
+            response["errors"] = [error.formatted for error in result.errors]
+        payload = json.dumps(response).encode()
+        if len(self._resolved) >= self.RESOLVED_CACHE_SIZE:
+            self._resolved.clear()
+        self._resolved[key] = payload
+        return payload
+
+    async def _record(self, query: str, variables: Dict[str, Any], body: Dict[str, Any]) -> web.Response:
+        """Proxies a request to the real upstream and stores the exchange."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        started = time.perf_counter()
+        async with self._session.post(self.upstream, json=body) as response:
+            payload = await response.text()
+            status = response.status
+        latency = round(time.perf_counter() - started, 4)
+        self.corpus.append_recording(
+            {"query": query, "variables": variables, "status": status, "body": payload, "latency": latency}
+        )
+        self.stats["recorded"] += 1
+        return web.Response(status=status, text=payload, content_type="application/json")
+
+
+# Corpus builders
+
+SNAPSHOT_QUERIES = {
+    "characters": """
+        query ($page: Int!) { characters(page: $page) {
+            info { pages }
+            results { id name status species type gender image created
+                      origin { id name } location { id name } episode { id } }
+        } }
+    """,
+    "locations": """
+        query ($page: Int!) { locations(page: $page) {
+            info { pages } results { id name type dimension created }
+        } }
+    """,
+    "episodes": """
+        query ($page: Int!) { episodes(page: $page) {
+            info { pages } results { id name air_date episode created }
+        } }
+    """,
+}
+
+
+def _to_id(value: Any) -> Optional[int]:
+    return int(value) if value not in (None, "") else None
+
+
+async def snapshot(upstream: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Walks every page of the real API once and returns a normalized dataset."""
+    data: Dict[str, List[Dict[str, Any]]] = {}
+    async with aiohttp.ClientSession() as session:
+        for root_field, query in SNAPSHOT_QUERIES.items():
+            page, pages, rows = 1, 1, []
+            while page <= pages:
+                async with session.post(upstream, json={"query": query, "variables": {"page": page}}) as response:
+                    response.raise_for_status()
+                    payload = (await response.json())["data"][root_field]
+                pages = payload["info"]["pages"]
+                rows.extend(payload["results"])
+                logger.info(f"Snapshot {root_field} page {page}/{pages}")
+                page += 1
+            data[root_field] = rows
+
+    for character in data["characters"]:
+        origin, location = character.pop("origin") or {}, character.pop("location") or {}
+        character["origin_id"], character["origin_name"] = _to_id(origin.get("id")), origin.get("name")
+        character["location_id"], character["location_name"] = _to_id(location.get("id")), location.get("name")
+        character["episode_ids"] = [int(episode["id"]) for episode in character.pop("episode")]
+    for rows in data.values():
+        for row in rows:
+            row["id"] = int(row["id"])
+    return data
+
+
+def synthesize(characters: int, locations: int, episodes: int, seed: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Generates a deterministic dataset with the upstream's shape and cardinalities."""
+    rng = random.Random(seed)
+    created = "2017-11-04T18:48:46.250Z"
+    location_rows = [
+        {
+            "id": i,
+            "name": f"Location {i}",
+            "type": rng.choice(["Planet", "Space station", "Microverse", "Dream"]),
+            "dimension": rng.choice(["Dimension C-137", "Replacement Dimension", "unknown"]),
+            "created": created,
+        }
+        for i in range(1, locations + 1)
+    ]
+    episode_rows = [
+        {
+            "id": i,
+            "name": f"Episode {i}",
+            "air_date": f"December {i % 28 + 1}, {2013 + i // 11}",
+            "episode": f"S{1 + (i - 1) // 11:02d}E{(i - 1) % 11 + 1:02d}",
+            "created": created,
+        }
+        for i in range(1, episodes + 1)
+    ]
+    # A few very populated locations, like the Citadel of Ricks upstream
+    hubs = rng.sample(range(1, locations + 1), k=min(3, locations))
+    character_rows = []
+    for i in range(1, characters + 1):
+        location_id = rng.choice(hubs) if rng.random() < 0.2 else rng.randint(1, locations)
+        origin_id = rng.randint(1, locations) if rng.random() < 0.7 else None
+        character_rows.append(
+            {
+                "id": i,
+                "name": f"Character {i}",
+                "status": rng.choice(["Alive", "Dead", "unknown"]),
+                "species": rng.choice(["Human", "Alien", "Humanoid", "Robot"]),
+                "type": rng.choice(["", "", "", "Parasite", "Clone"]),
+                "gender": rng.choice(["Male", "Female", "unknown"]),
+                "image": f"https://rickandmortyapi.com/api/character/avatar/{i}.jpeg",
+                "created": created,
+                "origin_id": origin_id,
+                "origin_name": None if origin_id else "unknown",
+                "location_id": location_id,
+                "location_name": None,
+                "episode_ids": sorted(rng.sample(range(1, episodes + 1), k=rng.randint(1, min(8, episodes)))),
+            }
+        )
+    return {"characters": character_rows, "locations": location_rows, "episodes": episode_rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("serve", "record"):
+        sub = subparsers.add_parser(name)
+        sub.add_argument("--corpus", type=Path, required=True)
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=9911)
+        if name == "record":
+            sub.add_argument("--upstream", default=DEFAULT_UPSTREAM)
+        else:
+            defaults = InjectionConfig()
+            sub.add_argument("--latency", default=defaults.latency, help="Latency distribution, e.g. lognormal:0.08:0.5")
+            sub.add_argument("--tail-rate", type=float, default=defaults.tail_rate)
+            sub.add_argument("--tail-latency", type=float, default=defaults.tail_latency)
+            sub.add_argument("--error-rate", type=float, default=defaults.error_rate)
+            sub.add_argument("--error-status", type=int, default=defaults.error_status)
+            sub.add_argument("--graphql-error-rate", type=float, default=defaults.graphql_error_rate)
+            sub.add_argument("--drop-rate", type=float, default=defaults.drop_rate)
+            sub.add_argument("--seed", type=int, default=None)
+
+    snap = subparsers.add_parser("snapshot")
+    snap.add_argument("--corpus", type=Path, required=True)
+    snap.add_argument("--upstream", default=DEFAULT_UPSTREAM)
+
+    synth = subparsers.add_parser("synthesize")
+    synth.add_argument("--corpus", type=Path, required=True)
+    synth.add_argument("--characters", type=int, default=826)
+    synth.add_argument("--locations", type=int, default=126)
+    synth.add_argument("--episodes", type=int, default=51)
+    synth.add_argument("--seed", type=int, default=1)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command in ("snapshot", "synthesize"):
+        data = (
+            asyncio.run(snapshot(args.upstream))
+            if args.command == "snapshot"
+            else synthesize(args.characters, args.locations, args.episodes, args.seed)
+        )
+        args.corpus.mkdir(parents=True, exist_ok=True)
+        (args.corpus / "dataset.json").write_text(json.dumps(data))
+        logger.info(f"Wrote {', '.join(f'{len(rows)} {name}' for name, rows in data.items())} to {args.corpus}")
+        return
+
+    corpus = Corpus(args.corpus)
+    if args.command == "record":
+        server = StandInServer(corpus, InjectionConfig(), upstream=args.upstream)
+        logger.info(f"Recording traffic to {args.upstream}")
+    else:
+        if args.seed is not None:
+            random.seed(args.seed)
+        config = InjectionConfig(
+            latency=args.latency,
+            tail_rate=args.tail_rate,
+            tail_latency=args.tail_latency,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            graphql_error_rate=args.graphql_error_rate,
+            drop_rate=args.drop_rate,
+        )
+        server = StandInServer(corpus, config)
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()